@@ -0,0 +1,4 @@
+"""
+Microbenchmarks for the trade simulator's hot paths.
+Run from the repository root, e.g. `python -m benchmarks.bench_decoder`.
+"""
@@ -0,0 +1,51 @@
+"""
+Decoder microbenchmark: messages/sec for each available JSON parser.
+
+Usage:
+    python -m benchmarks.bench_decoder [--levels 50] [--messages 20000]
+"""
+import argparse
+import json
+import random
+import time
+from utils.decoder import PARSERS, make_decoder
+
+
+def make_frame(levels, mid=95000.0):
+    """Synthetic OKX-style L2 frame with `levels` price levels per side"""
+    return json.dumps({
+        'timestamp': '2025-05-04T10:39:13Z',
+        'exchange': 'OKX',
+        'symbol': 'BTC-USDT-SWAP',
+        'asks': [[f"{mid + 0.5 + i * 0.1:.1f}", f"{random.uniform(0.1, 50):.2f}"] for i in range(levels)],
+        'bids': [[f"{mid - 0.5 - i * 0.1:.1f}", f"{random.uniform(0.1, 50):.2f}"] for i in range(levels)],
+    }).encode()
+
+
+def bench(decoder, frame, messages):
+    decoder.decode(frame)  # Warm up
+    start = time.perf_counter()
+    for _ in range(messages):
+        decoder.decode(frame)
+    elapsed = time.perf_counter() - start
+    return messages / elapsed, elapsed / messages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--levels', type=int, default=50, help="Price levels per side")
+    parser.add_argument('--messages', type=int, default=20000, help="Frames to decode per decoder")
+    args = parser.parse_args()
+
+    frame = make_frame(args.levels)
+    print(f"{len(frame)} byte frame, {args.levels} levels per side, {args.messages} messages")
+    for name in ('json', 'orjson'):
+        if name not in PARSERS:
+            print(f"{name:>8}: not installed")
+            continue
+        rate, per_msg = bench(make_decoder(name), frame, args.messages)
+        print(f"{name:>8}: {rate:>10,.0f} msg/s  {per_msg:8.2f} us/msg")
+
+
+if __name__ == "__main__":
+    main()
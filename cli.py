@@ -0,0 +1,156 @@
+"""
+Headless trade simulator: streams cost estimates without a display.
+
+Examples:
+    python cli.py                                  # Live feed, JSON lines to stdout
+    python cli.py --output estimates.jsonl --duration 3600
+    python cli.py --record session.rec --duration 600
+    python cli.py --replay session.rec --speed 0   # Replay as fast as possible
+    python cli.py --symbols BTC-USDT ETH-USDT SOL-USDT --every 100
+    python cli.py --symbols BTC-USDT ETH-USDT SOL-USDT --shards 3   # One worker process per shard
+    python cli.py --qty-dtype float32 --memory-report   # Bytes per stored snapshot
+"""
+import argparse
+import asyncio
+import json
+import sys
+from utils.config import Config
+from utils.logging_setup import setup_logging
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Headless GoQuant trade simulator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('Examples:')[1],
+    )
+    parser.add_argument('--url', default=Config.WEBSOCKET_URL, help="L2 orderbook websocket URL")
+    parser.add_argument('--symbols', nargs='+', metavar='SYMBOL',
+                        help="Stream several instruments concurrently (URLs from Config.WEBSOCKET_URL_TEMPLATE)")
+    parser.add_argument('--shards', type=int, default=Config.SHARD_PARAMS['shards'],
+                        help="Split --symbols across this many worker processes (0 runs them in-process)")
+    parser.add_argument('--replay', metavar='PATH', help="Replay a frame recording instead of connecting")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Replay speed multiplier; 0 replays as fast as possible")
+    parser.add_argument('--record', metavar='PATH', help="Record raw frames from the live feed")
+    parser.add_argument('--output', default='-', help="Estimates output file, '-' for stdout")
+    parser.add_argument('--every', type=int, default=1, help="Emit only every Nth estimate")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    parser.add_argument('--checkpoint-dir', default=Config.CHECKPOINT_PARAMS['directory'],
+                        help="Directory for state checkpoints (live feeds only)")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="Start cold and do not save state checkpoints")
+    parser.add_argument('--ingest-policy', choices=('drop_oldest', 'conflate', 'block'),
+                        default=Config.INGEST_QUEUE['policy'],
+                        help="What the ingest queue does when processing falls behind")
+    parser.add_argument('--ingest-size', type=int, default=Config.INGEST_QUEUE['maxsize'],
+                        help="Snapshots buffered between the receive loop and processing")
+    parser.add_argument('--qty-dtype', choices=('float64', 'float32'), default=Config.ORDERBOOK_QTY_DTYPE,
+                        help="Storage type of level quantities in the orderbook history")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="Print the per-symbol history memory footprint for this configuration and exit")
+    parser.add_argument('--sync-refits', action='store_true',
+                        help="Fit regressors inline instead of in a process pool (deterministic replays)")
+    parser.add_argument('--log-level', default=Config.LOG_LEVEL, help="Logging level (logs go to stderr)")
+    return parser.parse_args(argv)
+
+
+def build_client(args, symbol=None):
+    if args.replay:
+        from engine.replay import ReplayClient
+        return ReplayClient(args.replay, speed=args.speed or None)
+
+    from websocket_client import WebSocketClient
+    recorder = None
+    if args.record:
+        from engine.recorder import FrameRecorder
+        # One recording per symbol when streaming several
+        recorder = FrameRecorder(f"{args.record}.{symbol}" if symbol else args.record)
+    url = Config.WEBSOCKET_URL_TEMPLATE.format(symbol=symbol) if symbol else args.url
+    return WebSocketClient(recorder=recorder, url=url)
+
+
+def build_checkpointer(args):
+    # Replays stay deterministic: they neither restore nor overwrite live checkpoints
+    if args.no_checkpoint or args.replay or not Config.CHECKPOINT_PARAMS['enabled']:
+        return None
+    from engine.checkpoint import Checkpointer
+    return Checkpointer(args.checkpoint_dir)
+
+
+async def run_symbols(args, sink):
+    from engine.subscriptions import SubscriptionManager
+
+    manager = SubscriptionManager(args.symbols, client_factory=lambda symbol: build_client(args, symbol),
+                                  on_result=sink, checkpointer=build_checkpointer(args))
+    try:
+        await manager.run(duration=args.duration)
+    finally:
+        sink.flush()
+        manager.log_performance()
+
+
+def run_sharded(args, sink):
+    import time
+    from functools import partial
+    from engine.sharding import ShardedEngine
+
+    engine = ShardedEngine(args.symbols, shards=args.shards, client_factory=partial(build_client, args))
+    engine.start()
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    last = {}
+    try:
+        # Workers publish into shared memory; emit each symbol's estimate when it changes
+        while engine.is_alive() and (deadline is None or time.monotonic() < deadline):
+            time.sleep(Config.UI_REFRESH_RATE / 1000)
+            for symbol in args.symbols:
+                estimate = engine.latest_estimate(symbol)
+                if estimate is not None and estimate != last.get(symbol):
+                    last[symbol] = estimate
+                    sink(estimate)
+    finally:
+        engine.stop()
+        sink.flush()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.symbols and args.replay:
+        sys.exit("--symbols cannot be combined with --replay")
+    if args.ingest_size < 1:
+        sys.exit("--ingest-size must be at least 1")
+    setup_logging(args.log_level, stream=sys.stderr)
+    if args.sync_refits:
+        Config.REFIT_PARAMS['background'] = False
+    if args.no_checkpoint:
+        Config.CHECKPOINT_PARAMS['enabled'] = False
+    Config.CHECKPOINT_PARAMS['directory'] = args.checkpoint_dir
+    Config.INGEST_QUEUE['policy'] = args.ingest_policy
+    Config.INGEST_QUEUE['maxsize'] = args.ingest_size
+    Config.ORDERBOOK_QTY_DTYPE = args.qty_dtype
+    if args.memory_report:
+        from utils.orderbook_store import OrderBookStore
+        print(json.dumps(OrderBookStore().memory_report(), indent=2))
+        return
+
+    from engine.headless import HeadlessEngine, JsonLinesSink
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    sink = JsonLinesSink(output, every=args.every)
+    try:
+        if args.symbols and args.shards:
+            run_sharded(args, sink)
+        elif args.symbols:
+            asyncio.run(run_symbols(args, sink))
+        else:
+            engine = HeadlessEngine(build_client(args), sinks=[sink], checkpointer=build_checkpointer(args))
+            asyncio.run(engine.run(duration=args.duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Engine package for the trade simulator.
+Contains the market-data processing pipeline and the threads that run it.
+"""
@@ -0,0 +1,202 @@
+"""
+Parallel backtest over frame recordings.
+
+Every recording (typically one per instrument and day) is replayed
+through its own headless SimulationPipeline as fast as the models allow,
+and the per-tick estimates are written as columnar .npz files. Files are
+spread across a pool of worker processes.
+
+Usage:
+    python -m engine.backtest data/*.rec --output-dir backtest --workers 4
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from engine.pipeline import SimulationPipeline
+from engine.recorder import read_frames
+from models.refit import describe_refits
+from utils.config import Config
+from utils.decoder import make_decoder
+from utils.logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+ESTIMATE_COLUMNS = (
+    ('timestamp', np.int64),  # Exchange timestamp of the book, epoch nanoseconds
+    ('market_impact', np.float64),  # Percentage
+    ('slippage', np.float64),  # Percentage
+    ('maker', np.float64),  # Percentage
+    ('taker', np.float64),  # Percentage
+)  # Wall-clock processing time is left out so identical inputs give identical files
+
+
+class EstimateColumns:
+    """Growable column arrays of EstimateSnapshot fields; capacity doubles when full"""
+
+    def __init__(self, capacity=1 << 16):
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in ESTIMATE_COLUMNS}
+        self._count = 0
+
+    def append(self, estimate):
+        if self._count == len(self._columns['timestamp']):
+            for name, column in self._columns.items():
+                self._columns[name] = np.concatenate([column, np.empty_like(column)])
+        i = self._count
+        columns = self._columns
+        columns['timestamp'][i] = estimate.timestamp
+        columns['market_impact'][i] = estimate.market_impact
+        columns['slippage'][i] = estimate.slippage
+        columns['maker'][i], columns['taker'][i] = estimate.maker_taker
+        self._count += 1
+
+    def arrays(self):
+        """Filled part of every column"""
+        return {name: column[:self._count] for name, column in self._columns.items()}
+
+    def __len__(self):
+        return self._count
+
+
+def output_path(path, output_dir):
+    """Estimates file for recording `path`: <output_dir>/<recording name>.npz"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, f"{name}.npz")
+
+
+def backtest_file(path, output_dir, symbol=None):
+    """
+    Replay one recording through a fresh pipeline and save its estimates
+
+    Args:
+        path: Frame recording
+        output_dir: Directory for the .npz estimates
+        symbol: Instrument label stored with the estimates
+
+    Returns:
+        dict: path, output, frames, ticks, elapsed seconds and refit metrics per model
+    """
+    pipeline = SimulationPipeline(symbol)
+    decoder = make_decoder(Config.DECODER, Config.FEED_FORMAT)
+    estimates = EstimateColumns()
+    frames = 0
+    start = time.perf_counter()
+    try:
+        for _, frame in read_frames(path):
+            frames += 1
+            try:
+                snapshot = decoder.decode(frame)
+            except Exception as e:
+                logger.error("Error decoding frame in %s: %s", path, e)
+                continue
+            if snapshot is None:
+                continue
+            result = pipeline.process(snapshot)
+            if result is not None:
+                estimates.append(result)
+    finally:
+        pipeline.close()
+    elapsed = time.perf_counter() - start
+    refits = pipeline.refit_metrics()
+
+    output = output_path(path, output_dir)
+    # Write to a temporary name first so an interrupted run never leaves a partial file
+    tmp = output + '.tmp.npz'
+    np.savez(tmp, source=np.array(os.path.abspath(path)), symbol=np.array(symbol or ''),
+             **estimates.arrays())
+    os.replace(tmp, output)
+    logger.info("%s: %d snapshots in %.1fs (%.0f snapshots/s); refits: %s", os.path.basename(path),
+                len(estimates), elapsed, len(estimates) / elapsed if elapsed > 0 else 0.0,
+                " | ".join(f"{model} {describe_refits(metrics)}" for model, metrics in refits.items()))
+    return {'path': path, 'output': output, 'frames': frames, 'ticks': len(estimates), 'elapsed': elapsed,
+            'refits': refits}
+
+
+def _init_worker(config, log_level):
+    """Apply the parent's Config overrides in a spawned worker"""
+    for name, value in config.items():
+        setattr(Config, name, value)
+    setup_logging(log_level)
+
+
+class BacktestRunner:
+    """
+    Runs recordings through independent pipelines in a process pool.
+
+    Each file is one task: models warm up from cold at the start of
+    every file, so results do not depend on how files are scheduled.
+    Workers fit regressors inline (a backtest worker is already one
+    process per core), and refit intervals run on snapshot timestamps,
+    so results do not depend on machine speed either: the same recording
+    always gives the same estimates.
+    """
+    def __init__(self, paths, output_dir, workers=None, symbol=None):
+        self.paths = sorted(paths, key=lambda path: -os.path.getsize(path))  # Longest first balances the pool
+        self.output_dir = output_dir
+        self.workers = min(workers or multiprocessing.cpu_count(), len(self.paths)) or 1
+        self.symbol = symbol
+
+    def run(self):
+        """
+        Process every recording
+
+        Returns:
+            dict: 'files' (per-file results), 'ticks', 'elapsed' wall seconds and 'rate' snapshots/s
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        config = {name: getattr(Config, name) for name in Config.WORKER_CONFIG}
+        config['REFIT_PARAMS'] = dict(Config.REFIT_PARAMS, background=False)
+        log_level = logging.getLevelName(logging.getLogger().getEffectiveLevel())
+        results = []
+        start = time.perf_counter()
+        with ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(config, log_level)) as pool:
+            futures = {pool.submit(backtest_file, path, self.output_dir, self.symbol): path for path in self.paths}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error("Backtest of %s failed: %s", futures[future], e)
+        elapsed = time.perf_counter() - start
+        ticks = sum(result['ticks'] for result in results)
+        rate = ticks / elapsed if elapsed > 0 else 0.0
+        logger.info("Processed %d snapshots from %d/%d files in %.1fs with %d workers (%.0f snapshots/s)",
+                    ticks, len(results), len(self.paths), elapsed, self.workers, rate)
+        return {'files': results, 'ticks': ticks, 'elapsed': elapsed, 'rate': rate}
+
+
+def load_estimates(path):
+    """
+    Read a backtest output file
+
+    Returns:
+        dict: Column name -> array, plus 'source' and 'symbol' strings
+    """
+    with np.load(path, allow_pickle=False) as data:
+        columns = {name: data[name] for name in data.files}
+    columns['source'] = str(columns['source'])
+    columns['symbol'] = str(columns['symbol'])
+    return columns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest cost estimates over frame recordings")
+    parser.add_argument('paths', nargs='+', metavar='PATH', help="Frame recordings, e.g. one per day")
+    parser.add_argument('--output-dir', default='backtest', help="Directory for per-recording .npz estimates")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--symbol', help="Instrument label stored with the estimates")
+    parser.add_argument('--learning-mode', choices=('batch', 'online'), default=Config.LEARNING_MODE,
+                        help="'online' updates the models per tick instead of on periodic refits")
+    parser.add_argument('--log-level', default=Config.LOG_LEVEL, help="Logging level (logs go to stderr)")
+    args = parser.parse_args(argv)
+
+    setup_logging(args.log_level)
+    Config.LEARNING_MODE = args.learning_mode
+    BacktestRunner(args.paths, args.output_dir, args.workers, args.symbol).run()
+
+
+if __name__ == "__main__":
+    main()
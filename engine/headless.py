@@ -0,0 +1,102 @@
+import asyncio
+import json
+import logging
+import sys
+import time
+from engine.pipeline import SimulationPipeline
+from models.refit import describe_refits
+from websocket_client import WebSocketClient
+
+logger = logging.getLogger(__name__)
+
+
+class JsonLinesSink:
+    """Writes each estimate as one JSON object per line"""
+
+    def __init__(self, stream=None, every=1):
+        self.stream = stream or sys.stdout
+        self.every = max(1, every)  # Emit only every Nth estimate
+        self._count = 0
+
+    def __call__(self, estimate):
+        self._count += 1
+        if self._count % self.every:
+            return
+        record = estimate._asdict()
+        record['maker_taker'] = list(record['maker_taker'])
+        self.stream.write(json.dumps(record) + '\n')
+
+    def flush(self):
+        self.stream.flush()
+
+
+class HeadlessEngine:
+    """
+    Runs the cost-estimation pipeline without Qt.
+
+    Wires a market-data source (WebSocketClient or ReplayClient) to a
+    SimulationPipeline and hands every EstimateSnapshot to the configured
+    sinks, which may be any callables (JsonLinesSink, a list's append, ...).
+    Everything runs on the calling thread's asyncio loop.
+    """
+
+    def __init__(self, client=None, sinks=(), pipeline=None, checkpointer=None):
+        self.pipeline = pipeline or SimulationPipeline()
+        self.checkpointer = checkpointer  # Optional Checkpointer restoring and saving pipeline state
+        if checkpointer is not None:
+            checkpointer.load(self.pipeline.symbol, self.pipeline)
+        self.client = client or WebSocketClient()
+        self.client.on_data = self.on_data
+        self.sinks = list(sinks)
+        self.ticks = 0
+
+    def on_data(self, snapshot):
+        result = self.pipeline.process(snapshot)
+        if result is None:
+            return
+        self.ticks += 1
+        if self.checkpointer is not None:
+            self.checkpointer.maybe_save(self.pipeline.symbol, self.pipeline)
+        publish_start = time.perf_counter_ns()
+        for sink in self.sinks:
+            sink(result)
+        self.pipeline.record_published(snapshot, publish_start)
+
+    async def run(self, duration=None):
+        """
+        Process market data until the source ends or `duration` seconds pass
+
+        Args:
+            duration: Optional run time limit in seconds
+        """
+        try:
+            await asyncio.wait_for(self.client.connect(), timeout=duration)
+        except asyncio.TimeoutError:
+            logger.info("Stopping after %ss", duration)
+        finally:
+            await self.client.close()
+            for sink in self.sinks:
+                if hasattr(sink, 'flush'):
+                    sink.flush()
+            if self.checkpointer is not None and self.ticks:
+                self.checkpointer.save(self.pipeline.symbol, self.pipeline)
+                self.checkpointer.wait()
+            self.pipeline.close()
+            logger.info("Processed %d ticks", self.ticks)
+            self.log_performance()
+
+    def log_performance(self):
+        """Log latency percentiles for every instrumented stage, then refit durations and staleness"""
+        metrics = self.pipeline.performance_metrics()
+        for stage, summary in metrics['stages'].items():
+            logger.info("%13s: p50 %.3f ms | p99 %.3f ms | p99.9 %.3f ms | max %.3f ms",
+                        stage, summary['p50'], summary['p99'], summary['p99.9'], summary['max'])
+        for model, refits in metrics['refits'].items():
+            logger.info("%13s: %s", model, describe_refits(refits))
+        ingest = self.client.ingest_metrics()
+        if ingest['enqueued']:
+            logger.info("%13s: %d queued | %d dropped | %d expired | max depth %d", 'ingest',
+                        ingest['enqueued'], ingest['dropped'], ingest['expired'], ingest['max_depth'])
+
+    def stop(self):
+        self.client.running = False
@@ -0,0 +1,284 @@
+import logging
+import time
+from typing import NamedTuple, Tuple
+from models.market_impact import AlmgrenChrissModel
+from models.slippage import SlippageModel
+from models.maker_taker import MakerTakerModel
+from models.cost_curve import CostCurveCalculator
+from models.refit import shutdown_refit_executor
+from utils.orderbook_store import OrderBookStore
+from utils.config import Config
+from utils.latency import LatencyTracker, TickRateMeter
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class EstimateSnapshot(NamedTuple):
+    """Immutable set of cost estimates computed for one market-data tick"""
+    timestamp: int  # Exchange timestamp of the book, epoch nanoseconds
+    market_impact: float  # Percentage
+    slippage: float  # Percentage
+    maker_taker: Tuple[float, float]  # (maker %, taker %)
+    processing_time: float  # Seconds spent in process()
+    symbol: str = None  # Instrument the estimates belong to
+
+
+class CostQuote(NamedTuple):
+    """Cost estimates for one user order against the book of one tick"""
+    version: int  # Orderbook history sequence the quote was computed on
+    symbol: str
+    quantity: float  # USD
+    fee_tier: str
+    market_impact: float  # Percentage
+    slippage: float  # Percentage
+    maker_taker: Tuple[float, float]  # (maker %, taker %)
+    fees: float  # USD
+    fee_rate: float  # Percentage of notional, maker/taker blended
+    impact_cost: float  # USD
+    slippage_cost: float  # USD
+    total_cost: float  # USD
+
+
+def price_estimate(estimate, fee_tier, fee_schedule):
+    """
+    Cost quote for the default order size from one tick's estimates
+
+    Tick estimates are computed for Config.DEFAULT_ORDER_SIZE, so fees and
+    USD costs for that order follow from its percentages without touching
+    the book. Used to fill the fee and total-cost outputs before an order
+    size has been entered.
+
+    Args:
+        estimate: EstimateSnapshot
+        fee_tier: Fee tier name from Config.FEE_TIERS
+        fee_schedule: FeeSchedule holding the tier rates
+
+    Returns:
+        CostQuote
+    """
+    quantity = Config.DEFAULT_ORDER_SIZE
+    maker_fraction = estimate.maker_taker[0] / 100 if Config.FEE_MODEL == 'blended' else 0.0
+    fee_rate = float(fee_schedule.blended_rates(maker_fraction, fee_tier)[0])
+    fees = fee_rate * quantity
+    impact_cost = estimate.market_impact / 100 * quantity
+    slippage_cost = estimate.slippage / 100 * quantity
+    return CostQuote(
+        version=-1,  # Not tied to a book version
+        symbol=estimate.symbol,
+        quantity=quantity,
+        fee_tier=fee_tier,
+        market_impact=estimate.market_impact,
+        slippage=estimate.slippage,
+        maker_taker=estimate.maker_taker,
+        fees=fees,
+        fee_rate=fee_rate * 100,
+        impact_cost=impact_cost,
+        slippage_cost=slippage_cost,
+        total_cost=fees + impact_cost + slippage_cost,
+    )
+
+
+class SimulationPipeline:
+    """
+    Market data -> models -> estimates, without any UI dependency.
+
+    Owns the shared orderbook store and the three models. It is not thread
+    safe: exactly one thread (the engine thread) may call `process`.
+    Per-stage latencies and the tick rate are recorded into `latency` and
+    `tick_rate`, which other threads may read.
+    """
+    STAGES = ('decode', 'queue', 'store', 'market_impact', 'slippage', 'maker_taker',
+              'predict', 'process', 'publish', 'end_to_end')
+
+    def __init__(self, symbol=None):
+        self.symbol = symbol
+        # One shared store; every message is parsed once and read by all models
+        self.orderbook_store = OrderBookStore()
+        self.market_impact_model = AlmgrenChrissModel(self.orderbook_store)
+        self.slippage_model = SlippageModel(self.orderbook_store)
+        self.maker_taker_model = MakerTakerModel(self.orderbook_store)
+        self.cost_curve = CostCurveCalculator(
+            self.market_impact_model, self.slippage_model, self.maker_taker_model)
+        self.latency = LatencyTracker()
+        self.tick_rate = TickRateMeter()
+        self.latest = None  # Most recent EstimateSnapshot
+        self.quotes = LRUCache(Config.QUOTE_CACHE_SIZE)
+
+    def process(self, data):
+        """
+        Run one market-data message through the models
+
+        Args:
+            data: OrderBookSnapshot from the decoder, or a decoded message dict
+
+        Returns:
+            EstimateSnapshot: Latest estimates, or None if the message failed
+        """
+        latency = self.latency
+        start = time.perf_counter_ns()
+        try:
+            # Store the snapshot (normalizing it first if it arrived as a dict)
+            snapshot = self.orderbook_store.append(data)
+            t_store = time.perf_counter_ns()
+            
+            # Process incoming market data
+            self.market_impact_model.update(snapshot)
+            t_impact = time.perf_counter_ns()
+            self.slippage_model.update(snapshot)
+            t_slippage = time.perf_counter_ns()
+            self.maker_taker_model.update(snapshot)
+            t_maker_taker = time.perf_counter_ns()
+
+            result = EstimateSnapshot(
+                timestamp=snapshot.timestamp,
+                market_impact=float(self.market_impact_model.get_latest_impact(Config.DEFAULT_ORDER_SIZE)),
+                slippage=float(self.slippage_model.get_latest_slippage(Config.DEFAULT_ORDER_SIZE)),
+                maker_taker=tuple(float(p) for p in self.maker_taker_model.get_latest_proportion()),
+                processing_time=(time.perf_counter_ns() - start) / 1e9,
+                symbol=self.symbol,
+            )
+            end = time.perf_counter_ns()
+
+            if snapshot.decoded_ns:
+                latency.record_ns('decode', snapshot.received_ns, snapshot.decoded_ns)
+                latency.record_ns('queue', snapshot.decoded_ns, start)
+            latency.record_ns('store', start, t_store)
+            latency.record_ns('market_impact', t_store, t_impact)
+            latency.record_ns('slippage', t_impact, t_slippage)
+            latency.record_ns('maker_taker', t_slippage, t_maker_taker)
+            latency.record_ns('predict', t_maker_taker, end)
+            latency.record_ns('process', start, end)
+            self.tick_rate.tick(end / 1e9)
+            self.latest = result
+            return result
+
+        except Exception as e:
+            logger.error("Error processing market data for %s: %s", self.symbol, e)
+            return None
+
+    def quote(self, quantity, fee_tier, volatility=None, side='buy'):
+        """
+        Cost estimates for a user order from the cached latest book and models
+
+        Nothing is re-run on the models; results are memoized per
+        (book version, quantity, tier, volatility, side), so repeated
+        requests between ticks are dictionary lookups. Must be called
+        from the engine thread.
+
+        Args:
+            quantity: Order size in USD
+            fee_tier: Fee tier name from Config.FEE_TIERS
+            volatility: Optional annualized volatility overriding the estimate in the
+                maker/taker prediction and in slippage beyond the visible depth
+            side: 'buy' or 'sell'
+
+        Returns:
+            CostQuote, or None before the first tick
+        """
+        if self.latest is None:
+            return None
+        version = self.orderbook_store.history.sequence
+        key = (version, quantity, fee_tier, volatility, side)
+        quote = self.quotes.get(key)
+        if quote is not None:
+            return quote
+
+        if volatility is None:
+            maker_taker = self.latest.maker_taker  # Already predicted for this tick
+        else:
+            maker_taker = tuple(float(p) for p in self.maker_taker_model.get_latest_proportion(volatility))
+        maker_fraction = maker_taker[0] / 100 if Config.FEE_MODEL == 'blended' else 0.0
+        curves = self.cost_curve.compute([quantity], fee_tier, side, volatility=volatility,
+                                         maker_fraction=maker_fraction)
+
+        quote = CostQuote(
+            version=version,
+            symbol=self.symbol,
+            quantity=float(quantity),
+            fee_tier=fee_tier,
+            market_impact=float(curves['market_impact'][0]),
+            slippage=float(curves['slippage'][0]),
+            maker_taker=maker_taker,
+            fees=float(curves['fees'][0, 0]),
+            fee_rate=float(curves['fee_rate'][0]),
+            impact_cost=float(curves['impact_cost'][0]),
+            slippage_cost=float(curves['slippage_cost'][0]),
+            total_cost=float(curves['total_cost'][0, 0]),
+        )
+        self.quotes.put(key, quote)
+        return quote
+
+    def cost_curves(self, quantities=None, tiers=None, side='buy', maker_fraction=None):
+        """
+        Impact, slippage, fee and total-cost curves over a USD quantity grid
+
+        Evaluates every order in `quantities` against every tier in one
+        call. See CostCurveCalculator.compute; must be called from the
+        engine thread.
+        """
+        if maker_fraction is None and self.latest is not None and Config.FEE_MODEL == 'blended':
+            maker_fraction = self.latest.maker_taker[0] / 100  # Already predicted for this tick
+        return self.cost_curve.compute(quantities, tiers, side, maker_fraction=maker_fraction)
+
+    def record_published(self, snapshot, publish_start_ns):
+        """
+        Record publish latency and receive-to-publish latency for one tick
+
+        Args:
+            snapshot: The OrderBookSnapshot the published result was computed from
+            publish_start_ns: time.perf_counter_ns() taken just before publishing
+        """
+        end = time.perf_counter_ns()
+        self.latency.record_ns('publish', publish_start_ns, end)
+        if getattr(snapshot, 'received_ns', 0):
+            self.latency.record_ns('end_to_end', snapshot.received_ns, end)
+
+    def performance_metrics(self):
+        """
+        Rolling latency percentiles per stage, the current tick rate and refit metrics
+
+        Returns:
+            dict: {'stages': {stage: {'p50', 'p99', 'p99.9', 'max', 'count'}}, 'tick_rate': float,
+            'refits': see `refit_metrics`}
+        """
+        summaries = self.latency.summaries()
+        return {
+            'stages': {stage: summaries[stage] for stage in self.STAGES if stage in summaries},
+            'tick_rate': self.tick_rate.rate(),
+            'refits': self.refit_metrics(),
+        }
+
+    def refit_metrics(self):
+        """Background refit duration and staleness per regression model"""
+        return {
+            'slippage': self.slippage_model.refit_metrics(),
+            'maker_taker': self.maker_taker_model.refit_metrics(),
+        }
+
+    def get_state(self):
+        """
+        History, rolling statistics and fitted model parameters for checkpointing
+
+        Returns:
+            dict: Flat name -> array mapping, prefixed by component
+        """
+        state = {}
+        for prefix, component in self._stateful():
+            state.update({f'{prefix}.{k}': v for k, v in component.get_state().items()})
+        return state
+
+    def set_state(self, state):
+        """Restore everything saved by `get_state`; must be called before the first tick"""
+        for prefix, component in self._stateful():
+            prefix = prefix + '.'
+            component.set_state({k[len(prefix):]: v for k, v in state.items() if k.startswith(prefix)})
+
+    def _stateful(self):
+        return (('store', self.orderbook_store),
+                ('slippage', self.slippage_model),
+                ('maker_taker', self.maker_taker_model))
+
+    def close(self):
+        """Release resources held by the models"""
+        shutdown_refit_executor()
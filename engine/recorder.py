@@ -0,0 +1,71 @@
+import struct
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TSIMREC1'
+RECORD_HEADER = struct.Struct('<qI')  # Receive time (epoch ns), payload length
+
+
+class FrameRecorder:
+    """
+    Append-only recorder of raw websocket frames.
+
+    File layout: an 8-byte magic followed by records of
+    [int64 receive time in epoch ns][uint32 length][raw frame bytes].
+    Frames are stored exactly as received so replays exercise the decoder.
+    """
+
+    def __init__(self, path, buffering=1 << 20):
+        self.path = path
+        self.frames = 0
+        self._file = open(path, 'ab', buffering=buffering)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def write(self, frame, recv_ns=None):
+        """
+        Append one frame
+
+        Args:
+            frame: Raw frame as str or bytes
+            recv_ns: Receive time in epoch nanoseconds (defaults to now)
+        """
+        if isinstance(frame, str):
+            frame = frame.encode()
+        if recv_ns is None:
+            recv_ns = time.time_ns()
+        self._file.write(RECORD_HEADER.pack(recv_ns, len(frame)))
+        self._file.write(frame)
+        self.frames += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            logger.info("Recorded %d frames to %s", self.frames, self.path)
+
+
+def read_frames(path):
+    """
+    Iterate over a recording
+
+    Yields:
+        tuple: (recv_ns, frame_bytes)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a frame recording")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            recv_ns, length = RECORD_HEADER.unpack(header)
+            frame = f.read(length)
+            if len(frame) < length:
+                logger.warning("Truncated record at end of %s", path)
+                return
+            yield recv_ns, frame
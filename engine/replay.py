@@ -0,0 +1,141 @@
+import asyncio
+import time
+import logging
+import websockets
+from engine.recorder import read_frames
+from websocket_client import WebSocketClient
+
+logger = logging.getLogger(__name__)
+
+
+class Pacer:
+    """
+    Paces recorded frames against their original receive times.
+
+    speed=1.0 replays in real time, other values scale the gaps between
+    frames, and speed=None (or 0) sends frames as fast as possible.
+    """
+
+    def __init__(self, speed=1.0):
+        self.speed = speed or None
+        self._first_recv_ns = None
+        self._start = None
+
+    async def wait(self, recv_ns):
+        if self.speed is None:
+            return
+        if self._first_recv_ns is None:
+            self._first_recv_ns = recv_ns
+            self._start = time.perf_counter()
+            return
+        due = self._start + (recv_ns - self._first_recv_ns) / 1e9 / self.speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ReplayClient(WebSocketClient):
+    """
+    Drop-in replacement for WebSocketClient that reads a recording.
+
+    Frames go through the same decoder and `on_data` callback as live
+    data, so everything downstream of the receive loop is exercised. The
+    loop yields to the event loop every `YIELD_EVERY` frames so several
+    replays can share one loop.
+
+    Paced replays hand snapshots to the ingest queue like the live client,
+    so overload behaviour can be reproduced offline. Unpaced replays call
+    `on_data` directly: with no arrival clock to fall behind, every frame
+    is processed.
+    """
+    YIELD_EVERY = 10
+
+    def __init__(self, path, speed=1.0, on_data=None, decoder=None):
+        super().__init__(on_data=on_data, decoder=decoder)
+        self.path = path
+        self.speed = speed
+        self.frames = 0
+        self.elapsed = 0.0
+
+    async def connect(self):
+        self.running = True
+        self.frames = 0
+        pacer = Pacer(self.speed)
+        queued = pacer.speed is not None
+        consumer = None
+        if queued:
+            self.queue.clear()
+            consumer = asyncio.create_task(self.process_messages())
+        start = time.perf_counter()
+        try:
+            await self._replay(pacer, queued)
+            # Let the consumer finish what is still queued
+            while queued and len(self.queue) and self.running:
+                await asyncio.sleep(0)
+        finally:
+            if consumer is not None:
+                consumer.cancel()
+                await asyncio.gather(consumer, return_exceptions=True)
+        self.elapsed = time.perf_counter() - start
+        self.running = False
+        logger.info("Replayed %d frames in %.3fs (%.0f frames/s)",
+                    self.frames, self.elapsed, self.throughput())
+
+    async def _replay(self, pacer, queued):
+        for recv_ns, frame in read_frames(self.path):
+            if not self.running:
+                break
+            await pacer.wait(recv_ns)
+            try:
+                received_ns = time.perf_counter_ns()
+                snapshot = self.decoder.decode(frame)
+                if snapshot is not None:
+                    snapshot.received_ns = received_ns
+                    snapshot.decoded_ns = time.perf_counter_ns()
+                    if queued:
+                        await self.queue.put(snapshot)
+                    elif self.on_data is not None:
+                        self.on_data(snapshot)
+            except Exception as e:
+                logger.error("Error replaying frame: %s", e)
+            self.frames += 1
+            # Yield even when paced: a replay that falls behind never sleeps,
+            # and other streams on the same loop must still get a turn
+            if self.frames % self.YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+    def throughput(self):
+        """Frames per second achieved by the last replay"""
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    async def close(self):
+        self.running = False
+
+
+class ReplayServer:
+    """
+    Local websocket server that plays a recording to every client that connects.
+
+    Point Config.WEBSOCKET_URL at ws://host:port to exercise the real
+    WebSocketClient, network stack included, without an exchange.
+    """
+
+    def __init__(self, path, host='127.0.0.1', port=8765, speed=1.0):
+        self.path = path
+        self.host = host
+        self.port = port
+        self.speed = speed
+
+    async def _handler(self, websocket, *args):
+        pacer = Pacer(self.speed)
+        frames = 0
+        for recv_ns, frame in read_frames(self.path):
+            await pacer.wait(recv_ns)
+            await websocket.send(frame.decode())
+            frames += 1
+        logger.info("Replay server sent %d frames", frames)
+
+    async def serve_forever(self):
+        async with websockets.serve(self._handler, self.host, self.port):
+            logger.info("Replay server listening on ws://%s:%s", self.host, self.port)
+            await asyncio.Future()
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from engine.pipeline import EstimateSnapshot
+from engine.subscriptions import SubscriptionManager, default_client_factory
+from utils.config import Config
+from utils.logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+RESULT_DTYPE = np.dtype([
+    ('seq', np.int64),  # Seqlock counter: odd while a write is in progress
+    ('timestamp', np.int64),  # Exchange timestamp of the book, epoch nanoseconds
+    ('ticks', np.int64),
+    ('market_impact', np.float64),
+    ('slippage', np.float64),
+    ('maker', np.float64),
+    ('taker', np.float64),
+    ('processing_time', np.float64),  # Seconds
+    ('tick_rate', np.float64),  # Ticks per second
+    ('latency_p50', np.float64),  # Milliseconds, end-to-end (or process) stage
+    ('latency_p99', np.float64),
+])
+
+
+class ResultsBoard:
+    """
+    Fixed-layout table of the latest estimate per symbol in shared memory.
+
+    One row per symbol, each written by exactly one process. Rows are
+    guarded by a seqlock: the writer bumps `seq` to an odd value, writes
+    the fields and bumps it back to even; a reader copies the row and
+    retries if `seq` was odd or changed underneath it. Readers never take
+    a lock and nothing is pickled, so any number of consumers can poll
+    the board at UI rate while workers write at tick rate.
+    """
+
+    def __init__(self, symbols, name=None):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        size = RESULT_DTYPE.itemsize * len(self.symbols)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.rows = np.ndarray((len(self.symbols),), dtype=RESULT_DTYPE, buffer=self.shm.buf)
+        if self.owner:
+            self.rows[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, symbol, estimate, ticks, tick_rate, latency=None):
+        """
+        Publish the latest estimate for a symbol; only the symbol's owning process may call this
+
+        Args:
+            symbol: Instrument the estimate belongs to
+            estimate: EstimateSnapshot
+            ticks: Total ticks processed for the symbol
+            tick_rate: Current ticks per second
+            latency: Optional (p50, p99) in milliseconds
+        """
+        row = self.rows[self.index[symbol]:self.index[symbol] + 1]
+        seq = row['seq'][0]
+        row['seq'] = seq + 1
+        row['timestamp'] = estimate.timestamp
+        row['ticks'] = ticks
+        row['market_impact'] = estimate.market_impact
+        row['slippage'] = estimate.slippage
+        row['maker'], row['taker'] = estimate.maker_taker
+        row['processing_time'] = estimate.processing_time
+        row['tick_rate'] = tick_rate
+        if latency is not None:
+            row['latency_p50'], row['latency_p99'] = latency
+        row['seq'] = seq + 2
+
+    def read_row(self, symbol, retries=1000):
+        """
+        Consistent copy of one symbol's row
+
+        Returns:
+            np.void: Row copy, or None if no estimate has been written yet
+        """
+        i = self.index[symbol]
+        for _ in range(retries):
+            before = int(self.rows['seq'][i])
+            if before & 1:
+                continue
+            row = self.rows[i].copy()
+            if int(self.rows['seq'][i]) == before:
+                return row if before else None
+        logger.warning("Gave up reading a consistent row for %s", symbol)
+        return None
+
+    def read(self, symbol):
+        """
+        Latest estimate for a symbol
+
+        Returns:
+            EstimateSnapshot or None
+        """
+        row = self.read_row(symbol)
+        if row is None:
+            return None
+        return EstimateSnapshot(
+            timestamp=int(row['timestamp']),
+            market_impact=float(row['market_impact']),
+            slippage=float(row['slippage']),
+            maker_taker=(float(row['maker']), float(row['taker'])),
+            processing_time=float(row['processing_time']),
+            symbol=symbol,
+        )
+
+    def performance_metrics(self, symbol):
+        """Latency and tick rate in the same shape as SimulationPipeline.performance_metrics"""
+        row = self.read_row(symbol)
+        if row is None:
+            return {'stages': {}, 'tick_rate': 0.0, 'ticks': 0}
+        return {
+            'stages': {'end_to_end': {'p50': float(row['latency_p50']), 'p99': float(row['latency_p99'])}},
+            'tick_rate': float(row['tick_rate']),
+            'ticks': int(row['ticks']),
+        }
+
+    def close(self):
+        self.rows = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def shard_symbols(symbols, shards):
+    """
+    Partition symbols round-robin into at most `shards` groups
+
+    Returns:
+        list: Non-empty lists of symbols
+    """
+    groups = [list(symbols[i::shards]) for i in range(max(1, shards))]
+    return [group for group in groups if group]
+
+
+def replay_client_factory(paths, speed, symbol):
+    """Picklable client factory replaying `paths[symbol]`; bind paths and speed with functools.partial"""
+    from engine.replay import ReplayClient
+    return ReplayClient(paths[symbol], speed=speed)
+
+
+def run_shard(board_name, board_symbols, symbols, client_factory, stop_event, config=None,
+              log_level=Config.LOG_LEVEL):
+    """
+    Worker process entry point: stream `symbols` and publish to the shared board
+
+    Args:
+        board_name: Shared-memory name of the ResultsBoard
+        board_symbols: Row order of the whole board
+        symbols: Symbols owned by this shard
+        client_factory: Picklable callable, symbol -> client
+        stop_event: multiprocessing.Event set by the parent to stop the shard
+        config: Config attributes set at runtime in the parent (spawned children re-import Config)
+    """
+    for name, value in (config or {}).items():
+        setattr(Config, name, value)
+    setup_logging(log_level)
+    board = ResultsBoard(board_symbols, name=board_name)
+    every = Config.SHARD_PARAMS['latency_every']
+
+    def publish(result):
+        symbol = result.symbol
+        pipeline = manager.pipelines[symbol]
+        ticks = manager.ticks[symbol]
+        latency = None
+        if (ticks - 1) % every == 0:
+            # Percentiles are comparatively expensive, refresh them every `latency_every` ticks
+            metrics = pipeline.performance_metrics()['stages']
+            summary = metrics.get('end_to_end') or metrics.get('process')
+            if summary is not None:
+                latency = (summary['p50'], summary['p99'])
+        board.write(symbol, result, ticks, pipeline.tick_rate.rate(), latency)
+
+    checkpointer = None
+    if Config.CHECKPOINT_PARAMS['enabled']:
+        from engine.checkpoint import Checkpointer
+        checkpointer = Checkpointer()
+    manager = SubscriptionManager(symbols, client_factory=client_factory, on_result=publish,
+                                  checkpointer=checkpointer)
+
+    async def main():
+        async def watch_stop():
+            while not stop_event.is_set():
+                await asyncio.sleep(Config.SHARD_PARAMS['stop_poll_interval'])
+            manager.stop()
+
+        watcher = asyncio.get_running_loop().create_task(watch_stop())
+        try:
+            await manager.run()
+        finally:
+            watcher.cancel()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.log_performance()
+        board.close()
+
+
+class ShardedEngine:
+    """
+    Runs symbols in several worker processes, one SubscriptionManager each.
+
+    Symbols are partitioned round-robin across `shards` spawned processes
+    so per-tick model work (float conversion, volatility, sklearn predict)
+    uses one core per shard instead of sharing the GIL. Workers publish
+    into a ResultsBoard that this process (GUI or headless consumer) reads
+    lock-free via `latest_estimate`.
+    """
+    def __init__(self, symbols=None, shards=None, client_factory=default_client_factory):
+        self.symbols = list(symbols or Config.SYMBOLS)
+        shards = shards or Config.SHARD_PARAMS['shards'] or multiprocessing.cpu_count()
+        self.groups = shard_symbols(self.symbols, shards)
+        self.client_factory = client_factory  # Must be picklable: module-level function or partial
+        self.board = ResultsBoard(self.symbols)
+        self._context = multiprocessing.get_context('spawn')
+        self._stop = self._context.Event()
+        self.processes = []
+
+    def start(self):
+        for i, group in enumerate(self.groups):
+            process = self._context.Process(
+                target=run_shard,
+                args=(self.board.name, self.symbols, group, self.client_factory, self._stop,
+                      {name: getattr(Config, name) for name in Config.WORKER_CONFIG},
+                      logging.getLevelName(logging.getLogger().getEffectiveLevel())),
+                name=f"shard-{i}",
+            )
+            process.start()
+            self.processes.append(process)
+        logger.info("Started %d shards for %d symbols", len(self.processes), len(self.symbols))
+
+    def latest_estimate(self, symbol):
+        """Most recent EstimateSnapshot for `symbol`, or None; never blocks on the workers"""
+        return self.board.read(symbol)
+
+    def performance_metrics(self, symbol=None):
+        """
+        Tick rate and latency per symbol from the shared board
+
+        Returns:
+            dict: Metrics for `symbol`, or {symbol: metrics} for every symbol
+        """
+        if symbol is not None:
+            return self.board.performance_metrics(symbol)
+        return {s: self.board.performance_metrics(s) for s in self.symbols}
+
+    def is_alive(self):
+        return any(process.is_alive() for process in self.processes)
+
+    def join(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for process in self.processes:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            process.join(remaining)
+
+    def stop(self, timeout=10.0):
+        """Ask every shard to stop, wait for them, and release the board"""
+        self._stop.set()
+        self.join(timeout)
+        for process in self.processes:
+            if process.is_alive():
+                logger.warning("Terminating unresponsive %s", process.name)
+                process.terminate()
+                process.join()
+        self.processes = []
+        if self.board.rows is not None:
+            self.board.close()
+
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from engine.pipeline import SimulationPipeline
+from models.refit import describe_refits, shutdown_refit_executor
+from utils.config import Config
+from websocket_client import WebSocketClient
+
+logger = logging.getLogger(__name__)
+
+
+def default_client_factory(symbol):
+    """Live websocket client for one instrument"""
+    return WebSocketClient(url=Config.WEBSOCKET_URL_TEMPLATE.format(symbol=symbol))
+
+
+class SubscriptionManager:
+    """
+    Streams many instruments concurrently on one asyncio loop.
+
+    Every symbol gets its own client and its own SimulationPipeline (book,
+    models, latency tracker and tick-rate meter), so symbols never share
+    state and per-symbol metrics come for free. All receive loops run as
+    tasks on the loop that calls `run`; only that thread may call
+    `process`-side methods. `latest` is a dict of immutable
+    EstimateSnapshots that other threads may read at any time, which is
+    what lets the UI switch symbols without reconnecting.
+    """
+
+    def __init__(self, symbols=None, client_factory=default_client_factory, on_result=None, checkpointer=None):
+        self.client_factory = client_factory  # Callable: symbol -> WebSocketClient or ReplayClient
+        self.on_result = on_result  # Called with each EstimateSnapshot on the loop's thread
+        self.checkpointer = checkpointer  # Optional Checkpointer restoring and saving per-symbol state
+        self.pipelines = {}
+        self.clients = {}
+        self.latest = {}  # symbol -> most recent EstimateSnapshot
+        self.ticks = {}
+        self._tasks = {}
+        self._loop = None
+        for symbol in symbols or Config.SYMBOLS:
+            self._create_pipeline(symbol)
+
+    @property
+    def symbols(self):
+        return list(self.pipelines)
+
+    def add_symbol(self, symbol):
+        """
+        Start tracking another instrument; must be called from the loop's thread while running
+
+        Returns:
+            SimulationPipeline: The pipeline for `symbol`
+        """
+        if symbol not in self.pipelines:
+            self._create_pipeline(symbol)
+        if self._loop is not None and symbol not in self._tasks:
+            self._start(symbol)
+        return self.pipelines[symbol]
+
+    def _create_pipeline(self, symbol):
+        pipeline = SimulationPipeline(symbol)
+        if self.checkpointer is not None:
+            self.checkpointer.load(symbol, pipeline)
+        self.pipelines[symbol] = pipeline
+        self.ticks[symbol] = 0
+
+    async def remove_symbol(self, symbol):
+        """Stop streaming an instrument and drop its state"""
+        client = self.clients.pop(symbol, None)
+        task = self._tasks.pop(symbol, None)
+        if client is not None:
+            client.running = False
+        if task is not None:
+            task.cancel()
+        if client is not None:
+            await client.close()
+        self.pipelines.pop(symbol, None)
+        self.latest.pop(symbol, None)
+        self.ticks.pop(symbol, None)
+
+    def _start(self, symbol):
+        client = self.client_factory(symbol)
+        client.on_data = lambda snapshot: self.on_data(symbol, snapshot)
+        self.clients[symbol] = client
+        self._tasks[symbol] = self._loop.create_task(client.connect())
+
+    def on_data(self, symbol, snapshot):
+        pipeline = self.pipelines[symbol]
+        result = pipeline.process(snapshot)
+        if result is None:
+            return
+        self.latest[symbol] = result
+        self.ticks[symbol] += 1
+        if self.checkpointer is not None:
+            self.checkpointer.maybe_save(symbol, pipeline)
+        if self.on_result is not None:
+            publish_start = time.perf_counter_ns()
+            self.on_result(result)
+            pipeline.record_published(snapshot, publish_start)
+
+    async def run(self, duration=None):
+        """
+        Stream every symbol until all sources end or `duration` seconds pass
+
+        Args:
+            duration: Optional run time limit in seconds
+        """
+        self._loop = asyncio.get_running_loop()
+        for symbol in self.symbols:
+            self._start(symbol)
+        deadline = None if duration is None else self._loop.time() + duration
+        try:
+            # Symbols added while running get their own tasks, so wait until none are left
+            while True:
+                pending = [task for task in self._tasks.values() if not task.done()]
+                if not pending:
+                    break
+                timeout = None if deadline is None else deadline - self._loop.time()
+                if timeout is not None and timeout <= 0:
+                    logger.info("Stopping after %ss", duration)
+                    break
+                await asyncio.wait(pending, timeout=timeout)
+        finally:
+            await self.close()
+
+    def stop(self):
+        """Ask every receive loop to finish; thread safe"""
+        for client in list(self.clients.values()):
+            client.running = False
+        if self._loop is not None:
+            for task in list(self._tasks.values()):
+                self._loop.call_soon_threadsafe(task.cancel)
+
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        await asyncio.gather(*(client.close() for client in self.clients.values()), return_exceptions=True)
+        self._tasks.clear()
+        self._loop = None
+        if self.checkpointer is not None:
+            for symbol, pipeline in self.pipelines.items():
+                if self.ticks[symbol]:
+                    self.checkpointer.save(symbol, pipeline)
+            self.checkpointer.wait()
+        # The refit pool is shared by every pipeline
+        shutdown_refit_executor()
+
+    def latest_estimate(self, symbol):
+        """Most recent EstimateSnapshot for `symbol`, or None; safe to call from any thread"""
+        return self.latest.get(symbol)
+
+    def performance_metrics(self):
+        """
+        Tick rate, stage latency percentiles and ingest queue counters per symbol
+
+        Returns:
+            dict: {symbol: {'stages': {...}, 'tick_rate': float, 'ticks': int, 'ingest': dict or None}}
+        """
+        metrics = {}
+        for symbol, pipeline in list(self.pipelines.items()):
+            metrics[symbol] = pipeline.performance_metrics()
+            metrics[symbol]['ticks'] = self.ticks.get(symbol, 0)
+            client = self.clients.get(symbol)
+            metrics[symbol]['ingest'] = client.ingest_metrics() if client is not None else None
+        return metrics
+
+    def log_performance(self):
+        """Log tick counts, tick rates, end-to-end latency and refit metrics per symbol"""
+        for symbol, metrics in self.performance_metrics().items():
+            latency = metrics['stages'].get('end_to_end') or metrics['stages'].get('process')
+            if latency is None:
+                logger.info("%10s: no ticks", symbol)
+                continue
+            ingest = metrics['ingest']
+            dropped = ingest['dropped'] + ingest['expired'] if ingest else 0
+            logger.info("%10s: %d ticks | %.1f ticks/s | p50 %.3f ms | p99 %.3f ms | %d dropped",
+                        symbol, metrics['ticks'], metrics['tick_rate'], latency['p50'], latency['p99'], dropped)
+            logger.info("%10s: refits: %s", symbol, " | ".join(
+                f"{model} {describe_refits(refits)}" for model, refits in metrics['refits'].items()))
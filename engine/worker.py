@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from PyQt6.QtCore import QThread, pyqtSignal
+from engine.subscriptions import SubscriptionManager
+
+logger = logging.getLogger(__name__)
+
+
+class EngineWorker(QThread):
+    """
+    Runs every websocket receive loop and all model updates in a dedicated thread.
+
+    The GUI thread only ever receives `EstimateSnapshot` tuples through the
+    `results_ready` signal, so parsing, model updates and refits never
+    block the event loop that paints the window. All symbols keep
+    streaming; only results for `active_symbol` are emitted.
+
+    When order parameters are set with `set_order`, every tick of the
+    active symbol is emitted as a CostQuote for that order instead, and a
+    parameter change is priced at once from the cached book on the engine
+    thread and sent through `quote_ready` without waiting for a tick.
+    """
+    results_ready = pyqtSignal(object)
+    quote_ready = pyqtSignal(object)
+
+    def __init__(self, manager=None, active_symbol=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager or SubscriptionManager()
+        self.manager.on_result = self.on_result
+        self.active_symbol = active_symbol or self.manager.symbols[0]
+        self.order = None  # (quantity USD, fee tier, volatility override or None)
+        self._requote_pending = False
+        self._loop = None
+        self._task = None
+
+    def run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        # Every client invokes its on_data callback from this thread's event loop
+        self._task = self._loop.create_task(self.manager.run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            logger.info("Engine thread stopped")
+
+    def on_result(self, result):
+        if result.symbol != self.active_symbol:
+            return
+        order = self.order
+        if order is not None:
+            quote = self.manager.pipelines[result.symbol].quote(*order)
+            if quote is not None:
+                result = quote
+        self.results_ready.emit(result)
+
+    def set_active_symbol(self, symbol):
+        """
+        Switch the symbol whose results are emitted; safe to call from the GUI thread
+
+        Returns:
+            EstimateSnapshot: Latest estimate already computed for `symbol`, or None
+        """
+        self.active_symbol = symbol  # Single reference assignment, read by the engine thread
+        self.request_quote()
+        return self.manager.latest_estimate(symbol)
+
+    def set_order(self, quantity, fee_tier, volatility=None):
+        """
+        Set the order to price and request an immediate quote; safe to call from the GUI thread
+
+        Args:
+            quantity: Order size in USD; 0 or less goes back to the default estimates
+            fee_tier: Fee tier name
+            volatility: Optional annualized volatility override
+        """
+        order = (quantity, fee_tier, volatility) if quantity > 0 else None
+        if order == self.order:
+            return
+        self.order = order
+        self.request_quote()
+
+    def request_quote(self):
+        """Schedule one re-quote on the engine loop; calls made before it runs are coalesced"""
+        if self._loop is None or self._requote_pending or self.order is None:
+            return
+        self._requote_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._requote)
+        except RuntimeError:  # Loop already closed
+            self._requote_pending = False
+
+    def _requote(self):
+        self._requote_pending = False
+        order, symbol = self.order, self.active_symbol
+        pipeline = self.manager.pipelines.get(symbol)
+        if order is None or pipeline is None:
+            return
+        quote = pipeline.quote(*order)
+        if quote is not None:
+            self.quote_ready.emit(quote)
+
+    def stop(self):
+        """Cancel the receive loops and wait for the thread to finish"""
+        if self.isRunning() and self._task is not None:
+            self.manager.stop()
+        self.wait()
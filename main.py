@@ -2,24 +2,18 @@ import sys
 import asyncio
 import logging
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout
-from PyQt6.QtCore import QThread, pyqtSignal
-from websocket_client import WebSocketClient
+from PyQt6.QtCore import Qt, QTimer
 from ui.input_panel import InputPanel
 from ui.output_panel import OutputPanel
-from models.market_impact import AlmgrenChrissModel
-from models.slippage import SlippageModel
-from models.maker_taker import MakerTakerModel
+from ui.publisher import ConflatingPublisher
+from engine.checkpoint import Checkpointer
+from engine.pipeline import CostQuote, price_estimate
+from engine.sharding import ShardedEngine
+from engine.subscriptions import SubscriptionManager
+from engine.worker import EngineWorker
+from models.fees import FeeSchedule
 from utils.config import Config
-
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format=Config.LOG_FORMAT,
-    handlers=[
-        logging.FileHandler(Config.LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+from utils.logging_setup import setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +25,7 @@ class TradeSimulator(QMainWindow):
         
         # Initialize components
         self.init_ui()
-        self.init_models()
-        self.init_websocket()
+        self.init_engine()
         
     def init_ui(self):
         # Create main widget and layout
@@ -48,42 +41,119 @@ class TradeSimulator(QMainWindow):
         layout.addWidget(self.input_panel)
         layout.addWidget(self.output_panel)
         
-    def init_models(self):
-        self.market_impact_model = AlmgrenChrissModel()
-        self.slippage_model = SlippageModel()
-        self.maker_taker_model = MakerTakerModel()
-        
-    def init_websocket(self):
-        self.ws_client = WebSocketClient()
-        self.ws_client.data_received.connect(self.process_market_data)
-        
-    def process_market_data(self, data):
-        try:
-            # Process incoming market data
-            self.market_impact_model.update(data)
-            self.slippage_model.update(data)
-            self.maker_taker_model.update(data)
-            
-            # Update UI with new calculations
-            self.update_output_panel()
-            
-        except Exception as e:
-            logger.error(f"Error processing market data: {str(e)}")
+    def init_engine(self):
+        self.active_symbol = self.input_panel.asset_combo.currentText()
+        self.engine = None
+        self.sharded_engine = None
+        self.fee_schedule = FeeSchedule()
+        if Config.SHARD_PARAMS['shards']:
+            self.init_sharded_engine()
+        else:
+            self.init_engine_thread()
+        self.input_panel.asset_combo.currentTextChanged.connect(self.switch_symbol)
+        
+    def init_engine_thread(self):
+        # Market data for every symbol is received and processed on the engine
+        # thread; the GUI thread only receives immutable result snapshots
+        # State is restored from the last checkpoint so estimates are valid from the first tick
+        checkpointer = Checkpointer() if Config.CHECKPOINT_PARAMS['enabled'] else None
+        self.subscriptions = SubscriptionManager(Config.SYMBOLS, checkpointer=checkpointer)
+        self.engine = EngineWorker(self.subscriptions, active_symbol=self.active_symbol)
+        
+        # Results are conflated on the engine thread and repainted at
+        # Config.UI_REFRESH_RATE instead of once per tick
+        self.publisher = ConflatingPublisher(self.update_output_panel, parent=self)
+        self.engine.results_ready.connect(self.publisher.publish, Qt.ConnectionType.DirectConnection)
+        
+        # Order inputs are priced immediately from the engine's cached book
+        self.engine.quote_ready.connect(self.update_output_panel)
+        self.input_panel.input_changed.connect(self.on_input_changed)
+        self.publisher.start()
+        self.engine.start()
+        
+    def init_sharded_engine(self):
+        # Symbols are split across worker processes that write a shared-memory
+        # results board; the GUI reads the active symbol's row once per frame
+        self.sharded_engine = ShardedEngine(Config.SYMBOLS, Config.SHARD_PARAMS['shards'])
+        self.sharded_engine.start()
+        self.board_timer = QTimer(self)
+        self.board_timer.setInterval(Config.UI_REFRESH_RATE)
+        self.board_timer.timeout.connect(self.poll_results_board)
+        self.board_timer.start()
+        
+    def on_input_changed(self, inputs):
+        # Volatility is entered in percent; 0 (or empty) uses the estimated volatility
+        volatility = inputs['volatility'] / 100 if inputs['volatility'] > 0 else None
+        self.engine.set_order(inputs['quantity'], inputs['fee_tier'], volatility)
+        
+    def poll_results_board(self):
+        estimate = self.sharded_engine.latest_estimate(self.active_symbol)
+        if estimate is not None:
+            self.update_output_panel(estimate)
+        
+    def performance_metrics(self):
+        # Rolling performance metrics recorded by the engine for the active symbol
+        if self.sharded_engine is not None:
+            return self.sharded_engine.performance_metrics(self.active_symbol)
+        return self.subscriptions.pipelines[self.active_symbol].performance_metrics()
+        
+    def switch_symbol(self, symbol):
+        # Every symbol is already streaming, so switching only changes what is shown
+        if symbol not in Config.SYMBOLS:
+            logger.warning("Symbol %s is not subscribed", symbol)
+            return
+        self.active_symbol = symbol
+        if self.sharded_engine is not None:
+            estimate = self.sharded_engine.latest_estimate(symbol)
+        else:
+            estimate = self.engine.set_active_symbol(symbol)
+            if self.engine.order is not None:
+                estimate = None  # A quote for the entered order follows
+        if estimate is not None:
+            self.update_output_panel(estimate)
+        
+    def update_output_panel(self, estimate):
+        # Drop a frame conflated just before a symbol switch
+        if estimate.symbol != self.active_symbol:
+            return
             
-    def update_output_panel(self):
-        # Get latest calculations from models
-        market_impact = self.market_impact_model.get_latest_impact()
-        slippage = self.slippage_model.get_latest_slippage()
-        maker_taker = self.maker_taker_model.get_latest_proportion()
-        
-        # Update output panel
-        self.output_panel.update_values({
-            'market_impact': market_impact,
-            'slippage': slippage,
-            'maker_taker': maker_taker
-        })
+        # Update output panel with the latest calculations
+        values = {
+            'market_impact': estimate.market_impact,
+            'slippage': estimate.slippage,
+            'maker_taker': estimate.maker_taker
+        }
+        if not isinstance(estimate, CostQuote):
+            # No order size entered: show fees and costs of the default order size
+            estimate = price_estimate(estimate, self.input_panel.fee_tier_combo.currentText(),
+                                      self.fee_schedule)
+        values.update(fees=estimate.fees, fee_rate=estimate.fee_rate,
+                      impact_cost=estimate.impact_cost, slippage_cost=estimate.slippage_cost,
+                      total_cost=estimate.total_cost)
+        
+        metrics = self.performance_metrics()
+        latency = metrics['stages'].get('end_to_end') or metrics['stages'].get('process')
+        if latency:
+            values['latency'] = latency['p50']
+            values['latency_p99'] = latency['p99']
+        values['tick_rate'] = metrics['tick_rate']
+        if 'refits' in metrics:  # Not published on the sharded results board
+            values['refits'] = metrics['refits']
+        
+        self.output_panel.update_values(values)
+        
+    def closeEvent(self, event):
+        if self.sharded_engine is not None:
+            self.board_timer.stop()
+            self.sharded_engine.stop()
+        else:
+            self.publisher.stop()
+            self.engine.stop()
+        super().closeEvent(event)
 
 def main():
+    # Configure logging; records are written by a background thread
+    setup_logging(Config.LOG_LEVEL, log_file=Config.LOG_FILE)
     app = QApplication(sys.argv)
     simulator = TradeSimulator()
     simulator.show()
@@ -0,0 +1,83 @@
+import numpy as np
+from models.fees import FeeSchedule
+from utils.config import Config
+
+
+class CostCurveCalculator:
+    """
+    Cost vs. order size for every fee tier in one vectorized pass.
+
+    Reads the latest state of the three models and evaluates impact,
+    slippage and fees over a whole NumPy array of USD quantities at once,
+    replacing per-quantity calls to the get_latest_* methods. With
+    Config.FEE_MODEL = 'blended', fees weigh maker and taker rates by the
+    maker/taker model's predicted proportions.
+    """
+
+    def __init__(self, market_impact_model, slippage_model, maker_taker_model, fee_schedule=None):
+        self.market_impact_model = market_impact_model
+        self.slippage_model = slippage_model
+        self.maker_taker_model = maker_taker_model
+        self.fee_schedule = fee_schedule or FeeSchedule()
+
+    def maker_fraction(self, volatility=None):
+        """Share of volume expected to fill as maker under Config.FEE_MODEL, in [0, 1]"""
+        if Config.FEE_MODEL != 'blended':
+            return 0.0
+        maker_pct, _ = self.maker_taker_model.get_latest_proportion(volatility)
+        return maker_pct / 100  # The model reports percentages
+
+    def compute(self, quantities=None, tiers=None, side='buy', time_horizon=1.0, volatility=None,
+                maker_fraction=None):
+        """
+        Evaluate cost curves
+
+        Args:
+            quantities: Array of USD order sizes (defaults to Config.COST_CURVE_QUANTITIES)
+            tiers: Fee tier name(s), or None for all of Config.FEE_TIERS
+            side: 'buy' or 'sell'
+            time_horizon: Trading horizon in days for the impact model
+            volatility: Optional annualized volatility overriding the estimated one in the
+                maker/taker prediction and in slippage beyond the visible depth; the impact
+                formula does not depend on volatility
+            maker_fraction: Share filled as maker in [0, 1], scalar or one per order;
+                by default predicted by the maker/taker model (see `maker_fraction`)
+
+        Returns:
+            dict: 'quantity', 'tiers', and arrays 'temporary_impact', 'permanent_impact',
+            'market_impact', 'slippage' (percentages, shape (n,)), plus 'impact_cost',
+            'slippage_cost' (USD, shape (n,)), 'fee_rate' (percentage, shape (tiers,) or
+            (tiers, n)) and 'fees', 'total_cost' (USD, shape (tiers, n))
+        """
+        if quantities is None:
+            quantities = Config.COST_CURVE_QUANTITIES
+        quantities = np.asarray(quantities, dtype=np.float64)
+        tier_names = [self.fee_schedule.names[i] for i in self.fee_schedule.index(tiers)]
+        if maker_fraction is None:
+            maker_fraction = self.maker_fraction(volatility)
+
+        temp_impact, perm_impact, total_impact = self.market_impact_model.get_impact_components(
+            quantities, time_horizon)
+        slippage = np.asarray(self.slippage_model.get_latest_slippage(quantities, side, volatility), dtype=np.float64)
+        fee_rate = self.fee_schedule.blended_rates(maker_fraction, tier_names)
+        fees = self.fee_schedule.fees(quantities, maker_fraction, tier_names)
+
+        # Percentages -> USD so the components can be summed
+        impact_cost = quantities * total_impact / 100
+        slippage_cost = quantities * slippage / 100
+        total_cost = fees + (impact_cost + slippage_cost)[np.newaxis, :]
+
+        return {
+            'quantity': quantities,
+            'tiers': tier_names,
+            'maker_fraction': maker_fraction,
+            'fee_rate': fee_rate * 100,
+            'temporary_impact': temp_impact,
+            'permanent_impact': perm_impact,
+            'market_impact': total_impact,
+            'slippage': slippage,
+            'impact_cost': impact_cost,
+            'slippage_cost': slippage_cost,
+            'fees': fees,
+            'total_cost': total_cost,
+        }
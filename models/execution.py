@@ -0,0 +1,123 @@
+import numpy as np
+
+
+class BookLadder:
+    """Cumulative depth and notional for one side of the book, best level first"""
+    __slots__ = ('prices', 'cum_qty', 'cum_notional')
+
+    def __init__(self, levels):
+        levels = levels[levels[:, 1] > 0]
+        self.prices = np.ascontiguousarray(levels[:, 0])
+        self.cum_qty = np.cumsum(levels[:, 1])
+        self.cum_notional = np.cumsum(levels[:, 0] * levels[:, 1])
+
+    def __len__(self):
+        return len(self.prices)
+
+
+class ExecutionPriceEngine:
+    """
+    Prices market orders by walking the current book.
+
+    Cumulative quantity and notional arrays are built once per snapshot;
+    each query is then a binary search (np.searchsorted) per order size, so
+    a whole array of sizes is priced in one vectorized call. Sizes beyond
+    the visible depth are flagged as exhausted and their remainder is priced
+    at the worst visible level, which makes the result a lower bound.
+    """
+
+    def __init__(self):
+        self.bids = None
+        self.asks = None
+        self.mid = 0.0
+
+    @property
+    def ready(self):
+        return self.bids is not None and len(self.bids) > 0 and len(self.asks) > 0
+
+    def update(self, bids, asks):
+        """
+        Rebuild the ladders from a snapshot
+
+        Args:
+            bids: (levels, 2) array of [price, qty], best first
+            asks: (levels, 2) array of [price, qty], best first
+        """
+        self.bids = BookLadder(bids)
+        self.asks = BookLadder(asks)
+        if self.ready:
+            self.mid = (self.bids.prices[0] + self.asks.prices[0]) / 2
+
+    def _ladder(self, side):
+        return self.asks if side == 'buy' else self.bids
+
+    def fill(self, quantities, side='buy'):
+        """
+        VWAP fill price for orders sized in base currency
+
+        Args:
+            quantities: Scalar or array of base-currency order sizes
+            side: 'buy' walks the asks, 'sell' walks the bids
+
+        Returns:
+            tuple: (vwap, exhausted) arrays shaped like `quantities`
+        """
+        ladder = self._ladder(side)
+        q = np.asarray(quantities, dtype=np.float64)
+        idx = np.searchsorted(ladder.cum_qty, q, side='left')
+        exhausted = idx >= len(ladder)
+        idx = np.minimum(idx, len(ladder) - 1)
+
+        # Fully consumed levels before idx, plus a partial fill at idx
+        prev_qty = np.where(idx > 0, ladder.cum_qty[idx - 1], 0.0)
+        prev_notional = np.where(idx > 0, ladder.cum_notional[idx - 1], 0.0)
+        notional = prev_notional + (q - prev_qty) * ladder.prices[idx]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = np.where(q > 0, notional / q, ladder.prices[0])
+        return vwap, exhausted
+
+    def fill_notional(self, notionals, side='buy'):
+        """
+        VWAP fill price for orders sized in quote currency (USD)
+
+        Returns:
+            tuple: (vwap, base_quantity, exhausted) arrays shaped like `notionals`
+        """
+        ladder = self._ladder(side)
+        n = np.asarray(notionals, dtype=np.float64)
+        idx = np.searchsorted(ladder.cum_notional, n, side='left')
+        exhausted = idx >= len(ladder)
+        idx = np.minimum(idx, len(ladder) - 1)
+
+        prev_qty = np.where(idx > 0, ladder.cum_qty[idx - 1], 0.0)
+        prev_notional = np.where(idx > 0, ladder.cum_notional[idx - 1], 0.0)
+        base = prev_qty + (n - prev_notional) / ladder.prices[idx]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = np.where(base > 0, n / base, ladder.prices[0])
+        return vwap, base, exhausted
+
+    def slippage(self, quantities, side='buy'):
+        """
+        Slippage of the VWAP fill against the mid price, as a fraction
+
+        Args:
+            quantities: Scalar or array of base-currency order sizes
+
+        Returns:
+            np.ndarray: Non-negative slippage per size
+        """
+        vwap, _ = self.fill(quantities, side)
+        return self.relative_to_mid(vwap, side)
+
+    def slippage_notional(self, notionals, side='buy'):
+        """Slippage against the mid price for USD-sized orders, as a fraction"""
+        vwap, _, _ = self.fill_notional(notionals, side)
+        return self.relative_to_mid(vwap, side)
+
+    def relative_to_mid(self, vwap, side):
+        """Signed distance of a fill price from the mid price, as a fraction; positive is adverse"""
+        if side == 'buy':
+            return (vwap - self.mid) / self.mid
+        return (self.mid - vwap) / self.mid
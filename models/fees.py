@@ -0,0 +1,84 @@
+import numpy as np
+from utils.config import Config
+
+
+class FeeSchedule:
+    """
+    Exchange fee tiers as arrays.
+
+    Rates are held in (tiers,) maker and taker arrays in the order of
+    Config.FEE_TIERS so fees for many orders and tiers broadcast in a
+    single NumPy operation. Orders that partly fill passively pay the
+    maker rate on that share and the taker rate on the rest.
+    """
+
+    def __init__(self, tiers=None):
+        tiers = tiers or Config.FEE_TIERS
+        self.names = list(tiers)
+        self.maker = np.array([tiers[name]['maker'] for name in self.names], dtype=np.float64)
+        self.taker = np.array([tiers[name]['taker'] for name in self.names], dtype=np.float64)
+
+    def index(self, tiers=None):
+        """
+        Positions of the requested tiers in the rate arrays
+
+        Args:
+            tiers: Tier name, list of tier names, or None for all tiers
+
+        Returns:
+            np.ndarray: Integer indices
+        """
+        if tiers is None:
+            return np.arange(len(self.names))
+        if isinstance(tiers, str):
+            tiers = [tiers]
+        return np.array([self.names.index(name) for name in tiers])
+
+    def blended_rates(self, maker_fraction=0.0, tiers=None):
+        """
+        Effective fee rates when part of each order fills as maker
+
+        Args:
+            maker_fraction: Share of volume filled as maker in [0, 1], scalar or (n,) per order
+            tiers: Tier name(s) or None for all tiers
+
+        Returns:
+            np.ndarray: (tiers,) rates for a scalar fraction, (tiers, n) for an array
+        """
+        index = self.index(tiers)
+        maker = self.maker[index]
+        taker = self.taker[index]
+        fraction = np.clip(np.asarray(maker_fraction, dtype=np.float64), 0.0, 1.0)
+        if fraction.ndim == 0:
+            return taker + fraction * (maker - taker)
+        return taker[:, np.newaxis] + fraction[np.newaxis, :] * (maker - taker)[:, np.newaxis]
+
+    def fees(self, quantities, maker_fraction=0.0, tiers=None):
+        """
+        Fees in USD for a batch of orders across tiers
+
+        Args:
+            quantities: Array of USD order sizes
+            maker_fraction: Share filled as maker in [0, 1], scalar or one per order
+            tiers: Tier name(s) or None for all tiers
+
+        Returns:
+            np.ndarray: (tiers, quantities) fees
+        """
+        rates = self.blended_rates(maker_fraction, tiers)
+        if rates.ndim == 1:
+            rates = rates[:, np.newaxis]
+        return rates * np.asarray(quantities, dtype=np.float64)[np.newaxis, :]
+
+    def taker_fees(self, quantities, tiers=None):
+        """
+        Taker fees in USD for market orders
+
+        Args:
+            quantities: Array of USD order sizes
+            tiers: Tier name(s) or None for all tiers
+
+        Returns:
+            np.ndarray: (tiers, quantities) fees
+        """
+        return self.fees(quantities, 0.0, tiers)
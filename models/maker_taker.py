@@ -1,118 +1,154 @@
+import math
 import numpy as np
-from sklearn.linear_model import LogisticRegression
 import logging
-from datetime import datetime, timedelta
+from models.online import OnlineLogisticRegression
+from models.persistence import estimator_state, restore_estimator
+from models.refit import BackgroundRefitter
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
 class MakerTakerModel:
-    def __init__(self):
-        self.model = LogisticRegression(max_iter=Config.MAKER_TAKER_PARAMS['max_iter'])
-        self.orderbook_data = []
-        self.max_history = Config.MAX_ORDERBOOK_HISTORY
+    def __init__(self, orderbook_store):
+        self.model = None  # Fitted estimator serving predictions
+        self.online = Config.LEARNING_MODE == 'online'  # Per-tick SGD instead of periodic refits
+        self.refitter = BackgroundRefitter('maker/taker')
+        self.orderbook_store = orderbook_store  # Shared orderbook history
+        self.depth = Config.MODEL_DEPTH['maker_taker']  # Top-K levels per side read by this model
         self.current_price = 0.0
         self.volatility = 0.0
-        self.last_update = None
-        self.update_interval = timedelta(seconds=Config.MAKER_TAKER_PARAMS['update_interval'])
+        self.last_update = None  # Snapshot timestamp (epoch ns) that started the refit interval
+        # Intervals run on snapshot timestamps, so replays refit at the same snapshots however fast they run
+        self.update_interval = int(Config.MAKER_TAKER_PARAMS['update_interval'] * 1_000_000_000)
         
-    def update(self, data):
-        """Update model with new orderbook data"""
+    def update(self, snapshot):
+        """Update model with a new snapshot already stored in the shared orderbook store"""
         try:
-            # Extract current price from mid price of best bid/ask
-            best_bid = float(data['bids'][0][0])
-            best_ask = float(data['asks'][0][0])
-            self.current_price = (best_bid + best_ask) / 2
-            
-            # Store orderbook data
-            self.orderbook_data.append({
-                'timestamp': datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00')),
-                'price': self.current_price,
-                'bids': [[float(price), float(qty)] for price, qty in data['bids']],
-                'asks': [[float(price), float(qty)] for price, qty in data['asks']]
-            })
-            
-            # Keep only recent history
-            if len(self.orderbook_data) > self.max_history:
-                self.orderbook_data.pop(0)
+            # Mid price of best bid/ask, computed once by the store
+            self.current_price = snapshot.price
                 
             # Update volatility
             self._update_volatility()
             
-            # Update model if enough time has passed
-            current_time = datetime.now()
-            if (self.last_update is None or 
-                current_time - self.last_update >= self.update_interval):
-                self._update_model()
-                self.last_update = current_time
+            if self.online:
+                # Incremental update with the newest sample only
+                self._update_online(snapshot.timestamp)
+                return
+                
+            # Submit a background refit once the interval has passed in data time; a timestamp
+            # before the last update (restored checkpoint, replay of an older file) restarts it
+            current_time = snapshot.timestamp
+            if (not self.refitter.in_flight and
+                (self.last_update is None or
+                 not 0 <= current_time - self.last_update < self.update_interval)):
+                self._update_model(current_time)
+                
+            # Swap in a refitted model once it is ready
+            self._collect_refit(current_time)
                 
         except Exception as e:
-            logger.error(f"Error updating maker/taker model: {str(e)}")
+            logger.error("Error updating maker/taker model: %s", e)
             
-    def _update_volatility(self):
-        """Update volatility estimate using recent price data"""
-        if len(self.orderbook_data) < 2:
+    def _new_estimator(self):
+        """Create an unfitted estimator for the next refit"""
+        # Imported lazily so headless startup does not pay for sklearn
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=Config.MAKER_TAKER_PARAMS['max_iter'])
+        
+    def _collect_refit(self, current_time):
+        """Atomically replace the serving model with a finished background fit"""
+        if not self.refitter.in_flight:
+            return
+        model = self.refitter.poll()
+        if self.refitter.in_flight:
             return
+        if model is not None:
+            self.model = model
+        # Start the interval after failed fits too, so a failing fit is not resubmitted every tick
+        self.last_update = current_time
             
-        prices = [data['price'] for data in self.orderbook_data]
-        returns = np.diff(np.log(prices))
-        self.volatility = np.std(returns) * np.sqrt(Config.VOLATILITY_WINDOW)  # Annualized volatility
+    def get_state(self):
+        """Fitted model parameters for checkpointing"""
+        return estimator_state(self.model)
         
-    def _update_model(self):
-        """Update the logistic regression model"""
-        if len(self.orderbook_data) < 10:
+    def set_state(self, state):
+        """
+        Serve predictions from checkpointed parameters until the next fit
+        
+        Returns:
+            bool: False if there was no model of the current learning mode to restore
+        """
+        estimator = OnlineLogisticRegression() if self.online else self._new_estimator()
+        model = restore_estimator(state, estimator)
+        if model is None:
+            return False
+        self.model = model
+        # The checkpointed model was fitted on the restored history; refit on schedule
+        timestamps = self.orderbook_store.history.timestamps()
+        self.last_update = int(timestamps[-1]) if len(timestamps) else None
+        return True
+        
+    def refit_metrics(self):
+        """Refit duration, staleness and counters for the background refitter"""
+        return self.refitter.metrics()
+        
+    def _update_volatility(self):
+        """Read the shared O(1) rolling volatility estimate from the store"""
+        self.volatility = self.orderbook_store.volatility.annualized()  # Annualized volatility
+        
+    def _update_online(self, current_time):
+        """Warm-start the online logistic regression on the stored history, then take one step per tick"""
+        if len(self.orderbook_store) < 10:
             return
-            
-        # Prepare features and labels
-        X = []
-        y = []
+        features = self.orderbook_store.features
+        if self.model is None:
+            X, y = features.maker_taker_training_set(self.volatility, depth=self.depth)
+            self.model = OnlineLogisticRegression().warm_start(X, y)
+        else:
+            X, y = features.maker_taker_training_set(self.volatility, n=2, depth=self.depth)
+            self.model.partial_fit(X, y)
+        self.last_update = current_time
         
-        for i in range(1, len(self.orderbook_data)):
-            prev_data = self.orderbook_data[i-1]
-            curr_data = self.orderbook_data[i]
-            
-            # Calculate features
-            price_change = (curr_data['price'] - prev_data['price']) / prev_data['price']
-            spread = (curr_data['asks'][0][0] - curr_data['bids'][0][0]) / curr_data['price']
-            bid_volume = sum(qty for _, qty in curr_data['bids'])
-            ask_volume = sum(qty for _, qty in curr_data['asks'])
-            volume_ratio = bid_volume / (bid_volume + ask_volume) if (bid_volume + ask_volume) > 0 else 0.5
-            
-            # Determine if price moved up (1) or down (0)
-            price_direction = 1 if price_change > 0 else 0
+    def _update_model(self, current_time):
+        """Submit a background refit of the logistic regression model"""
+        if len(self.orderbook_store) < 10:
+            return False
             
-            X.append([spread, volume_ratio, self.volatility])
-            y.append(price_direction)
-            
-        X = np.array(X)
-        y = np.array(y)
+        # Prepare features and labels for the whole history in one vectorized pass
+        X, y = self.orderbook_store.features.maker_taker_training_set(self.volatility, depth=self.depth)
+        if np.unique(y).size < 2:
+            # A flat mid gives a single class, which LogisticRegression cannot fit; retry next interval
+            self.last_update = current_time
+            return False
         
-        # Fit model
-        try:
-            self.model.fit(X, y)
-        except Exception as e:
-            logger.error(f"Error fitting maker/taker model: {str(e)}")
+        # Fit a fresh estimator on a snapshot of the features off the tick path
+        return self.refitter.submit(self._new_estimator(), X, y)
             
-    def predict_maker_taker(self):
+    def predict_maker_taker(self, volatility=None):
         """
         Predict maker/taker proportion based on current market conditions
         
+        Args:
+            volatility: Optional annualized volatility overriding the estimated one
+            
         Returns:
             tuple: (maker_proportion, taker_proportion)
         """
-        if len(self.orderbook_data) < 10:
+        if len(self.orderbook_store) < 10 or self.model is None:
             return 0.5, 0.5
             
         # Calculate current features
-        curr_data = self.orderbook_data[-1]
-        spread = (curr_data['asks'][0][0] - curr_data['bids'][0][0]) / self.current_price
-        bid_volume = sum(qty for _, qty in curr_data['bids'])
-        ask_volume = sum(qty for _, qty in curr_data['asks'])
+        curr = self.orderbook_store.features.latest(self.depth)
+        spread = curr['spread']
+        bid_volume = curr['bid_volume']
+        ask_volume = curr['ask_volume']
         volume_ratio = bid_volume / (bid_volume + ask_volume) if (bid_volume + ask_volume) > 0 else 0.5
         
         # Predict probability of price increase
-        features = np.array([[spread, volume_ratio, self.volatility]])
-        prob_increase = self.model.predict_proba(features)[0][1]
+        if volatility is None:
+            volatility = self.volatility
+        features = np.array([[spread, volume_ratio, volatility]])
+        prob_increase = self._probability_of_increase(features)
         
         # Convert to maker/taker proportions
         # Higher probability of price increase suggests more maker orders
@@ -121,17 +157,34 @@ class MakerTakerModel:
         
         return maker_proportion, taker_proportion
         
-    def get_latest_proportion(self):
+    def _probability_of_increase(self, features):
+        """
+        P(price up) for one feature row
+
+        A fitted binary scikit-learn LogisticRegression is evaluated from its
+        coefficients: predict_proba's input validation costs far more than
+        the three multiplications, and this runs on every tick.
+        """
+        model = self.model
+        if self.online or len(getattr(model, 'classes_', ())) != 2:
+            return self.model.predict_proba(features)[0][1]
+        z = float(features[0] @ model.coef_[0]) + float(model.intercept_[0])
+        return 1 / (1 + math.exp(-z)) if z >= 0 else math.exp(z) / (1 + math.exp(z))
+        
+    def get_latest_proportion(self, volatility=None):
         """
         Get the latest maker/taker proportion estimate
         
+        Args:
+            volatility: Optional annualized volatility overriding the estimated one
+            
         Returns:
             tuple: (maker_proportion, taker_proportion)
         """
-        if len(self.orderbook_data) < 10:
+        if len(self.orderbook_store) < 10:
             return 0.5, 0.5
             
-        maker_prop, taker_prop = self.predict_maker_taker()
+        maker_prop, taker_prop = self.predict_maker_taker(volatility)
         
         # Convert to percentages
         maker_pct = maker_prop * 100
@@ -1,54 +1,71 @@
 import numpy as np
-from datetime import datetime
 import logging
 from utils.config import Config
+from utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+
+class OptimalExecutionCache(LRUCache):
+    """
+    LRU memo of optimal-execution grids, valid for one reference sigma.
+
+    Entries are keyed on the model parameters and the requested grids.
+    They stay valid while sigma remains within a relative `tolerance` of
+    the sigma they were computed with; a larger move clears the cache.
+    """
+
+    def __init__(self, maxsize=128, tolerance=0.01):
+        super().__init__(maxsize)
+        self.tolerance = tolerance
+        self.reference_sigma = None
+
+    def validate(self, sigma):
+        """
+        Clear the cache if sigma moved beyond tolerance
+
+        Returns:
+            float: Sigma that cached results are (or will be) computed with
+        """
+        ref = self.reference_sigma
+        if ref is None or abs(sigma - ref) > self.tolerance * max(abs(ref), 1e-12):
+            self._entries.clear()
+            self.reference_sigma = sigma
+        return self.reference_sigma
+
+    def clear(self):
+        super().clear()
+        self.reference_sigma = None
+
+
 class AlmgrenChrissModel:
-    def __init__(self):
+    def __init__(self, orderbook_store):
         self.eta = Config.MARKET_IMPACT_PARAMS['eta']  # Temporary market impact parameter
         self.gamma = Config.MARKET_IMPACT_PARAMS['gamma']  # Permanent market impact parameter
         self.sigma = 0.0  # Volatility
         self.risk_aversion = Config.MARKET_IMPACT_PARAMS['risk_aversion']  # Risk aversion parameter
         self.current_price = 0.0
-        self.orderbook_data = []
-        self.max_history = Config.MAX_ORDERBOOK_HISTORY  # Maximum number of orderbook snapshots to keep
+        self.orderbook_store = orderbook_store  # Shared orderbook history
+        self.execution_cache = OptimalExecutionCache(
+            maxsize=Config.MARKET_IMPACT_PARAMS['execution_cache_size'],
+            tolerance=Config.MARKET_IMPACT_PARAMS['sigma_tolerance']
+        )
         
-    def update(self, data):
-        """Update model with new orderbook data"""
+    def update(self, snapshot):
+        """Update model with a new snapshot already stored in the shared orderbook store"""
         try:
-            # Extract current price from mid price of best bid/ask
-            best_bid = float(data['bids'][0][0])
-            best_ask = float(data['asks'][0][0])
-            self.current_price = (best_bid + best_ask) / 2
-            
-            # Store orderbook data
-            self.orderbook_data.append({
-                'timestamp': datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00')),
-                'price': self.current_price,
-                'bids': [[float(price), float(qty)] for price, qty in data['bids']],
-                'asks': [[float(price), float(qty)] for price, qty in data['asks']]
-            })
-            
-            # Keep only recent history
-            if len(self.orderbook_data) > self.max_history:
-                self.orderbook_data.pop(0)
+            # Mid price of best bid/ask, computed once by the store
+            self.current_price = snapshot.price
                 
             # Update volatility estimate
             self._update_volatility()
             
         except Exception as e:
-            logger.error(f"Error updating market impact model: {str(e)}")
+            logger.error("Error updating market impact model: %s", e)
             
     def _update_volatility(self):
-        """Update volatility estimate using recent price data"""
-        if len(self.orderbook_data) < 2:
-            return
-            
-        prices = [data['price'] for data in self.orderbook_data]
-        returns = np.diff(np.log(prices))
-        self.sigma = np.std(returns) * np.sqrt(Config.VOLATILITY_WINDOW)  # Annualized volatility
+        """Read the shared O(1) rolling volatility estimate from the store"""
+        self.sigma = self.orderbook_store.volatility.annualized()  # Annualized volatility
         
     def calculate_market_impact(self, quantity, time_horizon=1.0):
         """
@@ -75,6 +92,29 @@ class AlmgrenChrissModel:
         
         return temp_impact, perm_impact, total_impact
         
+    def get_impact_components(self, quantity=100.0, time_horizon=1.0):
+        """
+        Temporary, permanent and total impact for one or many USD quantities
+        
+        Args:
+            quantity: Order quantity in USD, scalar or array
+            time_horizon: Trading horizon in days
+            
+        Returns:
+            tuple: (temporary, permanent, total) impact as percentages, shaped like `quantity`
+        """
+        quantity = np.asarray(quantity, dtype=np.float64)
+        if self.current_price == 0:
+            zeros = np.zeros_like(quantity)
+            return zeros, zeros, zeros
+            
+        # Convert USD quantity to base currency
+        base_quantity = quantity / self.current_price
+        temp_impact, perm_impact, total_impact = self.calculate_market_impact(base_quantity, time_horizon)
+        
+        # Convert to percentages
+        return temp_impact * 100, perm_impact * 100, total_impact * 100
+        
     def get_latest_impact(self, quantity=100.0):
         """
         Get the latest market impact estimate for a given quantity
@@ -113,23 +153,65 @@ class AlmgrenChrissModel:
         if self.current_price == 0:
             return [], 0.0
             
-        # Model parameters
-        T = time_horizon  # Trading horizon
-        N = 100  # Number of time steps
-        dt = T / N  # Time step size
+        result = self.get_optimal_execution_grid([quantity], [time_horizon], [self.risk_aversion])
+        return result['trajectories'][0, 0, 0], float(result['expected_cost'][0, 0, 0])
         
-        # Calculate optimal trajectory
-        kappa = np.sqrt(self.risk_aversion * self.sigma**2 / self.eta)
-        sinh_kappa_T = np.sinh(kappa * T)
-        sinh_kappa_t = np.sinh(kappa * np.arange(0, T + dt, dt))
+    def get_optimal_execution_grid(self, quantities, time_horizons, risk_aversions=None, n_steps=100):
+        """
+        Optimal trajectories and expected costs over whole parameter grids
         
-        optimal_trajectory = quantity * (sinh_kappa_t / sinh_kappa_T)
+        Results are memoized on (eta, gamma, grids) while sigma stays within
+        tolerance of the sigma they were computed with; returned arrays are
+        read-only views into the cache.
         
-        # Calculate expected cost
+        Args:
+            quantities: Array of total order quantities, shape (nq,)
+            time_horizons: Array of trading horizons in days, shape (nt,)
+            risk_aversions: Array of risk aversion values, shape (nl,); defaults to the model's
+            n_steps: Number of time steps per trajectory
+            
+        Returns:
+            dict: 'times' (nt, n_steps + 1), 'trajectories' (nq, nt, nl, n_steps + 1),
+            'expected_cost' (nq, nt, nl) and the 'sigma' used
+        """
+        if risk_aversions is None:
+            risk_aversions = [self.risk_aversion]
+        Q = np.asarray(quantities, dtype=np.float64).ravel()
+        T = np.asarray(time_horizons, dtype=np.float64).ravel()
+        lam = np.asarray(risk_aversions, dtype=np.float64).ravel()
+        
+        sigma = self.execution_cache.validate(self.sigma)
+        key = (self.eta, self.gamma, n_steps, Q.tobytes(), T.tobytes(), lam.tobytes())
+        result = self.execution_cache.get(key)
+        if result is not None:
+            return result
+            
+        # Exact time grid per horizon (avoids float-step arange edge cases)
+        times = T[:, np.newaxis] * np.linspace(0.0, 1.0, n_steps + 1)[np.newaxis, :]
+        
+        # Calculate optimal trajectory fractions, shape (nt, nl, n_steps + 1)
+        kappa = np.sqrt(lam * sigma**2 / self.eta)[np.newaxis, :, np.newaxis]
+        kappa_t = kappa * times[:, np.newaxis, :]
+        kappa_T = kappa * T[:, np.newaxis, np.newaxis]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.sinh(kappa_t) / np.sinh(kappa_T)
+        # kappa -> 0 (no volatility or risk aversion) limit is linear in time
+        linear = np.broadcast_to(times[:, np.newaxis, :] / T[:, np.newaxis, np.newaxis], fraction.shape)
+        fraction = np.where(kappa_T > 1e-12, fraction, linear)
+        
+        trajectories = Q[:, np.newaxis, np.newaxis, np.newaxis] * fraction[np.newaxis]
+        
+        # Calculate expected cost, shape (nq, nt, nl)
+        Q2 = (Q**2)[:, np.newaxis, np.newaxis]
+        T_ = T[np.newaxis, :, np.newaxis]
         expected_cost = (
-            self.eta * quantity**2 / T +  # Temporary impact cost
-            self.gamma * quantity**2 / 2 +  # Permanent impact cost
-            self.risk_aversion * self.sigma**2 * quantity**2 * T / 3  # Risk cost
+            self.eta * Q2 / T_ +  # Temporary impact cost
+            self.gamma * Q2 / 2 +  # Permanent impact cost
+            lam[np.newaxis, np.newaxis, :] * sigma**2 * Q2 * T_ / 3  # Risk cost
         )
         
-        return optimal_trajectory, expected_cost 
\ No newline at end of file
+        for array in (times, trajectories, expected_cost):
+            array.setflags(write=False)
+        result = {'times': times, 'trajectories': trajectories, 'expected_cost': expected_cost, 'sigma': sigma}
+        self.execution_cache.put(key, result)
+        return result
\ No newline at end of file
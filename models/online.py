@@ -0,0 +1,161 @@
+import numpy as np
+from utils.config import Config
+
+
+class RunningScaler:
+    """
+    Exponentially weighted feature mean and variance.
+
+    Features differ by orders of magnitude (spread vs. displayed volume),
+    which SGD cannot cope with unscaled. Weighting recent samples more
+    lets the scaling follow regime changes the same way the coefficients do.
+    """
+
+    CLIP = 5.0  # Standardized values are winsorized to +-CLIP standard deviations
+
+    def __init__(self, n_features, halflife=None):
+        if halflife is None:
+            halflife = Config.ONLINE_LEARNING_PARAMS['scaler_halflife']
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = np.zeros(n_features)
+        self.var = np.ones(n_features)
+        self.count = 0
+
+    def update(self, X):
+        for x in X:
+            if self.count == 0:
+                self.mean[:] = x
+            else:
+                delta = x - self.mean
+                self.mean += self.alpha * delta
+                self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+            self.count += 1
+
+    def transform(self, X):
+        # Near-constant features (e.g. volatility within one history) get a 1% relative noise floor
+        std = np.sqrt(np.maximum(self.var, (0.01 * self.mean) ** 2 + 1e-18))
+        return np.clip((X - self.mean) / std, -self.CLIP, self.CLIP)
+
+
+class OnlineLinearModel:
+    """
+    Linear model trained by per-sample stochastic gradient descent.
+
+    Each `partial_fit` costs O(samples * features) regardless of how much
+    data was seen before. The step size decays as
+    learning_rate / (1 + decay * updates); with decay > 0 it never reaches
+    zero quickly, so the model keeps adapting to new data. Subclasses
+    provide the loss gradient.
+    """
+
+    def __init__(self, n_features=3, learning_rate=None, decay=None, l2=None):
+        params = Config.ONLINE_LEARNING_PARAMS
+        self.learning_rate = params['learning_rate'] if learning_rate is None else learning_rate
+        self.decay = params['decay'] if decay is None else decay
+        self.l2 = params['l2'] if l2 is None else l2
+        self.scaler = RunningScaler(n_features)
+        self.coef_ = np.zeros(n_features)
+        self.intercept_ = 0.0
+        self.n_updates = 0
+
+    def _gradient(self, prediction, y):
+        """d(loss)/d(prediction) for one sample"""
+        raise NotImplementedError
+
+    def _decision(self, X):
+        return self.scaler.transform(np.asarray(X, dtype=np.float64)) @ self.coef_ + self.intercept_
+
+    def partial_fit(self, X, y):
+        """
+        Take one SGD step per sample
+
+        Args:
+            X: (n, features) array
+            y: (n,) targets
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        for x, target in zip(X, y):
+            self.scaler.update(x[np.newaxis])
+            z = self.scaler.transform(x)
+            lr = self.learning_rate / (1 + self.decay * self.n_updates)
+            grad = self._gradient(z @ self.coef_ + self.intercept_, target)
+            self.coef_ -= lr * (grad * z + self.l2 * self.coef_)
+            self.intercept_ -= lr * grad
+            self.n_updates += 1
+        return self
+
+    def get_state(self):
+        return {
+            'coef': self.coef_.copy(),
+            'intercept': np.float64(self.intercept_),
+            'n_updates': np.int64(self.n_updates),
+            'scaler_mean': self.scaler.mean.copy(),
+            'scaler_var': self.scaler.var.copy(),
+            'scaler_count': np.int64(self.scaler.count),
+        }
+
+    def set_state(self, state):
+        self.coef_ = np.array(state['coef'], dtype=np.float64)
+        self.intercept_ = float(state['intercept'])
+        self.n_updates = int(state['n_updates'])
+        self.scaler.mean = np.array(state['scaler_mean'], dtype=np.float64)
+        self.scaler.var = np.array(state['scaler_var'], dtype=np.float64)
+        self.scaler.count = int(state['scaler_count'])
+
+    def warm_start(self, X, y, epochs=None):
+        """Initialize from a history of samples, oldest first, before going online"""
+        for _ in range(Config.ONLINE_LEARNING_PARAMS['warm_start_epochs'] if epochs is None else epochs):
+            self.partial_fit(X, y)
+        return self
+
+
+class OnlineLogisticRegression(OnlineLinearModel):
+    """SGD logistic regression with a scikit-learn style `predict_proba`"""
+
+    def _gradient(self, prediction, y):
+        return 1 / (1 + np.exp(-prediction)) - y
+
+    def predict_proba(self, X):
+        p = 1 / (1 + np.exp(-self._decision(X)))
+        return np.column_stack([1 - p, p])
+
+
+class OnlineQuantileRegressor(OnlineLinearModel):
+    """
+    Linear quantile regression trained on the pinball loss.
+
+    The subgradient only depends on which side of the prediction the
+    target falls, so the estimate moves by a bounded step per sample and
+    converges to the requested conditional quantile.
+    """
+
+    def __init__(self, n_features=3, quantile=None, **kwargs):
+        super().__init__(n_features, **kwargs)
+        self.quantile = Config.SLIPPAGE_MODEL_PARAMS['quantile'] if quantile is None else quantile
+        self.target_scale = 0.0  # Running mean |y|; targets are relative price changes (~1e-4)
+
+    def partial_fit(self, X, y):
+        # Learn in units of the typical target size so the learning rate is scale free
+        y = np.asarray(y, dtype=np.float64)
+        for target in np.abs(y):
+            self.target_scale += self.scaler.alpha * (target - self.target_scale) if self.target_scale else target
+        return super().partial_fit(X, y / self._scale())
+
+    def get_state(self):
+        state = super().get_state()
+        state['target_scale'] = np.float64(self.target_scale)
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.target_scale = float(state['target_scale'])
+
+    def _scale(self):
+        return self.target_scale if self.target_scale > 0 else 1.0
+
+    def _gradient(self, prediction, y):
+        return (1.0 if y < prediction else 0.0) - self.quantile
+
+    def predict(self, X):
+        return self._decision(X) * self._scale()
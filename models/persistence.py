@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def estimator_state(estimator):
+    """
+    Fitted parameters of an estimator as a flat dict of arrays
+
+    scikit-learn estimators are saved as their public fitted attributes
+    (coef_, intercept_, classes_, ...), online models as their own state,
+    so checkpoints never need pickle.
+
+    Returns:
+        dict: Empty if `estimator` is None
+    """
+    if estimator is None:
+        return {}
+    if hasattr(estimator, 'get_state'):
+        state = estimator.get_state()
+        state['kind'] = np.array('online')
+        return state
+    state = {k: np.asarray(v) for k, v in vars(estimator).items()
+             if k.endswith('_') and not k.startswith('_') and np.asarray(v).dtype.kind in 'biuf'}
+    state['kind'] = np.array('sklearn')
+    return state
+
+
+def restore_estimator(state, estimator):
+    """
+    Load parameters saved by `estimator_state` into an unfitted estimator
+
+    Args:
+        state: Dict from `estimator_state`
+        estimator: Unfitted estimator of the same type and kind
+
+    Returns:
+        The restored estimator, or None if `state` is empty or of another kind
+    """
+    if not state:
+        return None
+    kind = str(state['kind'])
+    params = {k: v for k, v in state.items() if k != 'kind'}
+    if kind == 'online':
+        if not hasattr(estimator, 'set_state'):
+            return None
+        estimator.set_state(params)
+        return estimator
+    if hasattr(estimator, 'set_state'):
+        return None
+    for name, value in params.items():
+        setattr(estimator, name, value if value.ndim else value.item())
+    return estimator
@@ -0,0 +1,172 @@
+import time
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_refit_executor():
+    """
+    Return the process pool shared by all background refits, creating it lazily
+
+    Returns:
+        ProcessPoolExecutor or None: None when background refits are disabled
+    """
+    global _executor
+    if not Config.REFIT_PARAMS['background']:
+        return None
+    if _executor is None:
+        # Spawn rather than fork: the parent runs Qt and asyncio threads
+        _executor = ProcessPoolExecutor(
+            max_workers=Config.REFIT_PARAMS['workers'],
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def shutdown_refit_executor(wait=True):
+    """
+    Stop the shared refit pool, abandoning fits that have not started
+
+    Args:
+        wait: Wait for a fit that is already running. Shutting down without
+            waiting can leave idle workers that never see the exit sentinel
+            on Python < 3.12, which then blocks interpreter exit.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+def describe_refits(metrics):
+    """
+    One-line summary of `BackgroundRefitter.metrics()` for logs and the UI
+
+    Returns:
+        str: e.g. "4 refits, last 12 ms, 35 s old"
+    """
+    in_flight = ", fit in flight" if metrics['in_flight'] else ""
+    if not metrics['refits'] and not metrics['failures']:
+        return "no refits yet" + in_flight
+    parts = [f"{metrics['refits']} refit{'' if metrics['refits'] == 1 else 's'}"]
+    if metrics['refits']:
+        parts.append(f"last {metrics['last_refit_duration'] * 1000:.0f} ms")
+    if metrics['failures']:
+        parts.append(f"{metrics['failures']} failed")
+    if metrics['staleness'] is not None:
+        parts.append(f"{metrics['staleness']:.0f} s old")
+    return ", ".join(parts) + in_flight
+
+
+def fit_estimator(estimator, X, y):
+    """
+    Fit an estimator; runs inside a worker process
+
+    Returns:
+        tuple: (fitted_estimator, fit_duration_seconds)
+    """
+    start = time.perf_counter()
+    estimator.fit(X, y)
+    return estimator, time.perf_counter() - start
+
+
+class BackgroundRefitter:
+    """
+    Fits copies of an estimator off the tick path and swaps them in atomically.
+
+    `submit` sends an unfitted estimator plus a snapshot of the training
+    data to the shared process pool and returns immediately; at most one
+    fit is in flight per model. `poll` is called on the tick path and,
+    once the fit has finished, returns the new estimator so the caller
+    can replace its reference in a single assignment. Until then the
+    previous estimator keeps serving predictions.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._future = None
+        self._submitted_at = None
+        self.refits = 0
+        self.failures = 0
+        self.last_refit_duration = 0.0  # Seconds spent fitting in the worker
+        self.last_refit_latency = 0.0  # Seconds from submit to swap
+        self.fitted_at = None  # time.time() when the current model's data was captured
+
+    @property
+    def in_flight(self):
+        return self._future is not None
+
+    def submit(self, estimator, X, y):
+        """
+        Start fitting `estimator` on (X, y)
+
+        Args:
+            estimator: Unfitted estimator, pickled to the worker
+            X: Feature matrix snapshot
+            y: Target snapshot
+
+        Returns:
+            bool: False if a fit for this model is already in flight
+        """
+        if self._future is not None:
+            return False
+
+        self._submitted_at = time.time()
+        executor = get_refit_executor()
+        if executor is None:
+            # Background refits disabled: fit synchronously, result is ready on the next poll
+            future = Future()
+            try:
+                future.set_result(fit_estimator(estimator, X, y))
+            except Exception as e:
+                future.set_exception(e)
+            self._future = future
+        else:
+            self._future = executor.submit(fit_estimator, estimator, X, y)
+        return True
+
+    def poll(self):
+        """
+        Collect a finished fit, if any
+
+        Returns:
+            Fitted estimator to swap in, or None if nothing new is ready
+        """
+        future = self._future
+        if future is None or not future.done():
+            return None
+
+        self._future = None
+        try:
+            estimator, duration = future.result()
+        except Exception as e:
+            self.failures += 1
+            logger.error("Error fitting %s model: %s", self.name, e)
+            return None
+
+        self.refits += 1
+        self.last_refit_duration = duration
+        self.last_refit_latency = time.time() - self._submitted_at
+        self.fitted_at = self._submitted_at
+        return estimator
+
+    def staleness(self):
+        """Seconds since the data behind the current model was captured"""
+        if self.fitted_at is None:
+            return None
+        return time.time() - self.fitted_at
+
+    def metrics(self):
+        return {
+            'refits': self.refits,
+            'failures': self.failures,
+            'in_flight': self.in_flight,
+            'last_refit_duration': self.last_refit_duration,
+            'last_refit_latency': self.last_refit_latency,
+            'staleness': self.staleness(),
+        }
@@ -1,140 +1,212 @@
 import numpy as np
-from sklearn.linear_model import QuantileRegressor
 import logging
-from datetime import datetime, timedelta
+from models.execution import ExecutionPriceEngine
+from models.online import OnlineQuantileRegressor
+from models.persistence import estimator_state, restore_estimator
+from models.refit import BackgroundRefitter
 from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
 class SlippageModel:
-    def __init__(self):
-        self.model = QuantileRegressor(
-            quantile=Config.SLIPPAGE_MODEL_PARAMS['quantile'],
-            alpha=Config.SLIPPAGE_MODEL_PARAMS['alpha']
-        )
-        self.orderbook_data = []
-        self.max_history = Config.MAX_ORDERBOOK_HISTORY
+    def __init__(self, orderbook_store):
+        self.model = None  # Fitted estimator serving predictions
+        self.online = Config.LEARNING_MODE == 'online'  # Per-tick SGD instead of periodic refits
+        self.refitter = BackgroundRefitter('slippage')
+        self.orderbook_store = orderbook_store  # Shared orderbook history
+        self.depth = Config.MODEL_DEPTH['slippage']  # Top-K levels per side read by this model
+        self.execution = ExecutionPriceEngine()  # Depth walk over the current book
         self.current_price = 0.0
         self.volatility = 0.0
-        self.last_update = None
-        self.update_interval = timedelta(seconds=Config.SLIPPAGE_MODEL_PARAMS['update_interval'])
+        self.last_update = None  # Snapshot timestamp (epoch ns) that started the refit interval
+        # Intervals run on snapshot timestamps, so replays refit at the same snapshots however fast they run
+        self.update_interval = int(Config.SLIPPAGE_MODEL_PARAMS['update_interval'] * 1_000_000_000)
         
-    def update(self, data):
-        """Update model with new orderbook data"""
+    def update(self, snapshot):
+        """Update model with a new snapshot already stored in the shared orderbook store"""
         try:
-            # Extract current price from mid price of best bid/ask
-            best_bid = float(data['bids'][0][0])
-            best_ask = float(data['asks'][0][0])
-            self.current_price = (best_bid + best_ask) / 2
+            # Mid price of best bid/ask, computed once by the store
+            self.current_price = snapshot.price
             
-            # Store orderbook data
-            self.orderbook_data.append({
-                'timestamp': datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00')),
-                'price': self.current_price,
-                'bids': [[float(price), float(qty)] for price, qty in data['bids']],
-                'asks': [[float(price), float(qty)] for price, qty in data['asks']]
-            })
-            
-            # Keep only recent history
-            if len(self.orderbook_data) > self.max_history:
-                self.orderbook_data.pop(0)
+            # Cumulative depth/notional ladders for depth-walking queries
+            self.execution.update(snapshot.bids[:self.depth], snapshot.asks[:self.depth])
                 
             # Update volatility
             self._update_volatility()
             
-            # Update model if enough time has passed
-            current_time = datetime.now()
-            if (self.last_update is None or 
-                current_time - self.last_update >= self.update_interval):
+            if self.online:
+                # Incremental update with the newest sample only
+                self._update_online(snapshot.timestamp)
+                return
+                
+            # Submit a background refit once the interval has passed in data time; a timestamp
+            # before the last update (restored checkpoint, replay of an older file) restarts it
+            current_time = snapshot.timestamp
+            if (not self.refitter.in_flight and
+                (self.last_update is None or
+                 not 0 <= current_time - self.last_update < self.update_interval)):
                 self._update_model()
-                self.last_update = current_time
+                
+            # Swap in a refitted model once it is ready
+            self._collect_refit(current_time)
                 
         except Exception as e:
-            logger.error(f"Error updating slippage model: {str(e)}")
+            logger.error("Error updating slippage model: %s", e)
             
-    def _update_volatility(self):
-        """Update volatility estimate using recent price data"""
-        if len(self.orderbook_data) < 2:
+    def _new_estimator(self):
+        """Create an unfitted estimator for the next refit"""
+        # Imported lazily so headless startup does not pay for sklearn
+        from sklearn.linear_model import QuantileRegressor
+        return QuantileRegressor(
+            quantile=Config.SLIPPAGE_MODEL_PARAMS['quantile'],
+            alpha=Config.SLIPPAGE_MODEL_PARAMS['alpha']
+        )
+        
+    def _collect_refit(self, current_time):
+        """Atomically replace the serving model with a finished background fit"""
+        if not self.refitter.in_flight:
+            return
+        model = self.refitter.poll()
+        if self.refitter.in_flight:
             return
+        if model is not None:
+            self.model = model
+        # Start the interval after failed fits too, so a failing fit is not resubmitted every tick
+        self.last_update = current_time
             
-        prices = [data['price'] for data in self.orderbook_data]
-        returns = np.diff(np.log(prices))
-        self.volatility = np.std(returns) * np.sqrt(Config.VOLATILITY_WINDOW)  # Annualized volatility
+    def get_state(self):
+        """Fitted model parameters for checkpointing"""
+        return estimator_state(self.model)
         
-    def _update_model(self):
-        """Update the quantile regression model"""
-        if len(self.orderbook_data) < 10:
+    def set_state(self, state):
+        """
+        Serve predictions from checkpointed parameters until the next fit
+        
+        Returns:
+            bool: False if there was no model of the current learning mode to restore
+        """
+        estimator = OnlineQuantileRegressor() if self.online else self._new_estimator()
+        model = restore_estimator(state, estimator)
+        if model is None:
+            return False
+        self.model = model
+        # The checkpointed model was fitted on the restored history; refit on schedule
+        timestamps = self.orderbook_store.history.timestamps()
+        self.last_update = int(timestamps[-1]) if len(timestamps) else None
+        return True
+        
+    def refit_metrics(self):
+        """Refit duration, staleness and counters for the background refitter"""
+        return self.refitter.metrics()
+        
+    def _update_volatility(self):
+        """Read the shared O(1) rolling volatility estimate from the store"""
+        self.volatility = self.orderbook_store.volatility.annualized()  # Annualized volatility
+        
+    def _update_online(self, current_time):
+        """Warm-start the online quantile regression on the stored history, then take one step per tick"""
+        if len(self.orderbook_store) < 10:
             return
-            
-        # Prepare features
-        X = []
-        y = []
+        features = self.orderbook_store.features
+        if self.model is None:
+            X, y = features.slippage_training_set(self.volatility, depth=self.depth)
+            self.model = OnlineQuantileRegressor().warm_start(X, y)
+        else:
+            X, y = features.slippage_training_set(self.volatility, n=2, depth=self.depth)
+            self.model.partial_fit(X, y)
+        self.last_update = current_time
         
-        for i in range(1, len(self.orderbook_data)):
-            prev_data = self.orderbook_data[i-1]
-            curr_data = self.orderbook_data[i]
-            
-            # Calculate features
-            price_change = (curr_data['price'] - prev_data['price']) / prev_data['price']
-            volume = sum(qty for _, qty in curr_data['bids']) + sum(qty for _, qty in curr_data['asks'])
-            spread = (curr_data['asks'][0][0] - curr_data['bids'][0][0]) / curr_data['price']
-            
-            X.append([volume, spread, self.volatility])
-            y.append(price_change)
+    def _update_model(self):
+        """Submit a background refit of the quantile regression model"""
+        if len(self.orderbook_store) < 10:
+            return False
             
-        X = np.array(X)
-        y = np.array(y)
+        # Prepare features for the whole history in one vectorized pass
+        X, y = self.orderbook_store.features.slippage_training_set(self.volatility, depth=self.depth)
         
-        # Fit model
-        try:
-            self.model.fit(X, y)
-        except Exception as e:
-            logger.error(f"Error fitting slippage model: {str(e)}")
+        # Fit a fresh estimator on a snapshot of the features off the tick path
+        return self.refitter.submit(self._new_estimator(), X, y)
             
-    def calculate_slippage(self, quantity):
+    def calculate_slippage(self, quantity, side='buy', volatility=None):
         """
-        Calculate expected slippage for a given quantity
+        Calculate expected slippage for a given quantity by walking the book
         
         Args:
-            quantity: Order quantity in base currency
+            quantity: Order quantity in base currency, scalar or array
+            side: 'buy' or 'sell'
+            volatility: Optional annualized volatility for the regression beyond the visible depth
             
         Returns:
-            float: Expected slippage as a percentage
+            float or np.ndarray: Expected slippage as a percentage
         """
-        if self.current_price == 0 or len(self.orderbook_data) < 10:
-            return 0.0
+        if self.current_price == 0:
+            return 0.0 if np.ndim(quantity) == 0 else np.zeros(np.shape(quantity))
+        if not self.execution.ready:
+            return self._regression_slippage(quantity, volatility)
+            
+        vwap, exhausted = self.execution.fill(quantity, side)
+        slippage = np.abs(self.execution.relative_to_mid(vwap, side)) * 100  # Convert to percentage
+        slippage = self._beyond_depth(slippage, quantity, exhausted, volatility)
+        return float(slippage) if np.ndim(quantity) == 0 else slippage
+        
+    def _beyond_depth(self, slippage, base_quantity, exhausted, volatility=None):
+        """
+        Raise depth-walk estimates for orders larger than the visible book to the regression estimate
+        
+        The walk prices the remainder of such orders at the worst visible
+        level, so it is only a lower bound there.
+        """
+        if self.model is None or not np.any(exhausted):
+            return slippage
+        fallback = self._regression_slippage(base_quantity, volatility)
+        return np.where(exhausted, np.maximum(slippage, fallback), slippage)
+        
+    def _regression_slippage(self, quantity, volatility=None):
+        """Regression-based proxy used without a book ladder and beyond the visible depth"""
+        if len(self.orderbook_store) < 10 or self.model is None:
+            return 0.0 if np.ndim(quantity) == 0 else np.zeros(np.shape(quantity))
             
         # Calculate features for prediction
-        volume = sum(qty for _, qty in self.orderbook_data[-1]['bids']) + sum(qty for _, qty in self.orderbook_data[-1]['asks'])
-        spread = (self.orderbook_data[-1]['asks'][0][0] - self.orderbook_data[-1]['bids'][0][0]) / self.current_price
+        curr = self.orderbook_store.features.latest(self.depth)
+        volume = curr['bid_volume'] + curr['ask_volume']
+        spread = curr['spread']
         
         # Predict slippage
-        features = np.array([[volume, spread, self.volatility]])
+        if volatility is None:
+            volatility = self.volatility
+        features = np.array([[volume, spread, volatility]])
         predicted_slippage = self.model.predict(features)[0]
         
         # Adjust for order size
-        size_factor = min(1.0, quantity / (volume * 0.1))  # Cap at 10% of volume
+        size_factor = np.minimum(1.0, np.asarray(quantity) / (volume * 0.1))  # Cap at 10% of volume
         adjusted_slippage = predicted_slippage * size_factor
         
-        return abs(adjusted_slippage) * 100  # Convert to percentage
+        return np.abs(adjusted_slippage) * 100  # Convert to percentage
         
-    def get_latest_slippage(self, quantity=100.0):
+    def get_latest_slippage(self, quantity=100.0, side='buy', volatility=None):
         """
         Get the latest slippage estimate for a given quantity
         
         Args:
-            quantity: Order quantity in USD
+            quantity: Order quantity in USD, scalar or array
+            side: 'buy' or 'sell'
+            volatility: Optional annualized volatility for the regression beyond the visible depth
             
         Returns:
-            float: Estimated slippage as a percentage
+            float or np.ndarray: Estimated slippage as a percentage
         """
         if self.current_price == 0:
-            return 0.0
+            return 0.0 if np.ndim(quantity) == 0 else np.zeros(np.shape(quantity))
+            
+        if self.execution.ready:
+            # USD sizes are searched directly on cumulative notional
+            vwap, base_quantity, exhausted = self.execution.fill_notional(quantity, side)
+            slippage = np.abs(self.execution.relative_to_mid(vwap, side)) * 100
+            slippage = self._beyond_depth(slippage, base_quantity, exhausted, volatility)
+            return float(slippage) if np.ndim(quantity) == 0 else slippage
             
         # Convert USD quantity to base currency
-        base_quantity = quantity / self.current_price
+        base_quantity = np.asarray(quantity) / self.current_price
         
         # Calculate slippage
-        slippage = self.calculate_slippage(base_quantity)
-        
-        return slippage 
\ No newline at end of file
+        return self.calculate_slippage(base_quantity if np.ndim(quantity) else float(base_quantity), side, volatility)
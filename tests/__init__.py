@@ -0,0 +1,4 @@
+"""
+Tests for the trade simulator.
+Run from the repository root with `python -m pytest`.
+"""
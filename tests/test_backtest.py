@@ -0,0 +1,67 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from engine.backtest import backtest_file, load_estimates
+from engine.pipeline import SimulationPipeline
+from engine.recorder import FrameRecorder, read_frames
+from utils.config import Config
+from utils.decoder import make_decoder
+
+
+def write_recording(path, frames=700, levels=20, seed=7):
+    """Random-walk book with one frame per second of exchange time, long enough for several refit intervals"""
+    rng = random.Random(seed)
+    start = datetime(2025, 5, 4, 10, 0, tzinfo=timezone.utc)
+    mid = 95000.0
+    recorder = FrameRecorder(str(path))
+    for i in range(frames):
+        mid += rng.choice((-0.5, 0.0, 0.5))
+        recorder.write(json.dumps({
+            'timestamp': (start + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'exchange': 'OKX',
+            'symbol': 'BTC-USDT-SWAP',
+            'asks': [[f"{mid + 0.5 + j * 0.1:.1f}", f"{rng.uniform(0.1, 50):.2f}"] for j in range(levels)],
+            'bids': [[f"{mid - 0.5 - j * 0.1:.1f}", f"{rng.uniform(0.1, 50):.2f}"] for j in range(levels)],
+        }), recv_ns=i)
+    recorder.close()
+
+
+@pytest.fixture
+def inline_refits(monkeypatch):
+    # BacktestRunner workers fit inline; do the same in-process
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+
+
+def test_backtest_is_reproducible(tmp_path, inline_refits):
+    recording = tmp_path / 'btc.rec'
+    write_recording(recording)
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'second').mkdir()
+
+    first = backtest_file(str(recording), str(tmp_path / 'first'), 'BTC-USDT')
+    second = backtest_file(str(recording), str(tmp_path / 'second'), 'BTC-USDT')
+
+    assert first['ticks'] == second['ticks'] == 700
+    a, b = load_estimates(first['output']), load_estimates(second['output'])
+    assert a.keys() == b.keys()
+    for name in a:
+        np.testing.assert_array_equal(a[name], b[name], err_msg=name)
+    # Refits happened, so the comparison covers fitted models and not just the 50/50 prior
+    assert len(np.unique(a['maker'])) > 1
+
+
+def test_refits_follow_snapshot_timestamps(tmp_path, inline_refits):
+    recording = tmp_path / 'btc.rec'
+    write_recording(recording)
+    pipeline = SimulationPipeline('BTC-USDT')
+    decoder = make_decoder(Config.DECODER, Config.FEED_FORMAT)
+    try:
+        for _, frame in read_frames(str(recording)):
+            pipeline.process(decoder.decode(frame))
+    finally:
+        pipeline.close()
+
+    # 700 s of feed: first fit once 10 snapshots are stored, then one per 300 s, however fast the replay ran
+    assert pipeline.maker_taker_model.refitter.refits == 3
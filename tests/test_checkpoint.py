@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pytest
+from engine.checkpoint import Checkpointer
+from engine.pipeline import SimulationPipeline
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot
+
+
+def snapshot(i, rng):
+    mid = 100.0 * np.exp(1e-3 * np.sin(i / 7) + 1e-4 * rng.normal())
+    spread = 0.05 * (1 + i % 3)
+    bids = np.column_stack((mid - spread - 0.1 * np.arange(20), rng.uniform(0.1, 3.0, 20)))
+    asks = np.column_stack((mid + spread + 0.1 * np.arange(20), rng.uniform(0.1, 3.0, 20)))
+    return OrderBookSnapshot((i + 1) * 1_000_000_000, mid, bids, asks)
+
+
+def estimates(result):
+    return result._replace(processing_time=0.0)
+
+
+@pytest.fixture
+def pipelines(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    created = []
+
+    def make():
+        pipeline = SimulationPipeline('BTC-USDT')
+        created.append(pipeline)
+        return pipeline
+
+    yield make
+    for pipeline in created:
+        pipeline.close()
+
+
+def test_restored_pipeline_continues_identically(pipelines, tmp_path):
+    rng = np.random.default_rng(5)
+    ticks = [snapshot(i, rng) for i in range(400)]
+    original = pipelines()
+    for tick in ticks[:350]:
+        original.process(tick)
+
+    checkpointer = Checkpointer(directory=str(tmp_path), max_age=60)
+    checkpointer.save('BTC-USDT', original, background=True)
+    checkpointer.wait()
+    assert os.listdir(tmp_path) == ['BTC-USDT.npz']
+
+    restored = pipelines()
+    assert checkpointer.load('BTC-USDT', restored)
+    assert len(restored.orderbook_store) == len(original.orderbook_store)
+    assert restored.orderbook_store.volatility.variance() == original.orderbook_store.volatility.variance()
+    for tick in ticks[350:]:
+        assert estimates(restored.process(tick)) == estimates(original.process(tick))
+
+
+def test_missing_or_stale_checkpoints_are_ignored(pipelines, tmp_path):
+    rng = np.random.default_rng(1)
+    pipeline = pipelines()
+    checkpointer = Checkpointer(directory=str(tmp_path), max_age=0)
+    assert not checkpointer.load('ETH-USDT', pipeline)
+
+    pipeline.process(snapshot(0, rng))
+    checkpointer.save('ETH-USDT', pipeline)
+    assert not checkpointer.load('ETH-USDT', pipelines())
+
+
+def test_maybe_save_waits_one_interval_from_the_first_tick(pipelines, tmp_path):
+    pipeline = pipelines()
+    pipeline.process(snapshot(0, np.random.default_rng(2)))
+    checkpointer = Checkpointer(directory=str(tmp_path), interval=60)
+    checkpointer.maybe_save('BTC-USDT', pipeline, now=100.0)
+    checkpointer.maybe_save('BTC-USDT', pipeline, now=159.0)
+    checkpointer.wait()
+    assert not os.path.exists(checkpointer.path('BTC-USDT'))
+    checkpointer.maybe_save('BTC-USDT', pipeline, now=160.0)
+    checkpointer.wait()
+    assert os.path.exists(checkpointer.path('BTC-USDT'))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from engine.pipeline import SimulationPipeline
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot
+
+QUANTITIES = np.array([0.0, 10.0, 100.0, 5_000.0, 250_000.0])
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    pipeline = SimulationPipeline('BTC-USDT')
+    for i in range(5):
+        mid = 100.0 + 0.01 * i
+        bids = np.array([[mid - 0.05 - 0.1 * j, 2.0] for j in range(20)])
+        asks = np.array([[mid + 0.05 + 0.1 * j, 2.0] for j in range(20)])
+        pipeline.process(OrderBookSnapshot((i + 1) * 1_000_000_000, mid, bids, asks))
+    yield pipeline
+    pipeline.close()
+
+
+def test_curves_have_one_row_per_tier(pipeline):
+    curves = pipeline.cost_curves(QUANTITIES)
+    assert curves['tiers'] == list(Config.FEE_TIERS)
+    assert curves['fees'].shape == curves['total_cost'].shape == (len(Config.FEE_TIERS), len(QUANTITIES))
+    assert curves['market_impact'].shape == curves['slippage'].shape == QUANTITIES.shape
+    np.testing.assert_allclose(curves['total_cost'][:, 0], 0.0)
+    np.testing.assert_allclose(
+        curves['total_cost'], curves['fees'] + curves['impact_cost'] + curves['slippage_cost'])
+
+
+def test_curves_match_the_per_quantity_estimates(pipeline):
+    curves = pipeline.cost_curves(QUANTITIES, 'Tier 1')
+    for i, quantity in enumerate(QUANTITIES[1:], start=1):
+        assert curves['market_impact'][i] == pytest.approx(
+            pipeline.market_impact_model.get_latest_impact(quantity))
+        assert curves['slippage'][i] == pytest.approx(pipeline.slippage_model.get_latest_slippage(quantity))
+    np.testing.assert_allclose(curves['impact_cost'], QUANTITIES * curves['market_impact'] / 100)
+
+
+def test_taker_fee_model_charges_the_taker_rate(pipeline, monkeypatch):
+    monkeypatch.setattr(Config, 'FEE_MODEL', 'taker')
+    curves = pipeline.cost_curve.compute(QUANTITIES, ['Tier 1', 'Tier 4'])
+    taker = np.array([Config.FEE_TIERS['Tier 1']['taker'], Config.FEE_TIERS['Tier 4']['taker']])
+    np.testing.assert_allclose(curves['fee_rate'], taker * 100)
+    np.testing.assert_allclose(curves['fees'], taker[:, np.newaxis] * QUANTITIES[np.newaxis, :])
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from models.execution import ExecutionPriceEngine
+from models.slippage import SlippageModel
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot, OrderBookStore
+
+BIDS = np.array([[99.0, 1.0], [98.0, 2.0], [97.0, 0.0], [96.0, 3.0]])
+ASKS = np.array([[101.0, 1.0], [102.0, 2.0], [103.0, 3.0]])
+
+
+@pytest.fixture
+def engine():
+    engine = ExecutionPriceEngine()
+    engine.update(BIDS, ASKS)
+    return engine
+
+
+def test_fill_walks_levels_in_base_quantity(engine):
+    vwap, exhausted = engine.fill([0.0, 0.5, 1.0, 2.0, 6.0, 8.0], 'buy')
+    np.testing.assert_allclose(vwap, [101.0, 101.0, 101.0, 101.5, (101 + 204 + 309) / 6,
+                                      (101 + 204 + 309 + 2 * 103) / 8])
+    np.testing.assert_array_equal(exhausted, [False, False, False, False, False, True])
+
+
+def test_fill_skips_empty_levels_on_the_sell_side(engine):
+    vwap, exhausted = engine.fill(4.0, 'sell')
+    assert vwap == pytest.approx((99 + 196 + 96) / 4)
+    assert not exhausted
+
+
+def test_fill_notional_matches_fill(engine):
+    quantities = np.array([0.5, 2.5, 5.0])
+    vwap, _ = engine.fill(quantities, 'buy')
+    notional_vwap, base, exhausted = engine.fill_notional(vwap * quantities, 'buy')
+    np.testing.assert_allclose(base, quantities)
+    np.testing.assert_allclose(notional_vwap, vwap)
+    assert not exhausted.any()
+
+
+def test_slippage_is_measured_from_mid(engine):
+    assert engine.mid == 100.0
+    np.testing.assert_allclose(engine.slippage([1.0, 3.0], 'buy'), [0.01, (101 + 204) / 3 / 100 - 1])
+    np.testing.assert_allclose(engine.slippage_notional(99.0, 'sell'), 0.01)
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return np.full(len(X), self.value)
+
+
+@pytest.fixture
+def slippage_model():
+    store = OrderBookStore(max_history=32, depth=4)
+    model = SlippageModel(store)
+    model.online = False
+    for i in range(12):
+        snapshot = OrderBookSnapshot(i, 100.0, BIDS, ASKS)
+        store.append(snapshot)
+        model.execution.update(BIDS, ASKS)
+    model.current_price = 100.0
+    return model
+
+
+def test_regression_takes_over_beyond_visible_depth(slippage_model):
+    within = slippage_model.get_latest_slippage(np.array([50.0, 300.0]))
+    slippage_model.model = ConstantModel(0.5)  # 50% of the mid: far above anything the book shows
+    raised = slippage_model.get_latest_slippage(np.array([50.0, 300.0, 5_000.0]))
+    np.testing.assert_allclose(raised[:2], within)
+    assert raised[2] == pytest.approx(50.0)
+
+
+def test_regression_never_lowers_the_depth_walk(slippage_model):
+    slippage_model.model = ConstantModel(0.0)
+    walk = np.abs(slippage_model.execution.slippage_notional(5_000.0, 'buy')) * 100
+    assert slippage_model.get_latest_slippage(5_000.0) == pytest.approx(walk)
+    assert slippage_model.calculate_slippage(50.0) == pytest.approx(
+        np.abs(slippage_model.execution.slippage(50.0)) * 100)
+
+
+def test_regression_is_fitted_in_batch_mode(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    store = OrderBookStore(max_history=64, depth=4)
+    model = SlippageModel(store)
+    model.online = False
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        shift = rng.normal(0, 0.5)
+        snapshot = OrderBookSnapshot(i * 1_000_000_000, 100.0 + shift, BIDS + [shift, 0], ASKS + [shift, 0])
+        store.append(snapshot)
+        model.update(snapshot)
+    assert model.model is not None
+    assert model.refitter.refits == 1
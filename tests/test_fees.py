@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from engine.pipeline import SimulationPipeline, price_estimate
+from models.fees import FeeSchedule
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot
+
+TIERS = {
+    'Tier A': {'maker': 0.0008, 'taker': 0.001},
+    'Tier B': {'maker': 0.0002, 'taker': 0.0006},
+}
+
+
+@pytest.fixture
+def schedule():
+    return FeeSchedule(TIERS)
+
+
+def test_blended_rates_interpolate_between_taker_and_maker(schedule):
+    np.testing.assert_allclose(schedule.blended_rates(0.0), [0.001, 0.0006])
+    np.testing.assert_allclose(schedule.blended_rates(1.0), [0.0008, 0.0002])
+    np.testing.assert_allclose(schedule.blended_rates(0.25, 'Tier B'), [0.0005])
+    # Fractions outside [0, 1] are clipped
+    np.testing.assert_allclose(schedule.blended_rates(2.0, 'Tier A'), [0.0008])
+
+
+def test_fees_broadcast_over_tiers_and_orders(schedule):
+    fees = schedule.fees([100.0, 1000.0], maker_fraction=[0.0, 1.0])
+    np.testing.assert_allclose(fees, [[0.1, 0.8], [0.06, 0.2]])
+    np.testing.assert_allclose(schedule.taker_fees([100.0], 'Tier A'), [[0.1]])
+    np.testing.assert_array_equal(schedule.index(['Tier B', 'Tier A']), [1, 0])
+
+
+def test_price_estimate_matches_a_quote_for_the_default_order(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    pipeline = SimulationPipeline('BTC-USDT')
+    bids = np.array([[100.0 - 0.1 * i, 1.0] for i in range(20)])
+    asks = np.array([[100.1 + 0.1 * i, 1.0] for i in range(20)])
+    estimate = pipeline.process(OrderBookSnapshot(1_000_000_000, 100.05, bids, asks))
+
+    priced = price_estimate(estimate, 'Tier 2', FeeSchedule())
+    quote = pipeline.quote(Config.DEFAULT_ORDER_SIZE, 'Tier 2')
+    assert priced.quantity == Config.DEFAULT_ORDER_SIZE
+    for field in ('market_impact', 'slippage', 'fees', 'fee_rate', 'impact_cost',
+                  'slippage_cost', 'total_cost'):
+        assert getattr(priced, field) == pytest.approx(getattr(quote, field)), field
+    pipeline.close()
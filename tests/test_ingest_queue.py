@@ -0,0 +1,93 @@
+import asyncio
+import time
+import pytest
+from utils.ingest_queue import IngestQueue
+
+
+class Item:
+    def __init__(self, value, received_ns=0):
+        self.value = value
+        self.received_ns = received_ns
+
+
+async def fill(queue, values):
+    for value in values:
+        await queue.put(Item(value))
+
+
+async def drain(queue):
+    values = []
+    while len(queue):
+        values.append((await queue.get()).value)
+    return values
+
+
+def test_drop_oldest_discards_one_per_overflow():
+    async def run():
+        queue = IngestQueue(3, 'drop_oldest')
+        await fill(queue, range(7))
+        return queue, await drain(queue)
+
+    queue, values = asyncio.run(run())
+    assert values == [4, 5, 6]
+    metrics = queue.metrics()
+    assert (metrics['enqueued'], metrics['dropped'], metrics['blocked']) == (7, 4, 0)
+    assert (metrics['depth'], metrics['max_depth']) == (0, 3)
+
+
+def test_conflate_discards_the_backlog():
+    async def run():
+        queue = IngestQueue(3, 'conflate')
+        await fill(queue, range(7))
+        return queue, await drain(queue)
+
+    queue, values = asyncio.run(run())
+    # Overflow at 3 clears 0-2, overflow at 6 clears 3-5
+    assert values == [6]
+    assert (queue.enqueued, queue.dropped, queue.blocked) == (7, 6, 0)
+
+
+def test_block_waits_for_space_without_dropping():
+    async def run():
+        queue = IngestQueue(2, 'block')
+        producer = asyncio.create_task(fill(queue, range(5)))
+        await asyncio.sleep(0)
+        assert len(queue) == 2 and not producer.done()
+        values = []
+        for _ in range(5):
+            values.append((await queue.get()).value)
+            await asyncio.sleep(0)  # Let the producer refill before the next get
+        await producer
+        return queue, values
+
+    queue, values = asyncio.run(run())
+    assert values == [0, 1, 2, 3, 4]
+    assert (queue.enqueued, queue.dropped, queue.blocked) == (5, 0, 3)
+
+
+def test_max_age_skips_stale_items_with_newer_ones_queued():
+    async def run():
+        queue = IngestQueue(10, 'drop_oldest', max_age=1.0)
+        stale = time.perf_counter_ns() - 5_000_000_000
+        for value in range(3):
+            await queue.put(Item(value, stale))
+        first = (await queue.get()).value
+        await queue.put(Item(3, stale))
+        return queue, first, (await queue.get()).value
+
+    queue, first, last = asyncio.run(run())
+    # The newest item is handed out even when stale
+    assert (first, last) == (2, 3)
+    assert queue.expired == 2
+    assert queue.metrics()['last_age_ms'] > 1000
+
+
+@pytest.mark.parametrize('maxsize', [0, -1])
+def test_rejects_sizes_below_one(maxsize):
+    with pytest.raises(ValueError):
+        IngestQueue(maxsize)
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        IngestQueue(policy='drop_newest')
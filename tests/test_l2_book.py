@@ -0,0 +1,91 @@
+import json
+import numpy as np
+import pytest
+from utils.decoder import OkxBooksDecoder, make_decoder
+from utils.l2_book import BookSide, L2OrderBook
+
+
+def test_book_side_keeps_levels_sorted_best_first():
+    bids = BookSide(descending=True)
+    for price, qty in ((99.0, 1.0), (101.0, 2.0), (100.0, 3.0)):
+        bids.set(price, qty)
+    assert bids.best() == 101.0
+    np.testing.assert_array_equal(bids.top(2), [[101.0, 2.0], [100.0, 3.0]])
+
+    bids.set(100.0, 5.0)  # Update in place
+    bids.set(101.0, 0.0)  # Delete
+    bids.set(42.0, 0.0)  # Deleting an unknown level is a no-op
+    assert len(bids) == 2
+    np.testing.assert_array_equal(bids.top(10), [[100.0, 5.0], [99.0, 1.0]])
+
+
+def test_ask_side_best_is_lowest():
+    asks = BookSide(descending=False)
+    for price in (103.0, 101.0, 102.0):
+        asks.set(price, 1.0)
+    assert asks.best() == 101.0
+    np.testing.assert_array_equal(asks.top(2)[:, 0], [101.0, 102.0])
+    asks.clear()
+    assert asks.best() is None and asks.top(3).shape == (0, 2)
+
+
+def test_book_rejects_updates_after_a_sequence_gap():
+    book = L2OrderBook(depth=5)
+    assert not book.apply_update([[1.0, 1.0]], [], 0, 2, 1)  # Before the first snapshot
+    book.apply_snapshot([['99', '1']], [['101', '1']], 1, seq_id=10)
+    assert book.apply_update([['100', '2']], [], 2, seq_id=11, prev_seq_id=10)
+    assert not book.apply_update([['98', '2']], [], 3, seq_id=13, prev_seq_id=12)
+    assert (book.gaps, book.synced) == (1, False)
+    assert book.best_bid() == 100.0
+
+
+def frame(action, entries):
+    return json.dumps({'arg': {'channel': 'books', 'instId': 'BTC-USDT'}, 'action': action,
+                       'data': entries}).encode()
+
+
+def entry(ts, seq_id, prev_seq_id=-1, bids=(), asks=()):
+    return {'ts': str(ts), 'seqId': seq_id, 'prevSeqId': prev_seq_id,
+            'bids': [[p, q, '0', '1'] for p, q in bids], 'asks': [[p, q, '0', '1'] for p, q in asks]}
+
+
+@pytest.fixture
+def decoder():
+    decoder = make_decoder('json', 'okx_books')
+    decoder.book.depth = 2
+    return decoder
+
+
+def test_okx_decoder_applies_deltas_to_the_snapshot(decoder):
+    assert isinstance(decoder, OkxBooksDecoder)
+    snapshot = decoder.decode(frame('snapshot', [entry(1000, 1, bids=[('99', '1'), ('98', '2'), ('97', '3')],
+                                                       asks=[('101', '1'), ('102', '2')])]))
+    assert snapshot.timestamp == 1000 * 1_000_000
+    assert snapshot.price == 100.0
+    np.testing.assert_array_equal(snapshot.bids, [[99.0, 1.0], [98.0, 2.0]])
+
+    snapshot = decoder.decode(frame('update', [entry(1001, 2, 1, bids=[('99', '0'), ('99.5', '4')],
+                                                     asks=[('101', '0.5')])]))
+    np.testing.assert_array_equal(snapshot.bids, [[99.5, 4.0], [98.0, 2.0]])
+    np.testing.assert_array_equal(snapshot.asks, [[101.0, 0.5], [102.0, 2.0]])
+    assert snapshot.price == pytest.approx(100.25)
+
+
+def test_okx_decoder_waits_for_a_snapshot_after_a_gap(decoder):
+    assert decoder.decode(frame('update', [entry(1000, 2, 1, bids=[('99', '1')])])) is None
+    assert not decoder.needs_resync  # Nothing to resync before the first snapshot
+
+    decoder.decode(frame('snapshot', [entry(1000, 5, bids=[('99', '1')], asks=[('101', '1')])]))
+    assert decoder.decode(frame('update', [entry(1001, 7, 6, bids=[('98', '1')])])) is None
+    assert decoder.needs_resync
+    assert decoder.decode(frame('update', [entry(1002, 8, 7, bids=[('97', '1')])])) is None
+
+    snapshot = decoder.decode(frame('snapshot', [entry(1003, 9, bids=[('96', '1')], asks=[('104', '1')])]))
+    assert snapshot.price == 100.0
+    decoder.reset()
+    assert not decoder.needs_resync and decoder.book.depth == 2
+
+
+def test_okx_decoder_ignores_other_messages(decoder):
+    assert decoder.decode(b'{"event": "subscribe"}') is None
+    assert decoder.decode(b'[]') is None
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from engine.pipeline import SimulationPipeline
+from utils.config import Config
+from utils.latency import LatencyTracker, TickRateMeter
+from utils.orderbook_store import OrderBookSnapshot
+
+
+def test_summary_reports_percentiles_in_milliseconds():
+    tracker = LatencyTracker(window=1000)
+    assert tracker.summary('process') is None
+    for i in range(1, 101):
+        tracker.record_ns('process', 0, i * 1_000_000)  # 1..100 ms
+    summary = tracker.summary('process')
+    assert summary['count'] == 100 and summary['max'] == pytest.approx(100.0)
+    assert summary['p50'] == pytest.approx(np.percentile(np.arange(1, 101), 50))
+    assert summary['p99.9'] == pytest.approx(np.percentile(np.arange(1, 101), 99.9))
+
+
+def test_only_the_last_window_of_samples_is_kept():
+    tracker = LatencyTracker(window=10)
+    for i in range(25):
+        tracker.record('publish', i / 1e3)
+    summary = tracker.summary('publish')
+    assert summary['count'] == 25
+    assert summary['p50'] == pytest.approx(np.percentile(np.arange(15, 25), 50))
+    assert summary['max'] == pytest.approx(24.0)
+
+
+def test_tick_rate_counts_ticks_in_the_window():
+    meter = TickRateMeter(window_seconds=5)
+    assert meter.rate(0.0) == 0.0
+    for i in range(21):
+        meter.tick(i * 0.5)  # 2 ticks per second for 10 s
+    assert meter.rate(10.0) == pytest.approx(11 / 5)
+
+
+def test_pipeline_records_every_processing_stage(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    pipeline = SimulationPipeline('BTC-USDT')
+    bids = np.array([[99.9 - 0.1 * i, 1.0] for i in range(10)])
+    asks = np.array([[100.1 + 0.1 * i, 1.0] for i in range(10)])
+    for i in range(3):
+        pipeline.process(OrderBookSnapshot((i + 1) * 1_000_000_000, 100.0, bids, asks))
+    summaries = pipeline.latency.summaries()
+    assert set(summaries) == {'store', 'market_impact', 'slippage', 'maker_taker', 'predict', 'process'}
+    assert all(summary['count'] == 3 for summary in summaries.values())
+    metrics = pipeline.performance_metrics()
+    assert metrics['stages']['process']['p50'] >= 0
+    pipeline.close()
@@ -0,0 +1,66 @@
+import io
+import logging
+import queue
+import pytest
+from utils.config import Config
+from utils.logging_setup import DroppingQueueHandler, RateLimitFilter, setup_logging, stop_logging
+
+
+def record(message, created, name='test', level=logging.WARNING, args=None):
+    record = logging.LogRecord(name, level, __file__, 1, message, args, None)
+    record.created = created
+    return record
+
+
+def test_repeats_beyond_the_burst_are_counted_and_reported():
+    rate_limit = RateLimitFilter(interval=10, burst=2, max_keys=100)
+    passed = [rate_limit.filter(record("feed %s stalled", t, args=('BTC',))) for t in (0, 1, 2, 3, 4)]
+    assert passed == [True, True, False, False, False]
+    assert rate_limit.suppressed == 3
+    # A different message is tracked separately
+    assert rate_limit.filter(record("feed %s stalled", 5, args=('ETH',)))
+
+    # The next window lets the message through, annotated with the repeats dropped
+    late = record("feed %s stalled", 10, args=('BTC',))
+    assert rate_limit.filter(late)
+    assert late.getMessage() == "feed BTC stalled (repeated 3 more times)"
+
+
+def test_flush_reports_pending_repeats(caplog):
+    rate_limit = RateLimitFilter(interval=60, burst=1, max_keys=100)
+    for t in range(4):
+        rate_limit.filter(record("queue full", t, name='engine.test'))
+    with caplog.at_level(logging.WARNING, logger='engine.test'):
+        rate_limit.flush()
+    assert [r.getMessage() for r in caplog.records] == ["Suppressed 3 repeats of: queue full"]
+    rate_limit.flush()
+    assert len(caplog.records) == 1
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(2))
+    for t in range(5):
+        handler.handle(record(f"message {t}", t))
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
+
+
+def test_setup_logging_writes_from_the_listener_thread(monkeypatch):
+    monkeypatch.setitem(Config.LOG_RATE_LIMIT, 'burst', 1)
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    try:
+        setup_logging('INFO', stream=stream, fmt='%(levelname)s %(message)s')
+        log = logging.getLogger('engine.test')
+        log.debug("hidden")
+        for _ in range(3):
+            log.warning("book %d crossed", 7)
+    finally:
+        stop_logging()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+    assert stream.getvalue().splitlines() == [
+        "WARNING book 7 crossed",
+        "WARNING Suppressed 2 repeats of: book 7 crossed",
+    ]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from engine.pipeline import SimulationPipeline
+from models.online import OnlineLogisticRegression, OnlineQuantileRegressor
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot
+
+
+def samples(n, seed=11):
+    rng = np.random.default_rng(seed)
+    # Features on very different scales, like [volume, spread, volatility]
+    X = np.column_stack([rng.uniform(100, 5000, n), rng.uniform(0.01, 1.0, n), rng.uniform(0.2, 0.8, n)])
+    return X, rng
+
+
+def test_logistic_regression_learns_a_linear_boundary():
+    X, rng = samples(4000)
+    y = (X[:, 1] > 0.5).astype(np.float64)
+    model = OnlineLogisticRegression().partial_fit(X, y)
+    proba = model.predict_proba(X[-1000:])
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    assert np.mean((proba[:, 1] > 0.5) == y[-1000:]) > 0.9
+
+
+@pytest.mark.parametrize('quantile', [0.5, 0.9])
+def test_quantile_regressor_tracks_the_requested_quantile(quantile):
+    X, rng = samples(6000)
+    y = 1e-4 * rng.standard_normal(len(X))  # Relative price changes
+    # A small step keeps the SGD jitter around the target quantile well inside the tolerance
+    model = OnlineQuantileRegressor(quantile=quantile, learning_rate=0.01).warm_start(X, y, epochs=3)
+    assert np.mean(y <= model.predict(X)) == pytest.approx(quantile, abs=0.05)
+
+
+@pytest.mark.parametrize('cls', [OnlineLogisticRegression, OnlineQuantileRegressor])
+def test_state_round_trip_predicts_identically(cls):
+    X, rng = samples(300)
+    y = (rng.uniform(size=len(X)) > 0.5).astype(np.float64)
+    model = cls().partial_fit(X, y)
+    restored = cls()
+    restored.set_state(model.get_state())
+    predict = 'predict_proba' if cls is OnlineLogisticRegression else 'predict'
+    np.testing.assert_array_equal(getattr(restored, predict)(X), getattr(model, predict)(X))
+    # Both keep learning from the same point
+    model.partial_fit(X[:5], y[:5])
+    restored.partial_fit(X[:5], y[:5])
+    np.testing.assert_array_equal(restored.coef_, model.coef_)
+
+
+def test_online_mode_steps_both_models_every_tick(monkeypatch):
+    monkeypatch.setattr(Config, 'LEARNING_MODE', 'online')
+    pipeline = SimulationPipeline('BTC-USDT')
+    rng = np.random.default_rng(5)
+    mid = 100.0
+    levels = np.arange(5)
+    try:
+        for i in range(40):
+            mid += rng.choice((-0.1, 0.1))
+            bids = np.column_stack([mid - 0.05 - 0.1 * levels, rng.uniform(1, 5, 5)])
+            asks = np.column_stack([mid + 0.05 + 0.1 * levels, rng.uniform(1, 5, 5)])
+            pipeline.process(OrderBookSnapshot(i * 1_000_000_000, mid, bids, asks))
+            if i == 20:
+                steps = (pipeline.slippage_model.model.n_updates, pipeline.maker_taker_model.model.n_updates)
+    finally:
+        pipeline.close()
+
+    slippage, maker_taker = pipeline.slippage_model.model, pipeline.maker_taker_model.model
+    assert isinstance(slippage, OnlineQuantileRegressor)
+    assert isinstance(maker_taker, OnlineLogisticRegression)
+    # One SGD step per tick after the warm start
+    assert (slippage.n_updates, maker_taker.n_updates) == (steps[0] + 19, steps[1] + 19)
+    assert pipeline.slippage_model.refitter.refits == pipeline.maker_taker_model.refitter.refits == 0
@@ -0,0 +1,65 @@
+import math
+import numpy as np
+import pytest
+from models.market_impact import AlmgrenChrissModel, OptimalExecutionCache
+from utils.orderbook_store import OrderBookStore
+
+QUANTITIES = [1.0, 5.0]
+HORIZONS = [0.5, 2.0]
+RISK_AVERSIONS = [0.0, 1e-6, 1.0]
+
+
+@pytest.fixture
+def model():
+    model = AlmgrenChrissModel(OrderBookStore())
+    model.sigma = 0.02
+    return model
+
+
+def test_grid_matches_the_closed_form_trajectory(model):
+    grid = model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS, n_steps=10)
+    assert grid['trajectories'].shape == (2, 2, 3, 11)
+    assert grid['expected_cost'].shape == (2, 2, 3)
+    np.testing.assert_allclose(grid['times'][1], np.linspace(0.0, 2.0, 11))
+
+    q, T, lam = 5.0, 2.0, 1.0
+    kappa = math.sqrt(lam * model.sigma ** 2 / model.eta)
+    expected = [q * math.sinh(kappa * t) / math.sinh(kappa * T) for t in np.linspace(0.0, T, 11)]
+    np.testing.assert_allclose(grid['trajectories'][1, 1, 2], expected)
+    assert grid['expected_cost'][1, 1, 2] == pytest.approx(
+        model.eta * q ** 2 / T + model.gamma * q ** 2 / 2 + lam * model.sigma ** 2 * q ** 2 * T / 3)
+
+
+def test_zero_risk_aversion_trades_linearly(model):
+    grid = model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS, n_steps=4)
+    np.testing.assert_allclose(grid['trajectories'][0, 0, 0], [0.0, 0.25, 0.5, 0.75, 1.0])
+    np.testing.assert_allclose(grid['trajectories'][..., -1],
+                               np.broadcast_to(np.array(QUANTITIES)[:, None, None], (2, 2, 3)))
+
+
+def test_grid_is_memoized_until_sigma_moves(model):
+    cache = model.execution_cache
+    first = model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS)
+    assert model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    with pytest.raises(ValueError):
+        first['trajectories'][0, 0, 0, 0] = 1.0
+
+    # Within tolerance the cached grid (and its sigma) is reused
+    model.sigma *= 1 + cache.tolerance / 2
+    assert model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS) is first
+
+    model.sigma *= 2
+    moved = model.get_optimal_execution_grid(QUANTITIES, HORIZONS, RISK_AVERSIONS)
+    assert moved is not first and moved['sigma'] == model.sigma
+    assert len(cache) == 1
+
+
+def test_execution_cache_clear_resets_the_reference_sigma():
+    cache = OptimalExecutionCache(tolerance=0.1)
+    assert cache.validate(1.0) == 1.0
+    cache.put('key', 'grid')
+    assert cache.validate(1.05) == 1.0 and cache.get('key') == 'grid'
+    cache.clear()
+    assert cache.reference_sigma is None and len(cache) == 0
+
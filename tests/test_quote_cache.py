@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from engine.pipeline import SimulationPipeline
+from utils.config import Config
+from utils.lru_cache import LRUCache
+from utils.orderbook_store import OrderBookSnapshot
+
+
+def snapshot(i):
+    mid = 100.0 + 0.01 * i
+    bids = np.array([[mid - 0.05 - 0.1 * j, 1.0] for j in range(20)])
+    asks = np.array([[mid + 0.05 + 0.1 * j, 1.0] for j in range(20)])
+    return OrderBookSnapshot((i + 1) * 1_000_000_000, mid, bids, asks)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    pipeline = SimulationPipeline('BTC-USDT')
+    yield pipeline
+    pipeline.close()
+
+
+def test_lru_cache_evicts_the_least_recently_used_entry():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert (cache.hits, cache.misses, len(cache)) == (3, 1, 2)
+
+
+def test_quote_is_none_before_the_first_tick(pipeline):
+    assert pipeline.quote(1000.0, 'Tier 1') is None
+
+
+def test_quotes_are_memoized_per_book_version(pipeline):
+    pipeline.process(snapshot(0))
+    first = pipeline.quote(1000.0, 'Tier 1')
+    assert pipeline.quote(1000.0, 'Tier 1') is first
+    assert pipeline.quotes.hits == 1
+
+    other_tier = pipeline.quote(1000.0, 'Tier 4')
+    assert other_tier is not first and other_tier.fees < first.fees
+    assert pipeline.quote(1000.0, 'Tier 1', volatility=0.5) is not first
+
+    pipeline.process(snapshot(1))
+    requoted = pipeline.quote(1000.0, 'Tier 1')
+    assert requoted is not first and requoted.version == first.version + 1
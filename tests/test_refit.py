@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from models.refit import BackgroundRefitter, describe_refits
+from utils.config import Config
+
+
+class Estimator:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.fitted = False
+
+    def fit(self, X, y):
+        if self.fail:
+            raise ValueError("single class")
+        self.fitted = True
+        return self
+
+
+@pytest.fixture
+def refitter(monkeypatch):
+    monkeypatch.setitem(Config.REFIT_PARAMS, 'background', False)
+    return BackgroundRefitter('test')
+
+
+def test_inline_refit_is_collected_on_the_next_poll(refitter):
+    assert refitter.poll() is None
+    assert refitter.submit(Estimator(), np.zeros((3, 1)), np.zeros(3))
+    assert refitter.in_flight
+    assert not refitter.submit(Estimator(), np.zeros((3, 1)), np.zeros(3))
+    model = refitter.poll()
+    assert model.fitted and not refitter.in_flight
+
+    metrics = refitter.metrics()
+    assert (metrics['refits'], metrics['failures'], metrics['in_flight']) == (1, 0, False)
+    assert metrics['last_refit_duration'] >= 0 and metrics['staleness'] >= 0
+
+
+def test_failed_refit_is_counted_and_keeps_the_old_model(refitter):
+    refitter.submit(Estimator(fail=True), np.zeros((3, 1)), np.zeros(3))
+    assert refitter.poll() is None
+    assert not refitter.in_flight
+    assert (refitter.refits, refitter.failures) == (0, 1)
+    assert refitter.staleness() is None
+
+
+def test_describe_refits():
+    metrics = {'refits': 0, 'failures': 0, 'in_flight': False, 'last_refit_duration': 0.0,
+               'last_refit_latency': 0.0, 'staleness': None}
+    assert describe_refits(metrics) == "no refits yet"
+    assert describe_refits(dict(metrics, in_flight=True)) == "no refits yet, fit in flight"
+    metrics.update(refits=1, failures=2, last_refit_duration=0.0123, staleness=35.4)
+    assert describe_refits(metrics) == "1 refit, last 12 ms, 2 failed, 35 s old"
+    metrics.update(refits=4, failures=0)
+    assert describe_refits(metrics) == "4 refits, last 12 ms, 35 s old"
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from utils.ring_buffer import RingArray, SnapshotRingBuffer
+
+
+def book(i, levels):
+    """Ladders whose every value encodes the snapshot index, so misplaced rows show up"""
+    bids = np.array([[1000.0 - i - j, i + j / 100] for j in range(levels)])
+    asks = np.array([[1001.0 + i + j, i + j / 100] for j in range(levels)])
+    return bids, asks
+
+
+def filled_ring(capacity, depth, snapshots, levels=None):
+    ring = SnapshotRingBuffer(capacity, depth)
+    for i in range(snapshots):
+        bids, asks = book(i, levels or depth)
+        ring.append(i, 1000.5 + i, bids, asks)
+    return ring
+
+
+@pytest.mark.parametrize('n', [None, 0, 1, 3, 4, 10])
+def test_ring_array_last_across_wraparound(n):
+    ring = RingArray(4, row_shape=(2,))
+    ring.extend(np.arange(6 * 2, dtype=np.float64).reshape(6, 2))
+    ring.append([12.0, 13.0])
+    ring.extend(np.empty((0, 2)))
+
+    rows = np.arange(14, dtype=np.float64).reshape(7, 2)[-4:]
+    expected = rows if n is None else rows[len(rows) - min(n, 4):]
+    np.testing.assert_array_equal(ring.last(n), expected)
+    assert len(ring) == 4
+
+
+def test_ring_array_extend_longer_than_capacity():
+    ring = RingArray(3)
+    ring.append(-1.0)
+    ring.extend(np.arange(10.0))
+    np.testing.assert_array_equal(ring.last(), [7.0, 8.0, 9.0])
+
+
+@pytest.mark.parametrize('snapshots', [3, 5, 12])
+def test_snapshot_ring_last_n_across_wraparound(snapshots):
+    ring = filled_ring(5, 3, snapshots)
+    kept = list(range(max(0, snapshots - 5), snapshots))
+
+    np.testing.assert_array_equal(ring.timestamps(), kept)
+    np.testing.assert_array_equal(ring.mids(2), [1000.5 + i for i in kept[-2:]])
+    np.testing.assert_array_equal(ring.bids(), np.stack([book(i, 3)[0] for i in kept]))
+    np.testing.assert_array_equal(ring.asks(1), book(kept[-1], 3)[1][np.newaxis])
+    assert ring.bid_prices(0).shape == (0, 3)
+    assert ring.sequence == snapshots
+
+
+def test_snapshot_ring_pads_and_truncates_levels():
+    ring = SnapshotRingBuffer(4, 3)
+    ring.append(0, 1000.5, *book(0, 2))
+    ring.append(1, 1001.5, *book(1, 5))
+    np.testing.assert_array_equal(ring.bid_qtys()[0], [0.0, 0.01, 0.0])
+    np.testing.assert_array_equal(ring.ask_prices()[1], book(1, 3)[1][:, 0])
+
+
+@pytest.mark.parametrize('capacity, depth', [(8, 3), (3, 3), (8, 2), (8, 5), (2, 1)])
+def test_snapshot_ring_state_round_trip_with_other_shape(capacity, depth):
+    source = filled_ring(5, 3, 9)
+    state = source.get_state()
+
+    ring = SnapshotRingBuffer(capacity, depth)
+    ring.append(-1, 1.0, *book(99, depth))  # Stale contents must be replaced
+    ring.set_state(state)
+
+    kept = list(range(9 - min(5, capacity), 9))
+    shared = min(depth, 3)
+    assert len(ring) == len(kept)
+    assert ring.sequence == 9
+    np.testing.assert_array_equal(ring.timestamps(), kept)
+    np.testing.assert_array_equal(ring.bids()[:, :shared], np.stack([book(i, 3)[0][:shared] for i in kept]))
+    np.testing.assert_array_equal(ring.asks()[:, shared:], 0.0)
+
+    # Appends after a restore continue the ring in order
+    for i in range(9, 9 + capacity):
+        ring.append(i, 1000.5 + i, *book(i, depth))
+    np.testing.assert_array_equal(ring.timestamps(), range(9, 9 + capacity))
+
+
+def test_snapshot_ring_state_round_trip_float32_qtys():
+    source = filled_ring(4, 2, 6)
+    ring = SnapshotRingBuffer(4, 2, qty_dtype=np.float32)
+    ring.set_state(source.get_state())
+    assert ring.bids().dtype == np.float64
+    np.testing.assert_allclose(ring.bids(), source.bids(), rtol=1e-6)
+
+
+def test_snapshot_ring_stores_each_snapshot_once():
+    ring = SnapshotRingBuffer(100, 50)
+    # Bid and ask prices and quantities as float64, plus mid and timestamp
+    assert ring.bytes_per_snapshot == 2 * 2 * 50 * 8 + 8 + 8
+    assert SnapshotRingBuffer(100, 50, np.float32).bytes_per_snapshot == 2 * 50 * (8 + 4) + 8 + 8
+
+
+def test_last_n_is_a_view_until_it_wraps():
+    ring = filled_ring(5, 2, 7)  # Next write at slot 2
+    assert np.shares_memory(ring.mids(2), ring._mids)
+    assert not np.shares_memory(ring.mids(3), ring._mids)
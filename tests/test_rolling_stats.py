@@ -0,0 +1,48 @@
+import math
+import numpy as np
+import pytest
+from utils.rolling_stats import RollingVolatility
+
+
+def random_walk(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-3, n)))
+
+
+@pytest.mark.parametrize('window', [1, 10, 50, 500])
+def test_rolling_variance_matches_numpy(window):
+    prices = random_walk(300)
+    returns = np.diff(np.log(prices))
+    vol = RollingVolatility(window=window, time_window=None)
+    for i, price in enumerate(prices):
+        vol.update(i * 1_000_000_000, price)
+        if i:
+            expected = np.var(returns[max(0, i - window):i])
+            assert vol.variance() == pytest.approx(expected, rel=1e-9, abs=1e-18)
+    assert len(vol) == min(window, len(returns))
+
+
+def test_time_window_evicts_old_returns():
+    prices = random_walk(200)
+    returns = np.diff(np.log(prices))
+    vol = RollingVolatility(window=1000, time_window=30)
+    for i, price in enumerate(prices):
+        vol.update(i * 1_000_000_000, price)
+    # Returns stamped no more than 30 s before the newest snapshot, both ends inclusive
+    assert len(vol) == 31
+    assert vol.variance() == pytest.approx(np.var(returns[-31:]), rel=1e-9)
+    assert vol.std() == pytest.approx(math.sqrt(vol.variance()))
+
+
+def test_state_round_trip_continues_identically():
+    prices = random_walk(120)
+    vol = RollingVolatility(window=40)
+    for i, price in enumerate(prices[:80]):
+        vol.update(i, price)
+    restored = RollingVolatility(window=40)
+    assert restored.set_state(vol.get_state())
+    for i, price in enumerate(prices[80:], start=80):
+        vol.update(i, price)
+        restored.update(i, price)
+    assert restored.variance() == pytest.approx(vol.variance(), rel=1e-12)
+    assert not RollingVolatility(method='ewma').set_state(vol.get_state())
@@ -0,0 +1,50 @@
+import pytest
+from engine.pipeline import EstimateSnapshot
+from engine.sharding import ResultsBoard, shard_symbols
+
+
+@pytest.fixture
+def board():
+    board = ResultsBoard(['BTC-USDT', 'ETH-USDT'])
+    yield board
+    board.close()
+
+
+def estimate(symbol, timestamp):
+    return EstimateSnapshot(timestamp=timestamp, market_impact=0.012, slippage=0.0034,
+                            maker_taker=(41.5, 58.5), processing_time=0.00025, symbol=symbol)
+
+
+def test_results_board_round_trip(board):
+    assert board.read('BTC-USDT') is None
+    board.write('ETH-USDT', estimate('ETH-USDT', 1_746_355_153_000_000_000), 12, 95.5, (0.4, 1.7))
+
+    assert board.read('ETH-USDT') == estimate('ETH-USDT', 1_746_355_153_000_000_000)
+    assert board.read('BTC-USDT') is None
+    assert board.performance_metrics('ETH-USDT') == {
+        'stages': {'end_to_end': {'p50': 0.4, 'p99': 1.7}}, 'tick_rate': 95.5, 'ticks': 12,
+    }
+
+
+def test_results_board_is_shared_by_name(board):
+    reader = ResultsBoard(board.symbols, name=board.name)
+    try:
+        board.write('BTC-USDT', estimate('BTC-USDT', 1), 1, 10.0)
+        board.write('BTC-USDT', estimate('BTC-USDT', 2), 2, 10.0)
+        assert reader.read('BTC-USDT').timestamp == 2
+        # Latency is kept until the next tick that publishes it
+        assert reader.performance_metrics('BTC-USDT')['stages']['end_to_end'] == {'p50': 0.0, 'p99': 0.0}
+        assert int(reader.read_row('BTC-USDT')['seq']) % 2 == 0
+    finally:
+        reader.close()
+
+
+def test_results_board_skips_rows_mid_write(board):
+    board.write('BTC-USDT', estimate('BTC-USDT', 1), 1, 10.0)
+    board.rows['seq'][0] += 1  # A writer stopped half-way
+    assert board.read_row('BTC-USDT', retries=3) is None
+
+
+def test_shard_symbols_round_robin():
+    assert shard_symbols(['a', 'b', 'c', 'd', 'e'], 2) == [['a', 'c', 'e'], ['b', 'd']]
+    assert shard_symbols(['a'], 4) == [['a']]
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QComboBox,
                              QLineEdit, QFormLayout, QGroupBox)
 from PyQt6.QtCore import pyqtSignal
+from utils.config import Config
 
 class InputPanel(QWidget):
     input_changed = pyqtSignal(dict)
@@ -22,7 +23,7 @@ class InputPanel(QWidget):
         exchange_layout.addRow("Exchange:", self.exchange_combo)
         
         self.asset_combo = QComboBox()
-        self.asset_combo.addItems(["BTC-USDT", "ETH-USDT", "SOL-USDT"])
+        self.asset_combo.addItems(Config.SYMBOLS)
         self.asset_combo.currentTextChanged.connect(self.on_input_changed)
         exchange_layout.addRow("Asset:", self.asset_combo)
         
@@ -39,7 +40,7 @@ class InputPanel(QWidget):
         order_layout.addRow("Order Type:", self.order_type_combo)
         
         self.quantity_input = QLineEdit()
-        self.quantity_input.setPlaceholderText("Enter quantity in USD")
+        self.quantity_input.setPlaceholderText(f"Enter quantity in USD (default {Config.DEFAULT_ORDER_SIZE:g})")
         self.quantity_input.textChanged.connect(self.on_input_changed)
         order_layout.addRow("Quantity (USD):", self.quantity_input)
         
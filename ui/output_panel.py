@@ -1,10 +1,15 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QFormLayout,
                              QGroupBox, QProgressBar)
 from PyQt6.QtCore import Qt
+from models.refit import describe_refits
+from utils.config import Config
 
 class OutputPanel(QWidget):
     def __init__(self):
         super().__init__()
+        self._displayed = {}  # Last value pushed to each widget
+        # Highest taker rate (percentage) fills the fee level bar
+        self.max_fee_rate = max(tier['taker'] for tier in Config.FEE_TIERS.values()) * 100
         self.init_ui()
         
     def init_ui(self):
@@ -89,6 +94,12 @@ class OutputPanel(QWidget):
         self.tick_rate_label = QLabel("0 ticks/s")
         perf_layout.addRow("Tick Rate:", self.tick_rate_label)
         
+        self.slippage_refit_label = QLabel("no refits yet")
+        perf_layout.addRow("Slippage Refits:", self.slippage_refit_label)
+        
+        self.maker_taker_refit_label = QLabel("no refits yet")
+        perf_layout.addRow("Maker/Taker Refits:", self.maker_taker_refit_label)
+        
         perf_group.setLayout(perf_layout)
         layout.addWidget(perf_group)
         
@@ -97,43 +108,63 @@ class OutputPanel(QWidget):
         
         self.setLayout(layout)
         
+    def _set_text(self, label, text):
+        """Set label text only if it differs from what is displayed"""
+        if self._displayed.get(label) != text:
+            self._displayed[label] = text
+            label.setText(text)
+            
+    def _set_bar(self, bar, value):
+        """Set progress bar value only if it differs from what is displayed"""
+        if self._displayed.get(bar) != value:
+            self._displayed[bar] = value
+            bar.setValue(value)
+            
     def update_values(self, values):
         # Update market impact
         if 'market_impact' in values:
             impact = values['market_impact']
-            self.impact_label.setText(f"{impact:.2f}%")
-            self.impact_bar.setValue(int(impact * 100))
+            self._set_text(self.impact_label, f"{impact:.2f}%")
+            self._set_bar(self.impact_bar, int(impact * 100))
             
         # Update slippage
         if 'slippage' in values:
             slippage = values['slippage']
-            self.slippage_label.setText(f"{slippage:.2f}%")
-            self.slippage_bar.setValue(int(slippage * 100))
+            self._set_text(self.slippage_label, f"{slippage:.2f}%")
+            self._set_bar(self.slippage_bar, int(slippage * 100))
             
         # Update fees
         if 'fees' in values:
             fees = values['fees']
-            self.fees_label.setText(f"${fees:.2f}")
-            self.fees_bar.setValue(int(fees * 100))
+            self._set_text(self.fees_label, f"${fees:.2f}")
+        if 'fee_rate' in values:
+            # Rate relative to the most expensive tier, not the USD amount
+            self._set_bar(self.fees_bar, int(values['fee_rate'] / self.max_fee_rate * 100))
             
-        # Update total cost
-        if all(k in values for k in ['market_impact', 'slippage', 'fees']):
-            total = values['market_impact'] + values['slippage'] + values['fees']
-            self.total_cost_label.setText(f"${total:.2f}")
-            self.cost_breakdown_label.setText(
-                f"Impact: ${values['market_impact']:.2f} | "
-                f"Slippage: ${values['slippage']:.2f} | "
+        # Update total cost (USD amounts, not the percentages above)
+        if all(k in values for k in ['impact_cost', 'slippage_cost', 'fees', 'total_cost']):
+            self._set_text(self.total_cost_label, f"${values['total_cost']:.2f}")
+            self._set_text(
+                self.cost_breakdown_label,
+                f"Impact: ${values['impact_cost']:.2f} | "
+                f"Slippage: ${values['slippage_cost']:.2f} | "
                 f"Fees: ${values['fees']:.2f}"
             )
             
         # Update maker/taker
         if 'maker_taker' in values:
             maker, taker = values['maker_taker']
-            self.maker_taker_label.setText(f"{maker:.1f}% / {taker:.1f}%")
-            self.maker_taker_bar.setValue(int(maker))
+            self._set_text(self.maker_taker_label, f"{maker:.1f}% / {taker:.1f}%")
+            self._set_bar(self.maker_taker_bar, int(maker))
             
         # Update performance metrics
         if 'latency' in values:
-            self.latency_label.setText(f"{values['latency']:.2f} ms")
+            text = f"{values['latency']:.2f} ms"
+            if 'latency_p99' in values:
+                text += f" (p99 {values['latency_p99']:.2f} ms)"
+            self._set_text(self.latency_label, text)
         if 'tick_rate' in values:
-            self.tick_rate_label.setText(f"{values['tick_rate']:.1f} ticks/s") 
\ No newline at end of file
+            self._set_text(self.tick_rate_label, f"{values['tick_rate']:.1f} ticks/s")
+        if 'refits' in values:
+            self._set_text(self.slippage_refit_label, describe_refits(values['refits']['slippage']))
+            self._set_text(self.maker_taker_refit_label, describe_refits(values['refits']['maker_taker']))
\ No newline at end of file
@@ -0,0 +1,60 @@
+import threading
+import logging
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ConflatingPublisher(QObject):
+    """
+    Keeps only the latest result and hands it to the UI at a fixed frame rate.
+
+    `publish` may be called from any thread at tick rate; it only swaps a
+    reference under a lock. A QTimer on the GUI thread fires every
+    `interval_ms` and renders the newest result, so rendering cost is
+    bounded by the frame rate rather than the feed rate. Results that were
+    replaced before they could be drawn are counted as conflated.
+    """
+    frame_rendered = pyqtSignal(int)  # Number of ticks conflated into this frame
+
+    def __init__(self, render, interval_ms=Config.UI_REFRESH_RATE, parent=None):
+        super().__init__(parent)
+        self.render = render
+        self._lock = threading.Lock()
+        self._latest = None
+        self._pending = 0
+        self.last_conflated = 0
+        self.total_conflated = 0
+        self.frames = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.on_frame)
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def publish(self, result):
+        """Store the latest result; safe to call from the engine thread"""
+        with self._lock:
+            self._latest = result
+            self._pending += 1
+
+    def on_frame(self):
+        with self._lock:
+            result, pending = self._latest, self._pending
+            self._latest = None
+            self._pending = 0
+
+        if result is None:
+            return
+
+        self.render(result)
+        self.frames += 1
+        self.last_conflated = pending - 1
+        self.total_conflated += self.last_conflated
+        self.frame_rendered.emit(self.last_conflated)
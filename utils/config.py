@@ -1,30 +1,91 @@
+import numpy as np
+
+
 class Config:
     # WebSocket Configuration
-    WEBSOCKET_URL = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/BTC-USDT-SWAP"
-    RECONNECT_DELAY = 5  # seconds
-    MAX_RECONNECT_ATTEMPTS = 5
+    WEBSOCKET_URL_TEMPLATE = "wss://ws.gomarket-cpp.goquant.io/ws/l2-orderbook/okx/{symbol}-SWAP"
+    WEBSOCKET_URL = WEBSOCKET_URL_TEMPLATE.format(symbol='BTC-USDT')
+    SYMBOLS = ['BTC-USDT', 'ETH-USDT', 'SOL-USDT']  # Instruments streamed concurrently by the engine
+    RECONNECT_DELAY = 5  # seconds, base of the exponential reconnect backoff
+    RECONNECT_MAX_DELAY = 60  # seconds, backoff cap
+    MAX_RECONNECT_ATTEMPTS = 5  # Consecutive failed attempts before giving up; None retries forever
+    INGEST_QUEUE = {
+        'maxsize': 64,  # Snapshots buffered between the receive loop and processing
+        'policy': 'drop_oldest',  # Overload policy: 'drop_oldest', 'conflate' or 'block'
+        'max_age': None,  # Seconds; older snapshots are skipped when a newer one is queued
+    }
+    DECODER = 'auto'  # JSON parser: 'json', 'orjson', or 'auto' to use orjson when installed
+    FEED_FORMAT = 'snapshot'  # 'snapshot' (full book per frame) or 'okx_books' (snapshot + deltas)
+    SUBSCRIBE_MESSAGE = None  # Sent after connecting, e.g. {'op': 'subscribe', 'args': [...]}
 
     # Model Parameters
     MARKET_IMPACT_PARAMS = {
         'eta': 0.1,  # Temporary market impact parameter
         'gamma': 0.1,  # Permanent market impact parameter
         'risk_aversion': 0.1,  # Risk aversion parameter
+        'execution_cache_size': 128,  # Memoized optimal-execution grids
+        'sigma_tolerance': 0.01,  # Relative sigma move that invalidates cached grids
     }
 
     SLIPPAGE_MODEL_PARAMS = {
         'quantile': 0.5,  # Median regression
         'alpha': 0.1,  # Regularization parameter
-        'update_interval': 300,  # Update model every 5 minutes
+        'update_interval': 300,  # Refit every 5 minutes of snapshot timestamps
     }
 
     MAKER_TAKER_PARAMS = {
         'max_iter': 1000,  # Maximum iterations for logistic regression
-        'update_interval': 300,  # Update model every 5 minutes
+        'update_interval': 300,  # Refit every 5 minutes of snapshot timestamps
+    }
+
+    LEARNING_MODE = 'batch'  # 'batch' (periodic full refits) or 'online' (incremental SGD per tick)
+    ONLINE_LEARNING_PARAMS = {
+        'learning_rate': 0.05,  # Initial SGD step size
+        'decay': 1e-4,  # Step size is learning_rate / (1 + decay * updates)
+        'l2': 1e-4,  # L2 penalty on the coefficients
+        'scaler_halflife': 500,  # Ticks; half-life of the running feature mean/variance
+        'warm_start_epochs': 1,  # Passes over the stored history before going online
+    }
+
+    REFIT_PARAMS = {
+        'background': True,  # Fit regressors in a worker process pool instead of on the tick path
+        'workers': 2,  # Size of the refit process pool
+    }
+
+    SHARD_PARAMS = {
+        'shards': 0,  # Worker processes for symbols; 0 keeps every symbol on the GUI's engine thread
+        'latency_every': 100,  # Ticks between latency percentile refreshes on the results board
+        'stop_poll_interval': 0.2,  # Seconds between checks of the shard stop flag
     }
 
+    # Settings copied into spawned shard and backtest processes, which re-import Config
+    # and would otherwise lose values set at runtime (CLI flags, tests)
+    WORKER_CONFIG = ('LEARNING_MODE', 'FEED_FORMAT', 'DECODER', 'ORDERBOOK_QTY_DTYPE', 'MODEL_DEPTH',
+                     'FEE_MODEL', 'DEFAULT_ORDER_SIZE', 'INGEST_QUEUE', 'REFIT_PARAMS', 'CHECKPOINT_PARAMS')
+
     # Data Management
-    MAX_ORDERBOOK_HISTORY = 1000  # Maximum number of orderbook snapshots to keep
+    MAX_ORDERBOOK_HISTORY = 1000  # Snapshots kept; about 1.6 KB each at depth 50 (see cli.py --memory-report)
+    ORDERBOOK_DEPTH = 50  # Price levels per side kept by the decoders
+    MODEL_DEPTH = {  # Top-K levels per side each model reads; history stores only the deepest of these
+        'slippage': 50,  # Depth walk and displayed volume feature
+        'maker_taker': 50,  # Bid/ask volume imbalance feature
+    }
+    ORDERBOOK_QTY_DTYPE = 'float64'  # 'float32' halves stored level quantities (~7 significant digits)
+    QUOTE_CACHE_SIZE = 256  # Memoized (book version, quantity, tier) cost quotes per symbol
     VOLATILITY_WINDOW = 252  # Number of days for annualized volatility calculation
+    VOLATILITY_PARAMS = {
+        'method': 'rolling',  # 'rolling' (windowed Welford) or 'ewma'
+        'time_window': 300,  # Window length in seconds of snapshot timestamps; None for a count-only window
+        'window': MAX_ORDERBOOK_HISTORY - 1,  # Cap on returns kept, bounding memory at high tick rates
+        'ewma_lambda': 0.94,  # Decay factor for 'ewma'
+    }
+
+    CHECKPOINT_PARAMS = {
+        'enabled': True,  # Restore state at startup and save it periodically and on shutdown
+        'directory': 'checkpoints',  # One <symbol>.npz per instrument
+        'interval': 60,  # Seconds between periodic checkpoints
+        'max_age': 3600,  # Seconds; older checkpoints are ignored at startup
+    }
 
     # Fee Tiers (OKX)
     FEE_TIERS = {
@@ -34,15 +95,28 @@ class Config:
         'Tier 4': {'maker': 0.0005, 'taker': 0.0007},  # 0.05% / 0.07%
     }
 
+    DEFAULT_ORDER_SIZE = 100.0  # USD; per-tick estimates and the fees shown before an order size is entered
+
+    FEE_MODEL = 'blended'  # 'blended' weighs maker/taker rates by predicted proportions; 'taker' charges every fill as taker
+
+    # Default USD order-size grid for batched cost curves
+    COST_CURVE_QUANTITIES = np.concatenate(([0.0], np.geomspace(10, 1_000_000, 49)))  # 0, then log-spaced $10 to $1M
+
     # UI Configuration
-    UI_REFRESH_RATE = 1000  # milliseconds
+    UI_REFRESH_RATE = 1000  # milliseconds between output panel repaints
     PROGRESS_BAR_MAX = 100
 
     # Logging Configuration
     LOG_LEVEL = 'INFO'
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     LOG_FILE = 'trade_simulator.log'
+    LOG_QUEUE_SIZE = 10000  # Records buffered for the writer thread; further records are dropped
+    LOG_RATE_LIMIT = {
+        'interval': 10.0,  # Seconds per deduplication window
+        'burst': 5,  # Identical records passed per window; the rest are counted and dropped
+        'max_keys': 1000,  # Distinct messages tracked before the table is reset
+    }
 
     # Performance Monitoring
-    LATENCY_WINDOW = 100  # Number of samples to keep for latency calculation
+    LATENCY_WINDOW = 10000  # Number of samples per stage kept for latency percentiles (p99.9 needs >= 1000)
     TICK_RATE_WINDOW = 60  # Number of seconds to calculate tick rate over 
\ No newline at end of file
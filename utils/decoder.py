@@ -0,0 +1,119 @@
+import json
+import logging
+from utils.l2_book import L2OrderBook
+from utils.orderbook_store import OrderBookSnapshot
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON parser
+    orjson = None
+
+PARSERS = {'json': json.loads}
+if orjson is not None:
+    PARSERS['orjson'] = orjson.loads
+
+
+class OrderBookDecoder:
+    """
+    Decodes full-snapshot frames straight into OrderBookSnapshot objects.
+
+    Only the timestamp and the bid/ask ladders are kept; every other field
+    is dropped before the result leaves the receive loop. Frames that are
+    not orderbook updates (subscription acks, heartbeats) decode to None.
+    """
+    needs_resync = False
+
+    def __init__(self, parser='json'):
+        self.parser = parser
+        self.loads = PARSERS[parser]
+
+    def decode(self, message):
+        """
+        Args:
+            message: Raw frame as str or bytes
+
+        Returns:
+            OrderBookSnapshot or None
+        """
+        data = self.loads(message)
+        if not isinstance(data, dict) or 'bids' not in data or 'asks' not in data:
+            return None
+        if not data['bids'] or not data['asks']:
+            return None
+        return OrderBookSnapshot.from_message(data)
+
+    def reset(self):
+        """Forget any per-connection state"""
+
+
+class OkxBooksDecoder(OrderBookDecoder):
+    """
+    Decoder for OKX `books`-style feeds: one snapshot followed by deltas.
+
+    Deltas are applied in place to an L2OrderBook instead of rebuilding
+    the book. Each changed level costs a dict update, plus an O(levels)
+    list shift when a price is added or removed. Every frame then copies
+    the top `Config.ORDERBOOK_DEPTH` levels per side into a new snapshot,
+    so per-frame cost is roughly proportional to the size of the change
+    plus that depth, whatever the full book depth.
+    On a sequence gap `needs_resync` is set and frames decode to None until
+    a fresh snapshot arrives.
+    """
+
+    def __init__(self, parser='json'):
+        super().__init__(parser)
+        self.book = L2OrderBook()
+        self.needs_resync = False
+
+    def decode(self, message):
+        data = self.loads(message)
+        if not isinstance(data, dict) or 'data' not in data:
+            return None
+
+        action = data.get('action', 'snapshot')
+        for entry in data['data']:
+            timestamp = int(entry['ts']) * 1_000_000  # Milliseconds -> nanoseconds
+            if action == 'snapshot':
+                self.book.apply_snapshot(entry.get('bids', ()), entry.get('asks', ()),
+                                         timestamp, entry.get('seqId'))
+            else:
+                gaps = self.book.gaps
+                if not self.book.apply_update(entry.get('bids', ()), entry.get('asks', ()),
+                                              timestamp, entry.get('seqId'), entry.get('prevSeqId')):
+                    # Updates before the first snapshot are dropped; a gap needs a resync
+                    if self.book.gaps > gaps:
+                        self.needs_resync = True
+                    return None
+
+        return self.book.to_snapshot()
+
+    def reset(self):
+        self.book = L2OrderBook(self.book.depth)
+        self.needs_resync = False
+
+
+FEEDS = {
+    'snapshot': OrderBookDecoder,
+    'okx_books': OkxBooksDecoder,
+}
+
+
+def make_decoder(parser='auto', feed='snapshot'):
+    """
+    Create a decoder
+
+    Args:
+        parser: 'json', 'orjson', or 'auto' for the fastest one available
+        feed: 'snapshot' for full books on every frame, 'okx_books' for snapshot + deltas
+
+    Returns:
+        OrderBookDecoder
+    """
+    if parser == 'auto':
+        parser = 'orjson' if orjson is not None else 'json'
+    if parser not in PARSERS:
+        logger.warning("JSON parser '%s' is not available, falling back to json", parser)
+        parser = 'json'
+    return FEEDS[feed](parser)
@@ -0,0 +1,136 @@
+import numpy as np
+from utils.ring_buffer import RingArray
+
+
+class FeatureBuilder:
+    """
+    Columnar training features computed with NumPy over the snapshot history.
+
+    Per-snapshot features (mid, relative spread, bid and ask volume) are
+    cached column by column in rings aligned with the store's history. `refresh` only
+    computes rows for snapshots appended since the previous call, so a
+    refit over the full history costs one vectorized pass over the new
+    snapshots plus a few whole-column array operations.
+
+    Displayed volume is cached once per distinct top-K depth in `depths`,
+    so each model can read the book to its own depth from one history.
+    """
+    COLUMNS = ('mid', 'spread', 'bid_volume', 'ask_volume')
+
+    def __init__(self, history, depths=()):
+        self.history = history
+        self.depths = sorted({min(max(1, k), history.depth) for k in depths} | {history.depth})
+        self._columns = {name: RingArray(history.capacity) for name in ('mid', 'spread')}
+        for k in self.depths:
+            self._columns[('bid_volume', k)] = RingArray(history.capacity)
+            self._columns[('ask_volume', k)] = RingArray(history.capacity)
+        self._sequence = 0  # history.sequence covered by the cache
+
+    def refresh(self):
+        """Compute cached features for snapshots not seen yet"""
+        new = min(self.history.sequence - self._sequence, len(self.history))
+        if new <= 0:
+            return
+        mids = self.history.mids(new)
+        best_bids = self.history.bid_prices(new)[:, 0]
+        best_asks = self.history.ask_prices(new)[:, 0]
+
+        self._columns['mid'].extend(mids)
+        self._columns['spread'].extend((best_asks - best_bids) / mids)
+        # One cumulative sum per side serves every depth
+        for side, qtys in (('bid_volume', self.history.bid_qtys(new)), ('ask_volume', self.history.ask_qtys(new))):
+            cumulative = np.cumsum(qtys, axis=1, dtype=np.float64)
+            for k in self.depths:
+                self._columns[(side, k)].extend(cumulative[:, k - 1])
+        self._sequence = self.history.sequence
+
+    def clear(self):
+        """Drop cached rows; the next `refresh` recomputes them from the history"""
+        for ring in self._columns.values():
+            ring.clear()
+        self._sequence = 0
+
+    def columns(self, n=None, depth=None):
+        """
+        Cached per-snapshot features for the last n snapshots
+
+        Args:
+            n: Number of snapshots, all by default
+            depth: Top-K levels summed into the volume columns, the full stored depth by default
+
+        Returns:
+            dict: Column name -> read-only (n,) array, oldest first
+        """
+        self.refresh()
+        k = self._depth(depth)
+        return {
+            'mid': self._columns['mid'].last(n),
+            'spread': self._columns['spread'].last(n),
+            'bid_volume': self._columns[('bid_volume', k)].last(n),
+            'ask_volume': self._columns[('ask_volume', k)].last(n),
+        }
+
+    def _depth(self, depth):
+        if depth is None or depth >= self.history.depth:
+            return self.history.depth
+        if depth not in self.depths:
+            raise ValueError(f"Volume depth {depth} is not cached; cached depths are {self.depths}")
+        return depth
+
+    def latest(self, depth=None):
+        """Feature values of the most recent snapshot"""
+        return {name: float(column[0]) for name, column in self.columns(1, depth).items()}
+
+    @property
+    def nbytes(self):
+        return sum(ring.nbytes for ring in self._columns.values())
+
+    @staticmethod
+    def volume_ratio(bid_volume, ask_volume):
+        """Bid share of total displayed volume, 0.5 for an empty book"""
+        total = bid_volume + ask_volume
+        return np.divide(bid_volume, total, out=np.full_like(total, 0.5, dtype=np.float64),
+                         where=total > 0)
+
+    def slippage_training_set(self, volatility, n=None, depth=None):
+        """
+        Features [volume, spread, volatility] and next-tick relative price change
+
+        Args:
+            volatility: Annualized volatility used for every row
+            n: Use only the last n snapshots (n=2 gives the newest sample alone)
+            depth: Top-K levels summed into the volume feature
+
+        Returns:
+            tuple: (X, y) for snapshots 1..n-1
+        """
+        cols = self.columns(n, depth)
+        mids = cols['mid']
+        X = np.empty((len(mids) - 1, 3), dtype=np.float64, order='F')
+        np.add(cols['bid_volume'][1:], cols['ask_volume'][1:], out=X[:, 0])
+        X[:, 1] = cols['spread'][1:]
+        X[:, 2] = volatility
+        y = np.diff(mids)
+        y /= mids[:-1]
+        return X, y
+
+    def maker_taker_training_set(self, volatility, n=None, depth=None):
+        """
+        Features [spread, volume_ratio, volatility] and up/down price direction labels
+
+        Args:
+            volatility: Annualized volatility used for every row
+            n: Use only the last n snapshots (n=2 gives the newest sample alone)
+            depth: Top-K levels summed into the volume ratio feature
+
+        Returns:
+            tuple: (X, y) for snapshots 1..n-1
+        """
+        cols = self.columns(n, depth)
+        mids = cols['mid']
+        X = np.empty((len(mids) - 1, 3), dtype=np.float64, order='F')
+        X[:, 0] = cols['spread'][1:]
+        X[:, 1] = self.volume_ratio(cols['bid_volume'][1:], cols['ask_volume'][1:])
+        X[:, 2] = volatility
+        y = (np.diff(mids) > 0).astype(np.int64)
+        return X, y
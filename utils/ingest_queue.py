@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import deque
+from utils.config import Config
+
+
+class IngestQueue:
+    """
+    Bounded hand-off between a feed's receive loop and tick processing.
+
+    The receive loop keeps draining the socket while processing runs, so a
+    burst that outpaces the models is absorbed here instead of in the
+    websocket's own buffer. What happens when the queue is full is the
+    overload policy:
+
+    - 'drop_oldest': discard the oldest queued snapshot
+    - 'conflate': discard every queued snapshot; processing jumps straight
+      to the newest book (each decoded snapshot is a full book, so nothing
+      but intermediate ticks is lost)
+    - 'block': the receive loop waits for space, pushing back on the socket
+
+    Either dropping policy bounds the wait of a processed snapshot to about
+    `maxsize` processing times. Snapshots older than `max_age` seconds at
+    dequeue are skipped as long as a newer one is queued behind them.
+    """
+    POLICIES = ('drop_oldest', 'conflate', 'block')
+
+    def __init__(self, maxsize=None, policy=None, max_age=None):
+        params = Config.INGEST_QUEUE
+        self.maxsize = params['maxsize'] if maxsize is None else maxsize
+        if self.maxsize < 1:
+            raise ValueError(f"Ingest queue size must be at least 1, got {self.maxsize}")
+        self.policy = policy or params['policy']
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown ingest queue policy: {self.policy}")
+        self.max_age = params['max_age'] if max_age is None else max_age
+        self._items = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self.enqueued = 0
+        self.dropped = 0  # Discarded by drop_oldest or conflate
+        self.expired = 0  # Skipped at dequeue for exceeding max_age
+        self.blocked = 0  # Puts that had to wait for space
+        self.max_depth = 0
+        self.last_age = 0.0  # Seconds from receipt to dequeue of the last snapshot handed out
+
+    def __len__(self):
+        return len(self._items)
+
+    async def put(self, item):
+        """Queue a snapshot, applying the overload policy when full"""
+        if len(self._items) >= self.maxsize:
+            if self.policy == 'block':
+                self.blocked += 1
+                while len(self._items) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+            elif self.policy == 'drop_oldest':
+                self._items.popleft()
+                self.dropped += 1
+            else:
+                self.dropped += len(self._items)
+                self._items.clear()
+        self._items.append(item)
+        self.enqueued += 1
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._not_empty.set()
+
+    async def get(self):
+        """Next snapshot to process, waiting if the queue is empty"""
+        while True:
+            while not self._items:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            item = self._items.popleft()
+            self._not_full.set()
+            received_ns = getattr(item, 'received_ns', 0)
+            age = (time.perf_counter_ns() - received_ns) / 1e9 if received_ns else 0.0
+            if self.max_age and age > self.max_age and self._items:
+                self.expired += 1
+                continue
+            self.last_age = age
+            return item
+
+    def clear(self):
+        self._items.clear()
+        self._not_full.set()
+
+    def metrics(self):
+        """
+        Queue depth and overload counters
+
+        Returns:
+            dict: depth, max_depth, enqueued, dropped, expired, blocked and last_age_ms
+        """
+        return {
+            'depth': len(self._items),
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'expired': self.expired,
+            'blocked': self.blocked,
+            'last_age_ms': self.last_age * 1000,
+        }
@@ -0,0 +1,139 @@
+import logging
+import numpy as np
+from bisect import bisect_left, insort
+from utils.config import Config
+from utils.orderbook_store import OrderBookSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class BookSide:
+    """
+    One side of an L2 book: price -> qty map plus a sorted price index.
+
+    Level lookup and quantity updates are dict operations (O(1)) and the
+    best price is read from one end of the sorted list (O(1)). Inserting or
+    deleting a price finds its position by bisection but then shifts the
+    tail of the list, so it is O(n) in the number of levels. The shift is a
+    single C-level memmove of pointers, which at exchange book depths
+    (hundreds of levels) is still cheaper than a Python-level tree.
+    """
+
+    def __init__(self, descending):
+        self.descending = descending
+        self.levels = {}
+        self.prices = []  # Ascending
+
+    def clear(self):
+        self.levels.clear()
+        self.prices.clear()
+
+    def set(self, price, qty):
+        """Insert, update, or (qty == 0) delete a level"""
+        if qty == 0:
+            if self.levels.pop(price, None) is not None:
+                del self.prices[bisect_left(self.prices, price)]
+            return
+        if price not in self.levels:
+            insort(self.prices, price)
+        self.levels[price] = qty
+
+    def best(self):
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.descending else self.prices[0]
+
+    def top(self, depth):
+        """
+        Best `depth` levels, best first
+
+        Returns:
+            np.ndarray: (levels, 2) float64 array of [price, qty]
+        """
+        prices = self.prices[:-depth - 1:-1] if self.descending else self.prices[:depth]
+        out = np.empty((len(prices), 2), dtype=np.float64)
+        out[:, 0] = prices
+        out[:, 1] = [self.levels[p] for p in prices]
+        return out
+
+    def __len__(self):
+        return len(self.prices)
+
+
+class L2OrderBook:
+    """
+    L2 orderbook maintained in place from a snapshot followed by deltas.
+
+    Updates carry (prevSeqId, seqId) in the OKX `books` convention; an
+    update whose prevSeqId does not match the last applied seqId is a gap.
+    On a gap the book is marked out of sync and further updates are
+    ignored until a new snapshot arrives.
+    """
+
+    def __init__(self, depth=Config.ORDERBOOK_DEPTH):
+        self.depth = depth
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.timestamp = 0
+        self.seq_id = None
+        self.synced = False
+        self.gaps = 0
+        self.version = 0  # Incremented on every applied snapshot or update
+
+    def apply_snapshot(self, bids, asks, timestamp, seq_id=None):
+        """Replace the whole book"""
+        self.bids.clear()
+        self.asks.clear()
+        self._apply_levels(bids, asks)
+        self.timestamp = timestamp
+        self.seq_id = seq_id
+        self.synced = True
+        self.version += 1
+
+    def apply_update(self, bids, asks, timestamp, seq_id=None, prev_seq_id=None):
+        """
+        Apply changed levels in place
+
+        Returns:
+            bool: False if the update was rejected (gap or not synced)
+        """
+        if not self.synced:
+            return False
+        if prev_seq_id is not None and self.seq_id is not None and prev_seq_id != self.seq_id:
+            self.gaps += 1
+            self.synced = False
+            logger.warning("Orderbook sequence gap: expected prevSeqId %s, got %s", self.seq_id, prev_seq_id)
+            return False
+
+        self._apply_levels(bids, asks)
+        self.timestamp = timestamp
+        if seq_id is not None:
+            self.seq_id = seq_id
+        self.version += 1
+        return True
+
+    def _apply_levels(self, bids, asks):
+        for level in bids:
+            self.bids.set(float(level[0]), float(level[1]))
+        for level in asks:
+            self.asks.set(float(level[0]), float(level[1]))
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def to_snapshot(self):
+        """
+        Top-of-book view for the models
+
+        Returns:
+            OrderBookSnapshot: Best `depth` levels per side, or None if a side is empty
+        """
+        if not self.bids or not self.asks:
+            return None
+        bids = self.bids.top(self.depth)
+        asks = self.asks.top(self.depth)
+        mid = (bids[0, 0] + asks[0, 0]) / 2
+        return OrderBookSnapshot(self.timestamp, float(mid), bids, asks)
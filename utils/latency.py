@@ -0,0 +1,79 @@
+import time
+from collections import deque
+import numpy as np
+from utils.config import Config
+
+
+class LatencyTracker:
+    """
+    Rolling per-stage latency samples with percentile summaries.
+
+    `record` is a scalar store into a preallocated array (cheap enough for
+    the tick path); percentiles are only computed when `summary` is
+    called, e.g. once per UI frame. Each stage keeps its last `window`
+    samples.
+    """
+    PERCENTILES = (50, 99, 99.9)
+
+    def __init__(self, window=Config.LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}  # stage -> float64 array of seconds
+        self._counts = {}  # stage -> total samples recorded
+
+    def record(self, stage, seconds):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = np.zeros(self.window, dtype=np.float64)
+            self._counts[stage] = 0
+        count = self._counts[stage]
+        samples[count % self.window] = seconds
+        self._counts[stage] = count + 1
+
+    def record_ns(self, stage, start_ns, end_ns):
+        self.record(stage, (end_ns - start_ns) / 1e9)
+
+    def stages(self):
+        return list(self._samples)
+
+    def summary(self, stage):
+        """
+        Percentiles over the current window for one stage
+
+        Returns:
+            dict: p50, p99, p99.9 and max in milliseconds plus the total sample count,
+            or None if the stage has no samples
+        """
+        samples = self._samples.get(stage)
+        if samples is None:
+            return None
+        count = self._counts[stage]
+        window = samples[:min(count, self.window)] * 1e3
+        p50, p99, p999 = np.percentile(window, self.PERCENTILES)
+        return {'p50': p50, 'p99': p99, 'p99.9': p999, 'max': window.max(), 'count': count}
+
+    def summaries(self):
+        """Percentile summaries for every stage"""
+        return {stage: self.summary(stage) for stage in self.stages()}
+
+
+class TickRateMeter:
+    """Ticks per second over a sliding time window"""
+
+    def __init__(self, window_seconds=Config.TICK_RATE_WINDOW):
+        self.window = window_seconds
+        self._ticks = deque()
+
+    def tick(self, now=None):
+        now = time.perf_counter() if now is None else now
+        self._ticks.append(now)
+        cutoff = now - self.window
+        while self._ticks[0] < cutoff:
+            self._ticks.popleft()
+
+    def rate(self, now=None):
+        """Ticks per second over the window ending at `now`; safe to call from another thread"""
+        now = time.perf_counter() if now is None else now
+        if not self._ticks:
+            return 0.0
+        span = now - self._ticks[0]
+        return len(self._ticks) / span if span > 0 else 0.0
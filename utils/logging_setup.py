@@ -0,0 +1,149 @@
+import atexit
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from utils.config import Config
+
+_listener = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Deduplicates repeated identical log records.
+
+    Records are identical when logger, level and rendered message match.
+    The first `burst` occurrences per `interval` seconds pass; the rest are
+    counted and dropped. The next record of that kind to pass carries the
+    number of repeats suppressed since the previous one, and `flush`
+    reports counts still pending at shutdown.
+    """
+
+    def __init__(self, interval=None, burst=None, max_keys=None):
+        super().__init__()
+        params = Config.LOG_RATE_LIMIT
+        self.interval = params['interval'] if interval is None else interval
+        self.burst = params['burst'] if burst is None else burst
+        self.max_keys = params['max_keys'] if max_keys is None else max_keys
+        self._windows = {}  # key -> [window start, passed in window, suppressed since last pass]
+        self._lock = threading.Lock()  # Records arrive from the engine, UI and refit threads
+        self.suppressed = 0  # Total records dropped
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.getMessage())
+        with self._lock:
+            return self._admit(key, record)
+
+    def _admit(self, key, record):
+        window = self._windows.get(key)
+        if window is None:
+            if len(self._windows) >= self.max_keys:
+                self._windows.clear()
+            self._windows[key] = [record.created, 1, 0]
+            return True
+        if record.created - window[0] >= self.interval:
+            window[0] = record.created
+            window[1] = 0
+        if window[1] >= self.burst:
+            window[2] += 1
+            self.suppressed += 1
+            return False
+        window[1] += 1
+        if window[2]:
+            record.msg = f"{record.getMessage()} (repeated {window[2]} more times)"
+            record.args = None
+            window[2] = 0
+        return True
+
+    def flush(self):
+        """Log one summary line, from the original logger, per message that still has suppressed repeats"""
+        with self._lock:
+            pending = [(key, window[2]) for key, window in self._windows.items() if window[2]]
+            self._windows.clear()
+        for (name, level, message), count in pending:
+            logging.getLogger(name).log(level, "Suppressed %d repeats of: %s", count, message)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking or raising when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(level=None, log_file=None, stream=None, fmt=None):
+    """
+    Route the root logger through a bounded queue drained by a background thread
+
+    The calling thread only checks the level, deduplicates, merges the
+    message arguments and enqueues the record; formatting and writing to
+    the file and stream happen on the listener thread, so a slow disk or a
+    log storm cannot block the tick path. Safe to call again to reconfigure.
+
+    Args:
+        level: Level name or number, Config.LOG_LEVEL by default
+        log_file: Optional file path; records are appended
+        stream: Stream for console output, sys.stderr by default; False disables it
+        fmt: Format string, Config.LOG_FORMAT by default
+
+    Returns:
+        DroppingQueueHandler: The handler installed on the root logger
+    """
+    stop_logging()
+    level = level or Config.LOG_LEVEL
+    if isinstance(level, str):
+        level = getattr(logging, level.upper())
+    formatter = logging.Formatter(fmt or Config.LOG_FORMAT)
+    handlers = []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    if stream is not False:
+        handlers.append(logging.StreamHandler(stream or sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(Config.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    global _listener
+    _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return queue_handler
+
+
+def stop_logging():
+    """Report suppressed repeats and dropped records, then flush and stop the writer thread"""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    queue_handlers = [handler for handler in root.handlers if isinstance(handler, DroppingQueueHandler)]
+    for handler in queue_handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, RateLimitFilter):
+                log_filter.flush()
+        if handler.dropped:
+            logging.getLogger(__name__).warning("Dropped %d log records on a full queue", handler.dropped)
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in queue_handlers:
+        # Later records fall back to logging.lastResort instead of an undrained queue
+        root.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_logging)
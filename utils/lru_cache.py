@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small least-recently-used memo with hit/miss counters.
+
+    Keys must be hashable; values are returned as stored, so callers
+    should only cache immutable results (tuples, read-only arrays).
+    Not thread safe: use it from a single thread.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,157 @@
+import numpy as np
+from datetime import datetime, timezone
+from itertools import chain
+from utils.config import Config
+from utils.ring_buffer import SnapshotRingBuffer
+from utils.rolling_stats import RollingVolatility
+from utils.features import FeatureBuilder
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_timestamp_ns(timestamp):
+    """
+    Convert an ISO-8601 timestamp string to integer nanoseconds since epoch
+
+    Args:
+        timestamp: ISO-8601 string, e.g. '2025-05-04T10:39:13Z'
+
+    Returns:
+        int: Epoch timestamp in nanoseconds
+    """
+    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def levels_to_array(levels):
+    """
+    Convert [[price, qty], ...] (strings or numbers) to a contiguous float64 array
+
+    Args:
+        levels: Sequence of [price, qty] pairs
+
+    Returns:
+        np.ndarray: (levels, 2) float64 array
+    """
+    return np.fromiter(
+        map(float, chain.from_iterable(levels)), dtype=np.float64, count=2 * len(levels)
+    ).reshape(-1, 2)
+
+
+class OrderBookSnapshot:
+    """Normalized L2 orderbook snapshot shared by all models"""
+    __slots__ = ('timestamp', 'price', 'bids', 'asks', 'received_ns', 'decoded_ns')
+
+    def __init__(self, timestamp, price, bids, asks):
+        self.timestamp = timestamp  # Epoch nanoseconds (int64)
+        self.price = price  # Mid price
+        self.bids = bids  # (levels, 2) float64 array of [price, qty]
+        self.asks = asks  # (levels, 2) float64 array of [price, qty]
+        self.received_ns = 0  # time.perf_counter_ns() when the frame arrived, 0 if unknown
+        self.decoded_ns = 0  # time.perf_counter_ns() when decoding finished
+
+    @classmethod
+    def from_message(cls, data):
+        """
+        Build a snapshot from a raw L2 orderbook message
+
+        Args:
+            data: Decoded websocket message with 'timestamp', 'bids' and 'asks'
+
+        Returns:
+            OrderBookSnapshot: Normalized snapshot
+        """
+        bids = levels_to_array(data['bids'])
+        asks = levels_to_array(data['asks'])
+        price = (bids[0, 0] + asks[0, 0]) / 2
+        return cls(parse_timestamp_ns(data['timestamp']), float(price), bids, asks)
+
+
+class OrderBookStore:
+    """
+    Single owner of orderbook history.
+
+    Each message is normalized exactly once on append and written into a
+    preallocated ring buffer; models hold a reference to the store and read
+    `history` (views where possible) instead of keeping their own copies. The
+    rolling volatility of mid-price returns is maintained here once per
+    tick, and per-snapshot training features are cached in `features`;
+    both are shared by all models.
+    """
+
+    def __init__(self, max_history=Config.MAX_ORDERBOOK_HISTORY, depth=None, qty_dtype=None):
+        self.max_history = max_history
+        if depth is None:
+            depth = min(Config.ORDERBOOK_DEPTH, max(Config.MODEL_DEPTH.values()))
+        self.history = SnapshotRingBuffer(max_history, depth, qty_dtype or Config.ORDERBOOK_QTY_DTYPE)
+        self.volatility = RollingVolatility(**Config.VOLATILITY_PARAMS)
+        self.features = FeatureBuilder(self.history, Config.MODEL_DEPTH.values())
+        self._latest = None
+
+    def append(self, data):
+        """
+        Normalize a raw message and add it to the history
+
+        Args:
+            data: OrderBookSnapshot from a decoder, or a decoded websocket message dict
+
+        Returns:
+            OrderBookSnapshot: The stored snapshot
+        """
+        if isinstance(data, OrderBookSnapshot):
+            snapshot = data
+        else:
+            snapshot = OrderBookSnapshot.from_message(data)
+        self.history.append(snapshot.timestamp, snapshot.price, snapshot.bids, snapshot.asks)
+        self.volatility.update(snapshot.timestamp, snapshot.price)
+        self._latest = snapshot
+        return snapshot
+
+    def latest(self):
+        """Return the most recent snapshot, or None if the store is empty"""
+        return self._latest
+
+    def get_state(self):
+        """History and rolling statistics as a flat dict of arrays"""
+        state = {f'history.{k}': v for k, v in self.history.get_state().items()}
+        state.update({f'volatility.{k}': v for k, v in self.volatility.get_state().items()})
+        return state
+
+    def set_state(self, state):
+        """Restore history and rolling statistics saved by `get_state`"""
+        self.history.set_state({k[len('history.'):]: v for k, v in state.items() if k.startswith('history.')})
+        self.features.clear()
+        volatility = {k[len('volatility.'):]: v for k, v in state.items() if k.startswith('volatility.')}
+        if not self.volatility.set_state(volatility):
+            # Saved with another method: rebuild from the restored mid prices
+            self.volatility.reset()
+            for timestamp, mid in zip(self.history.timestamps().tolist(), self.history.mids().tolist()):
+                self.volatility.update(timestamp, mid)
+
+    def memory_report(self):
+        """
+        Bytes allocated for history, cached features and rolling statistics
+
+        History and feature rings are preallocated, so their size is fixed
+        by capacity, depth and quantity dtype, not by how full they are.
+
+        Returns:
+            dict: Component sizes in bytes, bytes_per_snapshot, capacity, depth and qty_dtype
+        """
+        report = {
+            'history': self.history.nbytes,
+            'features': self.features.nbytes,
+            'volatility': self.volatility.nbytes(),
+        }
+        report['total'] = sum(report.values())
+        report['bytes_per_snapshot'] = report['total'] / self.max_history
+        report['capacity'] = self.max_history
+        report['depth'] = self.history.depth
+        report['qty_dtype'] = self.history.qty_dtype.name
+        return report
+
+    def __len__(self):
+        return len(self.history)
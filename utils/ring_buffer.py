@@ -0,0 +1,215 @@
+import numpy as np
+
+
+def last_rows(array, head, count, n=None):
+    """
+    Last n rows of a ring stored in `array`, oldest first
+
+    Args:
+        array: Ring storage, one row per slot
+        head: Next write position
+        count: Number of rows stored
+        n: Number of rows, all stored rows by default
+
+    Returns:
+        np.ndarray: A view when the rows are contiguous, otherwise a copy joining
+        the tail and the head of the storage
+    """
+    n = count if n is None else min(n, count)
+    start = head - n
+    if start >= 0:
+        return array[start:head]
+    return np.concatenate((array[start:], array[:head]))
+
+
+class SnapshotRingBuffer:
+    """
+    Fixed-capacity ring buffer of orderbook snapshots backed by NumPy arrays.
+
+    Level prices and quantities are stored column-wise as (capacity, depth)
+    arrays per side, with parallel mid price and timestamp arrays. Prices
+    are always float64; quantities may be stored as float32 to halve their
+    footprint (about 7 significant digits, ample for displayed sizes).
+    Books with fewer than `depth` levels are zero padded; books with more
+    are truncated.
+
+    Each snapshot is stored once. The last N snapshots are returned
+    oldest first as a view while they do not span the end of the
+    storage, and as a copy of two slices once they do. Appends are
+    O(depth) and never shift existing rows.
+    """
+
+    def __init__(self, capacity, depth, qty_dtype=np.float64):
+        self.capacity = capacity
+        self.depth = depth
+        self.qty_dtype = np.dtype(qty_dtype)
+        self._bid_prices = np.zeros((capacity, depth), dtype=np.float64)
+        self._bid_qtys = np.zeros((capacity, depth), dtype=self.qty_dtype)
+        self._ask_prices = np.zeros((capacity, depth), dtype=np.float64)
+        self._ask_qtys = np.zeros((capacity, depth), dtype=self.qty_dtype)
+        self._mids = np.zeros(capacity, dtype=np.float64)
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+        self.sequence = 0  # Total number of snapshots ever appended
+
+    def append(self, timestamp, mid, bids, asks):
+        """
+        Append one snapshot, overwriting the oldest when full
+
+        Args:
+            timestamp: Epoch nanoseconds
+            mid: Mid price
+            bids: (levels, 2) array of [price, qty], best first
+            asks: (levels, 2) array of [price, qty], best first
+        """
+        bids = bids[:self.depth]
+        asks = asks[:self.depth]
+        n_bids = len(bids)
+        n_asks = len(asks)
+        row = self._head
+        self._bid_prices[row, :n_bids] = bids[:, 0]
+        self._bid_qtys[row, :n_bids] = bids[:, 1]
+        self._bid_prices[row, n_bids:] = 0.0
+        self._bid_qtys[row, n_bids:] = 0.0
+        self._ask_prices[row, :n_asks] = asks[:, 0]
+        self._ask_qtys[row, :n_asks] = asks[:, 1]
+        self._ask_prices[row, n_asks:] = 0.0
+        self._ask_qtys[row, n_asks:] = 0.0
+        self._mids[row] = mid
+        self._timestamps[row] = timestamp
+
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self.sequence += 1
+
+    def _last(self, array, n):
+        return last_rows(array, self._head, self._count, n)
+
+    def bid_prices(self, n=None):
+        """Last n bid price ladders, shape (n, depth); read-only, a view unless wrapped"""
+        return self._last(self._bid_prices, n)
+
+    def bid_qtys(self, n=None):
+        """Last n bid quantity ladders, shape (n, depth); read-only, a view unless wrapped"""
+        return self._last(self._bid_qtys, n)
+
+    def ask_prices(self, n=None):
+        """Last n ask price ladders, shape (n, depth); read-only, a view unless wrapped"""
+        return self._last(self._ask_prices, n)
+
+    def ask_qtys(self, n=None):
+        """Last n ask quantity ladders, shape (n, depth); read-only, a view unless wrapped"""
+        return self._last(self._ask_qtys, n)
+
+    def bids(self, n=None):
+        """Last n bid ladders as a new (n, depth, 2) float64 array of [price, qty]"""
+        return np.stack([self.bid_prices(n), self.bid_qtys(n)], axis=-1).astype(np.float64)
+
+    def asks(self, n=None):
+        """Last n ask ladders as a new (n, depth, 2) float64 array of [price, qty]"""
+        return np.stack([self.ask_prices(n), self.ask_qtys(n)], axis=-1).astype(np.float64)
+
+    def mids(self, n=None):
+        """Last n mid prices; read-only, a view unless wrapped"""
+        return self._last(self._mids, n)
+
+    def timestamps(self, n=None):
+        """Last n timestamps in epoch nanoseconds; read-only, a view unless wrapped"""
+        return self._last(self._timestamps, n)
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for the whole ring"""
+        return sum(a.nbytes for a in (self._bid_prices, self._bid_qtys, self._ask_prices,
+                                      self._ask_qtys, self._mids, self._timestamps))
+
+    @property
+    def bytes_per_snapshot(self):
+        """Allocated bytes per stored snapshot"""
+        return self.nbytes // self.capacity
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def get_state(self):
+        """Stored snapshots as compact arrays, oldest first"""
+        return {
+            'bids': self.bids(),
+            'asks': self.asks(),
+            'mids': self.mids().copy(),
+            'timestamps': self.timestamps().copy(),
+            'sequence': np.int64(self.sequence),
+        }
+
+    def set_state(self, state):
+        """
+        Replace the contents with snapshots from `get_state`
+
+        The newest `capacity` snapshots are kept; depth is truncated or zero padded.
+        """
+        mids = state['mids'][-self.capacity:]
+        n = len(mids)
+        depth = min(self.depth, state['bids'].shape[1])
+        bids = state['bids'][len(state['bids']) - n:, :depth]
+        asks = state['asks'][len(state['asks']) - n:, :depth]
+        rows = slice(0, n)
+        for prices, qtys, ladder in ((self._bid_prices, self._bid_qtys, bids),
+                                     (self._ask_prices, self._ask_qtys, asks)):
+            prices[rows] = 0.0
+            qtys[rows] = 0.0
+            prices[rows, :depth] = ladder[:, :, 0]
+            qtys[rows, :depth] = ladder[:, :, 1]
+        self._mids[rows] = mids
+        self._timestamps[rows] = state['timestamps'][len(state['timestamps']) - n:]
+        self._head = n % self.capacity
+        self._count = n
+        self.sequence = int(state['sequence'])
+
+    def __len__(self):
+        return self._count
+
+
+class RingArray:
+    """
+    Fixed-capacity ring of equally shaped rows with "last N" reads.
+
+    Uses the same single-copy layout as SnapshotRingBuffer; `extend` writes
+    a whole batch of rows with one vectorized assignment.
+    """
+
+    def __init__(self, capacity, row_shape=(), dtype=np.float64):
+        self.capacity = capacity
+        self._data = np.zeros((capacity,) + tuple(row_shape), dtype=dtype)
+        self._head = 0
+        self._count = 0
+
+    def extend(self, rows):
+        """Append a batch of rows, oldest first; only the last `capacity` are kept"""
+        rows = rows[-self.capacity:]
+        k = len(rows)
+        if k == 0:
+            return
+        idx = (self._head + np.arange(k)) % self.capacity
+        self._data[idx] = rows
+        self._head = (self._head + k) % self.capacity
+        self._count = min(self._count + k, self.capacity)
+
+    def append(self, row):
+        self.extend(np.asarray(row, dtype=self._data.dtype)[np.newaxis])
+
+    def last(self, n=None):
+        """Last n rows, oldest first; read-only, a view unless they wrap around the storage"""
+        return last_rows(self._data, self._head, self._count, n)
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
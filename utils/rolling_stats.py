@@ -0,0 +1,147 @@
+import math
+import sys
+from collections import deque
+import numpy as np
+from utils.config import Config
+
+
+class RollingVolatility:
+    """
+    Incremental volatility estimator over log returns of the mid price.
+
+    In 'rolling' mode a Welford running mean/variance is maintained over a
+    sliding window: each new return is added and returns leaving the window
+    are removed, so every update is O(1) regardless of window size. The
+    window spans `time_window` seconds of snapshot timestamps and is capped
+    at `window` returns; with `time_window=None` it is count-based only.
+    In 'ewma' mode a RiskMetrics-style
+    exponentially weighted variance with decay `ewma_lambda` is used instead.
+    """
+
+    def __init__(self, method='rolling', window=Config.MAX_ORDERBOOK_HISTORY - 1,
+                 time_window=300, ewma_lambda=0.94):
+        if method not in ('rolling', 'ewma'):
+            raise ValueError(f"Unknown volatility method: {method}")
+        self.method = method
+        self.window = window
+        self.time_window_ns = int(time_window * 1e9) if time_window else None
+        self.ewma_lambda = ewma_lambda
+        self.reset()
+
+    def reset(self):
+        self._returns = deque()  # (timestamp_ns, log_return)
+        self._last_price = None
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ewma_var = None
+
+    def update(self, timestamp, price):
+        """
+        Add a new price observation
+
+        Args:
+            timestamp: Epoch nanoseconds
+            price: Mid price
+        """
+        if price <= 0:
+            return
+        last_price = self._last_price
+        self._last_price = price
+        if last_price is None:
+            return
+
+        r = math.log(price / last_price)
+
+        if self.method == 'ewma':
+            if self._ewma_var is None:
+                self._ewma_var = r * r
+            else:
+                self._ewma_var = self.ewma_lambda * self._ewma_var + (1 - self.ewma_lambda) * r * r
+            self._count += 1
+            return
+
+        self._returns.append((timestamp, r))
+        self._add(r)
+
+        # Evict returns that fell out of the count or time window
+        while self._count > self.window:
+            self._remove(self._returns.popleft()[1])
+        if self.time_window_ns is not None:
+            cutoff = timestamp - self.time_window_ns
+            while self._returns and self._returns[0][0] < cutoff:
+                self._remove(self._returns.popleft()[1])
+
+    def _add(self, x):
+        self._count += 1
+        delta = x - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x):
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._count
+        self._m2 = max(self._m2 - delta * (x - self._mean), 0.0)
+
+    def get_state(self):
+        """Estimator state as scalars and arrays (NaN marks unset values)"""
+        return {
+            'method': np.array(self.method),
+            'return_timestamps': np.array([t for t, _ in self._returns], dtype=np.int64),
+            'return_values': np.array([r for _, r in self._returns], dtype=np.float64),
+            'last_price': np.float64(np.nan if self._last_price is None else self._last_price),
+            'count': np.int64(self._count),
+            'mean': np.float64(self._mean),
+            'm2': np.float64(self._m2),
+            'ewma_var': np.float64(np.nan if self._ewma_var is None else self._ewma_var),
+        }
+
+    def set_state(self, state):
+        """
+        Restore state from `get_state`
+
+        Returns:
+            bool: False if the state was saved with a different method
+        """
+        if str(state['method']) != self.method:
+            return False
+        self._returns = deque(zip(state['return_timestamps'].tolist(), state['return_values'].tolist()))
+        last_price = float(state['last_price'])
+        self._last_price = None if math.isnan(last_price) else last_price
+        self._count = int(state['count'])
+        self._mean = float(state['mean'])
+        self._m2 = float(state['m2'])
+        ewma_var = float(state['ewma_var'])
+        self._ewma_var = None if math.isnan(ewma_var) else ewma_var
+        return True
+
+    def nbytes(self):
+        """Approximate bytes the return window holds when full: a deque slot plus a boxed (int, float) tuple per return"""
+        if self.method == 'ewma':
+            return 0
+        entry = 8 + sys.getsizeof((0, 0.0)) + sys.getsizeof(2 ** 62) + sys.getsizeof(0.0)
+        return entry * self.window
+
+    def variance(self):
+        """Per-tick variance of log returns"""
+        if self.method == 'ewma':
+            return self._ewma_var or 0.0
+        if self._count == 0:
+            return 0.0
+        return self._m2 / self._count
+
+    def std(self):
+        """Per-tick standard deviation of log returns"""
+        return math.sqrt(self.variance())
+
+    def annualized(self):
+        """Volatility scaled by sqrt(Config.VOLATILITY_WINDOW)"""
+        return self.std() * math.sqrt(Config.VOLATILITY_WINDOW)
+
+    def __len__(self):
+        return self._count
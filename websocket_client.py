@@ -1,61 +1,138 @@
 import asyncio
 import json
 import logging
+import random
+import time
 import websockets
-from PyQt6.QtCore import QObject, pyqtSignal
 from utils.config import Config
+from utils.decoder import make_decoder
+from utils.ingest_queue import IngestQueue
 
 logger = logging.getLogger(__name__)
 
-class WebSocketClient(QObject):
-    data_received = pyqtSignal(dict)
-    
-    def __init__(self):
-        super().__init__()
-        self.ws_url = Config.WEBSOCKET_URL
+class WebSocketClient:
+    def __init__(self, on_data=None, decoder=None, recorder=None, url=None, queue=None):
+        self.on_data = on_data  # Called with each OrderBookSnapshot on the receive loop's thread
+        self.queue = queue or IngestQueue()  # Bounded buffer between receiving and processing
+        self.ws_url = url or Config.WEBSOCKET_URL
+        self.decoder = decoder or make_decoder(Config.DECODER, Config.FEED_FORMAT)
+        self.recorder = recorder  # Optional FrameRecorder for raw frames
         self.running = False
         self.websocket = None
         self.reconnect_attempts = 0
         
     async def connect(self):
+        """
+        Stream until stopped, reconnecting with jittered exponential backoff
+
+        The receive loop only decodes and queues; a separate consumer task
+        drains the ingest queue into `on_data`, so the socket keeps being
+        read while a slow tick is processed.
+        """
+        self.running = True
+        self.queue.clear()
+        consumer = asyncio.create_task(self.process_messages())
         try:
-            self.websocket = await websockets.connect(self.ws_url)
-            logger.info("WebSocket connection established")
-            self.running = True
-            self.reconnect_attempts = 0
-            await self.receive_messages()
-        except Exception as e:
-            logger.error(f"WebSocket connection error: {str(e)}")
+            while self.running:
+                try:
+                    self.websocket = await websockets.connect(self.ws_url)
+                    logger.info("WebSocket connection established")
+                    self.decoder.reset()
+                    await self.subscribe()
+                    self.reconnect_attempts = 0
+                    await self.receive_messages()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("WebSocket connection error: %s", e)
+                if not self.running:
+                    break
+                if (Config.MAX_RECONNECT_ATTEMPTS is not None and
+                        self.reconnect_attempts >= Config.MAX_RECONNECT_ATTEMPTS):
+                    logger.error("Max reconnection attempts reached")
+                    break
+                self.reconnect_attempts += 1
+                delay = self.backoff_delay(self.reconnect_attempts)
+                logger.info("Attempting to reconnect (attempt %d) in %.1fs", self.reconnect_attempts, delay)
+                await asyncio.sleep(delay)
+        finally:
             self.running = False
-            await self.handle_reconnect()
-            
-    async def handle_reconnect(self):
-        if self.reconnect_attempts < Config.MAX_RECONNECT_ATTEMPTS:
-            self.reconnect_attempts += 1
-            logger.info(f"Attempting to reconnect (attempt {self.reconnect_attempts})")
-            await asyncio.sleep(Config.RECONNECT_DELAY)
-            await self.connect()
-        else:
-            logger.error("Max reconnection attempts reached")
-            
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+
+    @staticmethod
+    def backoff_delay(attempt):
+        """
+        Delay before reconnect `attempt` (1-based)
+
+        Doubles from RECONNECT_DELAY up to RECONNECT_MAX_DELAY; a random
+        half of it is jittered so many clients dropped together do not
+        reconnect in lockstep.
+        """
+        delay = min(Config.RECONNECT_MAX_DELAY, Config.RECONNECT_DELAY * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
     async def receive_messages(self):
+        """Decode frames into the ingest queue until the connection closes or the client stops"""
         while self.running:
             try:
                 message = await self.websocket.recv()
-                data = json.loads(message)
-                self.data_received.emit(data)
+                received_ns = time.perf_counter_ns()
+                if self.recorder is not None:
+                    self.recorder.write(message, time.time_ns())
+                snapshot = self.decoder.decode(message)
+                if snapshot is not None:
+                    snapshot.received_ns = received_ns
+                    snapshot.decoded_ns = time.perf_counter_ns()
+                    await self.queue.put(snapshot)
+                elif self.decoder.needs_resync:
+                    await self.resync()
             except websockets.exceptions.ConnectionClosed:
                 logger.error("WebSocket connection closed")
-                self.running = False
-                await self.handle_reconnect()
                 break
             except Exception as e:
-                logger.error(f"Error receiving message: {str(e)}")
-                
+                logger.error("Error receiving message: %s", e)
+
+    async def process_messages(self):
+        """Hand queued snapshots to `on_data`, oldest first"""
+        while True:
+            snapshot = await self.queue.get()
+            try:
+                if self.on_data is not None:
+                    self.on_data(snapshot)
+            except Exception as e:
+                logger.error("Error processing message: %s", e)
+            # get() does not suspend while snapshots are queued; let the receive loop run
+            await asyncio.sleep(0)
+
+    def ingest_metrics(self):
+        """Ingest queue depth, drop counters and reconnect attempts"""
+        metrics = self.queue.metrics()
+        metrics['reconnect_attempts'] = self.reconnect_attempts
+        return metrics
+            
+    async def subscribe(self, op='subscribe'):
+        if Config.SUBSCRIBE_MESSAGE:
+            await self.websocket.send(json.dumps(dict(Config.SUBSCRIBE_MESSAGE, op=op)))
+            
+    async def resync(self):
+        """Request a fresh book snapshot after a sequence gap"""
+        logger.warning("Orderbook out of sync, resubscribing for a fresh snapshot")
+        self.decoder.reset()
+        if Config.SUBSCRIBE_MESSAGE:
+            await self.subscribe('unsubscribe')
+            await self.subscribe()
+        else:
+            # No subscription protocol: a new connection starts with a snapshot
+            await self.websocket.close()
+            
     async def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
         if self.websocket:
-            await self.websocket.close()
+            # Stop first so the connect loop does not treat the close as a dropped connection
             self.running = False
+            await self.websocket.close()
             logger.info("WebSocket connection closed")
             
     def start(self):